@@ -1,4 +1,9 @@
-from collections import deque   # Import deque (double-ended queue) for efficient BFS queue operations
+from collections import deque, namedtuple   # deque for efficient BFS queue operations
+from math import factorial      # Permutation ranking for the distance table
+import heapq                    # Priority queue for A*
+import mmap                     # Memory-map the on-disk distance table
+import os
+import sys
 
 # Function to print the current board state
 def print_board(board):
@@ -6,116 +11,884 @@ def print_board(board):
         print(row)                  # Print the row as a list
     print("--------")               # Print a separator for readability
 
-# Function to convert the board into a single string (used for visited set)
-def board_to_string(board):
-    # Flatten the 2D board into a single string representation
-    return ''.join(str(cell) for row in board for cell in row)
-
-# Function to find the blank tile (represented by 0)
-def find_blank(board):
-    for i in range(3):                  # Iterate through rows
-        for j in range(3):              # Iterate through columns
-            if board[i][j] == 0:        # Check if cell is blank
-                return i, j             # Return its position (row, col)
-
-# Function to swap two tiles and return a new board
-def swap(board, x1, y1, x2, y2):
-    new_board = [row[:] for row in board]     # Make a deep copy of board
-    # Swap values between (x1, y1) and (x2, y2)
-    new_board[x1][y1], new_board[x2][y2] = new_board[x2][y2], new_board[x1][y1]
-    return new_board                         # Return the new board state
-
-# Function to check if the current board matches the goal board
+# ---- Packed board encoding ----
+# A board is packed into one Python int: a few bits per tile (4 up to the
+# 15-puzzle), cell i (row-major) in the i-th slot, with the blank's cell index
+# cached in the bits above the tiles. States hash and compare as plain ints,
+# and a move is a couple of XORs instead of copying, rescanning and
+# stringifying the board. Everything sized by the board lives in a Layout.
+Layout = namedtuple("Layout", "size cells bits tile_bits blank_shift tile_mask neighbors")
+_layouts = {}
+
+# Function to get the (cached) packing layout of a size x size board
+def layout(size):
+    if size not in _layouts:
+        cells = size * size
+        bits = max(4, (cells - 1).bit_length())   # Enough bits for the largest tile
+        # neighbors[i] lists the cells the blank can swap with when it sits
+        # on cell i (same order as the old moves list: down, up, right, left)
+        neighbors = []
+        for i in range(cells):
+            x, y = divmod(i, size)
+            neighbors.append(tuple(
+                (x + dx) * size + (y + dy)
+                for dx, dy in [(1,0), (-1,0), (0,1), (0,-1)]
+                if 0 <= x + dx < size and 0 <= y + dy < size
+            ))
+        _layouts[size] = Layout(size, cells, bits, (1 << bits) - 1, bits * cells,
+                                (1 << (bits * cells)) - 1, tuple(neighbors))
+    return _layouts[size]
+
+# The classic 8-puzzle is the default everywhere a size isn't given
+SIZE = 3                                  # Board is SIZE x SIZE
+CELLS = SIZE * SIZE
+BLANK_SHIFT = layout(SIZE).blank_shift    # Blank index lives above the tiles
+TILE_MASK = layout(SIZE).tile_mask        # Selects the tile bits only
+NEIGHBORS = layout(SIZE).neighbors
+
+# Function to work out the board size: given, or from the first 2D board
+def board_size(*boards, size=None):
+    if size:
+        return size
+    for board in boards:
+        if not isinstance(board, int):
+            return len(board)
+    return SIZE
+
+# Function to pack a 2D board into a single int state
+def encode_board(board):
+    lay = layout(len(board))
+    state = 0
+    blank = 0
+    for i, tile in enumerate(cell for row in board for cell in row):
+        state |= tile << (lay.bits * i)   # Drop the tile into its slot
+        if tile == 0:
+            blank = i                   # Remember where the blank is
+    return state | (blank << lay.blank_shift)
+
+# Function to unpack an int state back into a 2D board (for printing)
+def decode_board(state, size=SIZE):
+    lay = layout(size)
+    tiles = [(state >> (lay.bits * i)) & lay.tile_bits for i in range(lay.cells)]
+    return [tiles[r * size:(r + 1) * size] for r in range(size)]
+
+# Function to find the blank tile: cached in the state, no scan needed
+def find_blank(state, size=SIZE):
+    return divmod(state >> layout(size).blank_shift, size)   # Return its position (row, col)
+
+# Function to slide the tile on cell `target` into the blank
+def slide(state, target, size=SIZE):
+    lay = layout(size)
+    blank = state >> lay.blank_shift
+    tile = (state >> (lay.bits * target)) & lay.tile_bits
+    # Blank slot holds 0, so XOR moves the tile out of target and into blank
+    tiles = (state & lay.tile_mask) ^ (tile << (lay.bits * target)) ^ (tile << (lay.bits * blank))
+    return tiles | (target << lay.blank_shift)
+
+# Function to generate every state one move away
+def successors(state, size=SIZE):
+    return [slide(state, target, size) for target in layout(size).neighbors[state >> layout(size).blank_shift]]
+
+# Function to accept either a 2D board or an already packed state
+def as_state(board):
+    return board if isinstance(board, int) else encode_board(board)
+
+# Function to check if the current state matches the goal state (boards or packed ints)
 def is_goal(board, goal):
     return board == goal
 
 
+# ---- Solvability check ----
+# Function to list the tiles in reading order, skipping the blank
+def tile_order(state, size=SIZE):
+    lay = layout(size)
+    return [t for t in ((state >> (lay.bits * i)) & lay.tile_bits for i in range(lay.cells)) if t]
+
+# Function to count pairs of tiles that appear out of order
+def count_inversions(tiles):
+    return sum(1 for i in range(len(tiles)) for j in range(i + 1, len(tiles)) if tiles[i] > tiles[j])
+
+# Function to check whether goal is reachable from start at all.
+# Odd widths: a move never changes the inversion parity of the tile order.
+# Even widths: a vertical move flips it and also moves the blank one row,
+# so inversions + blank row keeps its parity.
+def is_solvable(start, goal, size=None):
+    size = board_size(start, goal, size=size)
+    start, goal = as_state(start), as_state(goal)
+    parity = count_inversions(tile_order(start, size)) - count_inversions(tile_order(goal, size))
+    if size % 2 == 0:
+        shift = layout(size).blank_shift
+        parity += (start >> shift) // size - (goal >> shift) // size
+    return parity % 2 == 0
+
+
+# ---- Precomputed goal-distance table (3x3 only) ----
+# Exactly half of the 9! boards can reach a given goal: 9 blank positions
+# times the 8!/2 tile orders with the goal's inversion parity, 181,440 in all.
+# Each one gets a byte holding its optimal distance to the goal, built once
+# by BFS backwards from the goal and memory-mapped on later runs.
+TABLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache")
+TABLE_SIZE = CELLS * factorial(CELLS - 1) // 2
+UNREACHED = 255                           # Marker while building the table
+# Lehmer-code weights for the first CELLS-3 tiles. The last two digits are
+# dropped: the second to last only picks the parity and the last is always 0.
+HALF_FACTORIALS = [factorial(CELLS - 2 - i) // 2 for i in range(CELLS - 3)]
+_tables = {}                              # goal state -> loaded mmap
+
+# Function to map a state to its slot in the distance table for this goal.
+# goal_rank[t] is tile t's place in the goal's tile order, so the goal itself
+# ranks as the identity permutation.
+def table_index(state, goal_rank):
+    index = 0
+    seen = 0
+    i = 0
+    for cell in range(CELLS):
+        tile = (state >> (4 * cell)) & 15
+        if not tile:
+            continue
+        if i == CELLS - 3:                # Remaining digits don't add to the index
+            break
+        r = goal_rank[tile]
+        index += (r - (seen & ((1 << r) - 1)).bit_count()) * HALF_FACTORIALS[i]
+        seen |= 1 << r
+        i += 1
+    return (state >> BLANK_SHIFT) * (TABLE_SIZE // CELLS) + index
+
+# Function to build goal_rank for table_index
+def goal_ranks(goal):
+    goal_rank = [0] * CELLS
+    for r, tile in enumerate(tile_order(goal)):
+        goal_rank[tile] = r
+    return goal_rank
+
+# Function to name the table file of a goal
+def table_path(goal):
+    return os.path.join(TABLE_DIR, "8puzzle_" + "".join(map(str, tile_order(goal))) + f"_{goal >> BLANK_SHIFT}.dist")
+
+# Function to BFS out from the goal and write every distance to disk
+def build_distance_table(goal):
+    goal = as_state(goal)
+    goal_rank = goal_ranks(goal)
+    table = bytearray([UNREACHED]) * TABLE_SIZE
+    table[table_index(goal, goal_rank)] = 0
+    frontier = [goal]
+    depth = 0
+    while frontier:                       # Level by level, so no depth per entry
+        depth += 1
+        next_frontier = []
+        for state in frontier:
+            for new_state in successors(state):
+                i = table_index(new_state, goal_rank)
+                if table[i] == UNREACHED:
+                    table[i] = depth
+                    next_frontier.append(new_state)
+        frontier = next_frontier
+    
+    os.makedirs(TABLE_DIR, exist_ok=True)
+    path = table_path(goal)
+    with open(path + ".tmp", "wb") as f:  # Write then rename, so readers never see half a file
+        f.write(table)
+    os.replace(path + ".tmp", path)
+    return path
+
+# Function to refuse boards the 3x3 table can't index. A packed state doesn't
+# carry its size, so a packed 4x4 board is caught by its tiles running into
+# the 3x3 blank slot (a "blank cell" of 9 or more).
+def check_table_size(*boards, size=None):
+    if board_size(*boards, size=size) != 3 or any(
+            isinstance(board, int) and board >> BLANK_SHIFT >= CELLS for board in boards):
+        raise ValueError("the distance table is only available for the 3x3 puzzle")
+
+# Function to memory-map the table for a goal, building it on first use
+def load_distance_table(goal, size=None):
+    check_table_size(goal, size=size)
+    goal = as_state(goal)
+    if goal not in _tables:
+        path = table_path(goal)
+        if not os.path.exists(path):
+            build_distance_table(goal)
+        with open(path, "rb") as f:
+            _tables[goal] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return _tables[goal]
+
+# Function to look up the optimal number of moves (None if unsolvable)
+def table_distance(start, goal, size=None):
+    check_table_size(start, goal, size=size)
+    start, goal = as_state(start), as_state(goal)
+    if not is_solvable(start, goal):
+        return None
+    return load_distance_table(goal)[table_index(start, goal_ranks(goal))]
+
+# Function to solve optimally by walking downhill through the table.
+# Returns the list of packed states from start to goal, or None if unsolvable.
+def solve_with_table(start, goal, size=None):
+    check_table_size(start, goal, size=size)
+    start, goal = as_state(start), as_state(goal)
+    if not is_solvable(start, goal):
+        return None
+    table = load_distance_table(goal)
+    goal_rank = goal_ranks(goal)
+    path = [start]
+    distance = table[table_index(start, goal_rank)]
+    while distance:
+        for new_state in successors(path[-1]):    # Some neighbor is one step closer
+            if table[table_index(new_state, goal_rank)] == distance - 1:
+                path.append(new_state)
+                distance -= 1
+                break
+    return path
+
 # Breadth-First Search with depth limit
-def bfs_limited(start, goal, max_depth=20):
+def bfs_limited(start, goal, max_depth=20, size=None, tracer=None):
     print(f"Breadth First Search (max depth: {max_depth}):")
+    lay = layout(board_size(start, goal, size=size))
+    start, goal = as_state(start), as_state(goal)   # Work on packed states
+    if not is_solvable(start, goal, lay.size):         # Wrong parity: no need to search
+        print("Goal is unreachable from this start (inversion parity differs).\n")
+        return False
     
-    # Queue stores tuples of (board state, depth)
+    # Queue stores tuples of (packed state, depth)
     q = deque([(start, 0)])
-    visited = set()                          # Store visited states
-    visited.add(board_to_string(start))      # Mark start as visited
+    visited = {start}                        # Packed states hash as ints
     nodes_explored = 0                       # Counter for explored nodes
+    on_node = tracer.node_hook("bfs_limited") if tracer else None
     
     # BFS loop
     while q and nodes_explored < 1000:       # Stop if >1000 nodes explored
         current, depth = q.popleft()         # Pop from front (FIFO queue)
         nodes_explored += 1
         
-        print(f"Depth {depth}, Nodes explored: {nodes_explored}")
-        print_board(current)
+        if on_node:                          # Traced runs record the node (see Tracing.py)
+            on_node(nodes_explored, depth, current)
         
         if is_goal(current, goal):           # Check if goal reached
             print(f"Goal found in BFS at depth {depth}! Nodes explored: {nodes_explored}\n")
+            if tracer:
+                tracer.summary("bfs_limited", nodes=nodes_explored, depth=depth, found=True)
             return True
             
         if depth >= max_depth:               # Skip if we hit max depth
             continue
         
-        # Find blank tile to generate neighbors
-        x, y = find_blank(current)
-        moves = [(1,0), (-1,0), (0,1), (0,-1)]   # Possible moves (down, up, right, left)
-        
-        for dx, dy in moves:                     # Try each move
-            newX, newY = x + dx, y + dy
-            if 0 <= newX < 3 and 0 <= newY < 3:  # Check board boundaries
-                new_board = swap(current, x, y, newX, newY)   # Swap blank with neighbor
-                new_str = board_to_string(new_board)          # Convert to string
-                
-                if new_str not in visited:       # Only expand if unvisited
-                    visited.add(new_str)
-                    q.append((new_board, depth + 1))   # Add new state to queue
+        # Slide each neighbor of the cached blank position into it
+        blank = current >> lay.blank_shift
+        tiles = current & lay.tile_mask
+        for target in lay.neighbors[blank]:
+            tile = (tiles >> (lay.bits * target)) & lay.tile_bits
+            new_state = (tiles ^ (tile << (lay.bits * target)) ^ (tile << (lay.bits * blank))) | (target << lay.blank_shift)
+            
+            if new_state not in visited:         # Only expand if unvisited
+                visited.add(new_state)
+                q.append((new_state, depth + 1)) # Add new state to queue
     
     print(f"Goal not found in BFS within depth {max_depth}. Nodes explored: {nodes_explored}\n")
+    if tracer:
+        tracer.summary("bfs_limited", nodes=nodes_explored, found=False)
     return False
 
 # Depth-First Search with depth limit
-def dfs_limited(start, goal, max_depth=15):
+def dfs_limited(start, goal, max_depth=15, size=None, tracer=None):
     print(f"Depth First Search (max depth: {max_depth}):")
+    lay = layout(board_size(start, goal, size=size))
+    start, goal = as_state(start), as_state(goal)   # Work on packed states
+    if not is_solvable(start, goal, lay.size):         # Wrong parity: no need to search
+        print("Goal is unreachable from this start (inversion parity differs).\n")
+        return False
     
-    # Stack stores tuples of (board state, depth)
+    # Stack stores tuples of (packed state, depth)
     stack = [(start, 0)]
-    visited = set()                          # Store visited states
-    visited.add(board_to_string(start))      # Mark start as visited
+    visited = {start}                        # Packed states hash as ints
     nodes_explored = 0
+    on_node = tracer.node_hook("dfs_limited") if tracer else None
     
     # DFS loop
     while stack and nodes_explored < 1000:   # Stop if >1000 nodes explored
         current, depth = stack.pop()         # Pop from back (LIFO stack)
         nodes_explored += 1
         
-        print(f"Depth {depth}, Nodes explored: {nodes_explored}")
-        print_board(current)
+        if on_node:                          # Traced runs record the node (see Tracing.py)
+            on_node(nodes_explored, depth, current)
         
         if is_goal(current, goal):           # Check if goal reached
             print(f"Goal found in DFS at depth {depth}! Nodes explored: {nodes_explored}\n")
+            if tracer:
+                tracer.summary("dfs_limited", nodes=nodes_explored, depth=depth, found=True)
             return True
             
         if depth >= max_depth:               # Stop expanding if max depth reached
             continue
         
-        # Find blank tile to generate neighbors
-        x, y = find_blank(current)
-        moves = [(1,0), (-1,0), (0,1), (0,-1)]   # Possible moves
-        
-        for dx, dy in moves:                     # Try each move
-            newX, newY = x + dx, y + dy
-            if 0 <= newX < 3 and 0 <= newY < 3:  # Check board boundaries
-                new_board = swap(current, x, y, newX, newY)
-                new_str = board_to_string(new_board)
-                
-                if new_str not in visited:       # Only expand if unvisited
-                    visited.add(new_str)
-                    stack.append((new_board, depth + 1))   # Add new state to stack
+        # Slide each neighbor of the cached blank position into it
+        blank = current >> lay.blank_shift
+        tiles = current & lay.tile_mask
+        for target in lay.neighbors[blank]:
+            tile = (tiles >> (lay.bits * target)) & lay.tile_bits
+            new_state = (tiles ^ (tile << (lay.bits * target)) ^ (tile << (lay.bits * blank))) | (target << lay.blank_shift)
+            
+            if new_state not in visited:         # Only expand if unvisited
+                visited.add(new_state)
+                stack.append((new_state, depth + 1))   # Add new state to stack
     
     print(f"Goal not found in DFS within depth {max_depth}. Nodes explored: {nodes_explored}\n")
+    if tracer:
+        tracer.summary("dfs_limited", nodes=nodes_explored, found=False)
     return False
 
 
-if __name__ == "__main__":
+# ---- Informed search: A* and IDA* on any N x N board ----
+# Heuristics are admissible lower bounds on the moves left. Each one is built
+# for a goal and board size, scores a whole state with h(state), and can
+# rescore after a single move with update(). IDA* relies on the latter: one
+# move only touches one tile, so there is no need to rescan the board.
+SearchResult = namedtuple("SearchResult", "path cost nodes_expanded branching_factor")
+
+class MisplacedTiles:
+    """Counts the tiles that are not on their goal cell."""
+
+    def __init__(self, goal, size=SIZE):
+        self.lay = layout(size)
+        goal = as_state(goal)
+        self.goal_cell = [0] * self.lay.cells     # goal_cell[tile] = where it belongs
+        for cell in range(self.lay.cells):
+            self.goal_cell[(goal >> (self.lay.bits * cell)) & self.lay.tile_bits] = cell
+
+    def __call__(self, state):
+        lay = self.lay
+        return sum(1 for cell in range(lay.cells)
+                   if (tile := (state >> (lay.bits * cell)) & lay.tile_bits) and self.goal_cell[tile] != cell)
+
+    def update(self, h, state, new_state, tile, src, dst):
+        """Score of new_state, reached from state by sliding tile from cell src to cell dst."""
+        return h - (src != self.goal_cell[tile]) + (dst != self.goal_cell[tile])
+
+class Manhattan(MisplacedTiles):
+    """Sums how many rows and columns each tile is away from its goal cell."""
+
+    def __init__(self, goal, size=SIZE):
+        super().__init__(goal, size)
+        # distance[tile][cell] is looked up instead of recomputed per move
+        self.distance = [[abs(cell // size - g // size) + abs(cell % size - g % size)
+                          for cell in range(self.lay.cells)] for g in self.goal_cell]
+
+    def __call__(self, state):
+        lay = self.lay
+        return sum(self.distance[tile][cell] for cell in range(lay.cells)
+                   if (tile := (state >> (lay.bits * cell)) & lay.tile_bits))
+
+    def update(self, h, state, new_state, tile, src, dst):
+        return h - self.distance[tile][src] + self.distance[tile][dst]
+
+class LinearConflict(Manhattan):
+    """
+    Manhattan distance plus 2 moves for every tile that must leave its goal
+    row (or column) to let another tile in that line past it. The number of
+    such tiles per line is the line's goal tiles minus their longest run
+    already in goal order.
+    """
+
+    def __init__(self, goal, size=SIZE):
+        super().__init__(goal, size)
+        rows = [tuple(range(r * size, (r + 1) * size)) for r in range(size)]
+        cols = [tuple(range(c, self.lay.cells, size)) for c in range(size)]
+        self.lines = rows + cols                  # Line i < size is row i, else column i - size
+        # For each line, where each tile sits within that line in the goal
+        # (None if the tile's goal is on another line)
+        self.goal_slot = []
+        for i, line in enumerate(self.lines):
+            slots = [None] * self.lay.cells
+            for slot, cell in enumerate(line):
+                slots[self.goal_cell.index(cell)] = slot
+            slots[0] = None                       # The blank never conflicts
+            self.goal_slot.append(slots)
+        self._memo = {}                           # (line, tiles) -> extra moves
+
+    def _line_cost(self, state, i):
+        lay = self.lay
+        tiles = tuple((state >> (lay.bits * cell)) & lay.tile_bits for cell in self.lines[i])
+        key = (i, tiles)
+        cost = self._memo.get(key)
+        if cost is None:
+            slots = [s for s in (self.goal_slot[i][t] for t in tiles) if s is not None]
+            # Longest increasing run of goal slots: those tiles can stay put
+            longest = [1] * len(slots)
+            for a in range(len(slots)):
+                for b in range(a):
+                    if slots[b] < slots[a] and longest[b] + 1 > longest[a]:
+                        longest[a] = longest[b] + 1
+            cost = 2 * (len(slots) - max(longest, default=0))
+            self._memo[key] = cost
+        return cost
+
+    def __call__(self, state):
+        return super().__call__(state) + sum(self._line_cost(state, i) for i in range(len(self.lines)))
+
+    def update(self, h, state, new_state, tile, src, dst):
+        size = self.lay.size
+        h = h - self.distance[tile][src] + self.distance[tile][dst]
+        if src // size == dst // size:           # Sideways move: the tile changes column
+            touched = (size + src % size, size + dst % size)
+        else:                                     # Vertical move: the tile changes row
+            touched = (src // size, dst // size)
+        for i in touched:
+            h += self._line_cost(new_state, i) - self._line_cost(state, i)
+        return h
+
+# ---- Additive pattern databases ----
+# Each pattern is a group of tiles; its database stores, for every placement
+# of those tiles, the fewest moves *of those tiles* needed to get them home,
+# with every other tile treated as interchangeable. Since the groups are
+# disjoint and only their own moves are counted, the per-group values add up
+# to an admissible bound that dominates Manhattan distance. Tables are built
+# once by a 0-1 BFS back from the goal (moving another tile costs 0, moving a
+# pattern tile costs 1), saved one byte per placement, and memory-mapped the
+# first time a heuristic needs them.
+#
+# A 7-8 split is the classic choice for the 15-puzzle, but its 8-tile table
+# alone has 16!/8! (about 519 million) entries, and the build's visited map
+# needs 16 times that in bytes, so in pure Python it is a job for a big
+# machine and a long run. 5-5-5 builds in a few minutes; 6-6-3 in under an hour.
+PARTITIONS = {
+    "4-4": ((1, 2, 3, 4), (5, 6, 7, 8)),
+    "5-5-5": ((1, 2, 3, 5, 6), (4, 7, 8, 11, 12), (9, 10, 13, 14, 15)),
+    "6-6-3": ((1, 5, 6, 9, 10, 13), (7, 8, 11, 12, 14, 15), (2, 3, 4)),
+    "7-8": ((1, 2, 5, 6, 9, 10, 13), (3, 4, 7, 8, 11, 12, 14, 15)),
+}
+
+DEFAULT_PARTITION = {3: "4-4", 4: "5-5-5"}   # Used when no partition is given
+
+# Function to count the placements of k tiles on n cells: n! / (n-k)!
+def placements(n, k):
+    return factorial(n) // factorial(n - k)
+
+# Function to map the cells of a pattern's tiles to a unique table slot
+def placement_index(cells_of_tiles, weights):
+    index = 0
+    seen = 0
+    for cell, weight in zip(cells_of_tiles, weights):
+        index += (cell - (seen & ((1 << cell) - 1)).bit_count()) * weight
+        seen |= 1 << cell
+    return index
+
+# Function to get the placement_index weights for k tiles on n cells
+def placement_weights(n, k):
+    return [placements(n - 1 - i, k - 1 - i) for i in range(k)]
+
+# Function to name the database file of one pattern
+def pattern_path(pattern, goal, size):
+    name = "-".join(map(str, pattern))
+    goal_name = "".join(format(t, "x") for row in decode_board(goal, size) for t in row)
+    return os.path.join(TABLE_DIR, f"pdb{size}x{size}_{goal_name}_{name}.pdb")
+
+# Function to build one pattern's database and write it to disk
+def build_pattern_database(pattern, goal, size=4):
+    lay = layout(size)
+    goal = as_state(goal)
+    cells, k = lay.cells, len(pattern)
+    weights = placement_weights(cells, k)
+    goal_cell = MisplacedTiles(goal, size).goal_cell
+    table = bytearray([UNREACHED]) * placements(cells, k)
+    seen = bytearray(len(table) * cells)       # (placement, blank cell) already expanded
+    
+    # 0-1 BFS: free moves go to the front, pattern moves to the back, so the
+    # first time a placement is popped its cost is final
+    home = tuple(goal_cell[t] for t in pattern)
+    q = deque([(home, placement_index(home, weights), goal >> lay.blank_shift, 0)])
+    while q:
+        where, index, blank, cost = q.popleft()
+        key = index * cells + blank
+        if seen[key]:
+            continue
+        seen[key] = 1
+        if table[index] == UNREACHED:
+            table[index] = cost
+        for target in lay.neighbors[blank]:
+            if target in where:                # A pattern tile slides into the blank
+                moved = tuple(blank if c == target else c for c in where)
+                new_index = placement_index(moved, weights)
+                if not seen[new_index * cells + target]:
+                    q.append((moved, new_index, target, cost + 1))
+            elif not seen[index * cells + target]:
+                q.appendleft((where, index, target, cost))
+    
+    os.makedirs(TABLE_DIR, exist_ok=True)
+    path = pattern_path(pattern, goal, size)
+    with open(path + ".tmp", "wb") as f:       # Write then rename, so readers never see half a file
+        f.write(table)
+    os.replace(path + ".tmp", path)
+    return path
+
+class PatternDatabase(MisplacedTiles):
+    """
+    Sum of disjoint pattern database lookups. `partition` is a name from
+    PARTITIONS or a list of tile groups; every non-blank tile may appear in at
+    most one group. Tables are built (if missing) and mapped on first use.
+    """
+
+    def __init__(self, goal, size=4, partition=None):
+        super().__init__(goal, size)
+        self.goal = as_state(goal)
+        if partition is None:
+            if size not in DEFAULT_PARTITION:
+                raise ValueError(f"no default partition for a {size}x{size} board, pass one")
+            partition = DEFAULT_PARTITION[size]
+        self.patterns = PARTITIONS[partition] if isinstance(partition, str) else tuple(map(tuple, partition))
+        tiles = [t for pattern in self.patterns for t in pattern]
+        if len(tiles) != len(set(tiles)) or not set(tiles) <= set(range(1, self.lay.cells)):
+            raise ValueError("patterns must be disjoint groups of tiles on the board")
+        self.weights = [placement_weights(self.lay.cells, len(p)) for p in self.patterns]
+        self.group_of = [None] * self.lay.cells    # group_of[tile] = which pattern owns it
+        for i, pattern in enumerate(self.patterns):
+            for t in pattern:
+                self.group_of[t] = i
+        self.tables = None
+
+    def load(self):
+        """Memory-map every table, building the missing ones first."""
+        if self.tables is None:
+            tables = []
+            for pattern in self.patterns:
+                path = pattern_path(pattern, self.goal, self.lay.size)
+                if not os.path.exists(path):
+                    build_pattern_database(pattern, self.goal, self.lay.size)
+                with open(path, "rb") as f:
+                    tables.append(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+            self.tables = tables
+        return self.tables
+
+    def _lookup(self, state, i):
+        lay = self.lay
+        where = [0] * lay.cells
+        for cell in range(lay.cells):
+            where[(state >> (lay.bits * cell)) & lay.tile_bits] = cell
+        return self.tables[i][placement_index([where[t] for t in self.patterns[i]], self.weights[i])]
+
+    def __call__(self, state):
+        self.load()
+        return sum(self._lookup(state, i) for i in range(len(self.patterns)))
+
+    def update(self, h, state, new_state, tile, src, dst):
+        i = self.group_of[tile]
+        if i is None:                              # Tile in no pattern: bound unchanged
+            return h
+        return h - self._lookup(state, i) + self._lookup(new_state, i)
+
+HEURISTICS = {
+    "misplaced": MisplacedTiles,
+    "manhattan": Manhattan,
+    "linear_conflict": LinearConflict,
+    "pdb": PatternDatabase,
+}
+
+# Function to solve N = b + b^2 + ... + b^d for b (bisection), the usual way
+# of comparing heuristics independently of solution depth
+def effective_branching_factor(nodes, depth):
+    if depth <= 0 or nodes <= depth:
+        return 1.0 if depth > 0 else 0.0
+    low, high = 1.0, float(nodes)
+    for _ in range(100):
+        mid = (low + high) / 2
+        total, term = 0.0, 1.0
+        for _ in range(depth):               # Stop summing once past nodes (no overflow)
+            term *= mid
+            total += term
+            if total >= nodes:
+                break
+        if total < nodes:
+            low = mid
+        else:
+            high = mid
+    return (low + high) / 2
+
+# Function to build a heuristic from its name (or pass an instance through)
+def make_heuristic(heuristic, goal, size):
+    if isinstance(heuristic, str):
+        return HEURISTICS[heuristic](goal, size)
+    return heuristic
+
+# A* search: optimal, but keeps every generated state in memory
+def a_star(start, goal, heuristic="manhattan", size=None, max_nodes=None):
+    lay = layout(board_size(start, goal, size=size))
+    start, goal = as_state(start), as_state(goal)
+    if not is_solvable(start, goal, lay.size):
+        return None
+    h = make_heuristic(heuristic, goal, lay.size)
+    bits, tile_bits, blank_shift, tile_mask = lay.bits, lay.tile_bits, lay.blank_shift, lay.tile_mask
+    
+    # Heap entries: (f, -g, state, h); ties go to the deeper node
+    h0 = h(start)
+    open_heap = [(h0, 0, start, h0)]
+    best_g = {start: 0}
+    came_from = {start: None}
+    nodes_expanded = 0
+    
+    while open_heap:
+        f, neg_g, current, h_cur = heapq.heappop(open_heap)
+        g = -neg_g
+        if g > best_g[current]:              # Stale entry, a cheaper copy was expanded
+            continue
+        if current == goal:
+            path = []
+            while current is not None:
+                path.append(current)
+                current = came_from[current]
+            path.reverse()
+            return SearchResult(path, g, nodes_expanded, effective_branching_factor(nodes_expanded, g))
+        if max_nodes is not None and nodes_expanded >= max_nodes:
+            break
+        nodes_expanded += 1
+        
+        blank = current >> blank_shift
+        tiles = current & tile_mask
+        for target in lay.neighbors[blank]:
+            tile = (tiles >> (bits * target)) & tile_bits
+            new_state = (tiles ^ (tile << (bits * target)) ^ (tile << (bits * blank))) | (target << blank_shift)
+            new_g = g + 1
+            if new_g < best_g.get(new_state, new_g + 1):
+                best_g[new_state] = new_g
+                came_from[new_state] = current
+                new_h = h.update(h_cur, current, new_state, tile, target, blank)
+                heapq.heappush(open_heap, (new_g + new_h, -new_g, new_state, new_h))
+    return None
+
+# IDA* search: repeated depth-first searches with a growing f = g + h bound,
+# so memory stays linear in the solution length (what the 15-puzzle needs)
+def ida_star(start, goal, heuristic="linear_conflict", size=None, max_nodes=None):
+    lay = layout(board_size(start, goal, size=size))
+    start, goal = as_state(start), as_state(goal)
+    if not is_solvable(start, goal, lay.size):
+        return None
+    h = make_heuristic(heuristic, goal, lay.size)
+    bits, tile_bits, blank_shift, tile_mask = lay.bits, lay.tile_bits, lay.blank_shift, lay.tile_mask
+    neighbors, update = lay.neighbors, h.update
+    path = [start]
+    nodes_expanded = 0
+    FOUND = -1
+    
+    # Returns FOUND, or the smallest f that went over the bound
+    def search(state, g, h_cur, bound, came_from_cell):
+        nonlocal nodes_expanded
+        f = g + h_cur
+        if f > bound:
+            return f
+        if state == goal:
+            return FOUND
+        if max_nodes is not None and nodes_expanded >= max_nodes:
+            return float("inf")
+        nodes_expanded += 1
+        
+        next_bound = float("inf")
+        blank = state >> blank_shift
+        tiles = state & tile_mask
+        for target in neighbors[blank]:
+            if target == came_from_cell:         # Don't undo the previous move
+                continue
+            tile = (tiles >> (bits * target)) & tile_bits
+            new_state = (tiles ^ (tile << (bits * target)) ^ (tile << (bits * blank))) | (target << blank_shift)
+            path.append(new_state)
+            t = search(new_state, g + 1, update(h_cur, state, new_state, tile, target, blank), bound, blank)
+            if t == FOUND:
+                return FOUND
+            path.pop()
+            if t < next_bound:
+                next_bound = t
+        return next_bound
+    
+    h0 = h(start)
+    bound = h0
+    while True:
+        t = search(start, 0, h0, bound, None)
+        if t == FOUND:
+            cost = len(path) - 1
+            return SearchResult(list(path), cost, nodes_expanded, effective_branching_factor(nodes_expanded, cost))
+        if t == float("inf"):                    # Nothing left under any bound (or node cap hit)
+            return None
+        bound = t
+
+# Function to pick an informed solver by name
+def solve(start, goal, method="ida*", heuristic="linear_conflict", size=None, max_nodes=None):
+    solver = {"a*": a_star, "ida*": ida_star}[method]
+    return solver(start, goal, heuristic=heuristic, size=size, max_nodes=max_nodes)
+
+
+# Bidirectional BFS: grows one frontier from the start and one from the goal,
+# always expanding a full layer of whichever is smaller, and stitches the two
+# parent chains together where they meet. Moves are reversible, so the goal
+# side uses the same successor function. Explores about b^(d/2) states a side
+# instead of b^d.
+def bidirectional_bfs(start, goal, size=None, max_nodes=None):
+    lay = layout(board_size(start, goal, size=size))
+    start, goal = as_state(start), as_state(goal)
+    if not is_solvable(start, goal, lay.size):
+        return None
+    bits, tile_bits, blank_shift, tile_mask = lay.bits, lay.tile_bits, lay.blank_shift, lay.tile_mask
+    
+    # parents[side][state] = neighbor one step closer to that side's root;
+    # depth[side][state] = distance from that root
+    parents = ({start: None}, {goal: None})
+    depth = ({start: 0}, {goal: 0})
+    frontiers = ([start], [goal])
+    nodes_expanded = 0
+    best = (0, start) if start == goal else None   # (cost, meeting state)
+    
+    while frontiers[0] and frontiers[1] and best is None:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        mine, other = parents[side], parents[1 - side]
+        my_depth, other_depth = depth[side], depth[1 - side]
+        next_frontier = []
+        for current in frontiers[side]:
+            if max_nodes is not None and nodes_expanded >= max_nodes:
+                return None
+            nodes_expanded += 1
+            blank = current >> blank_shift
+            tiles = current & tile_mask
+            for target in lay.neighbors[blank]:
+                tile = (tiles >> (bits * target)) & tile_bits
+                new_state = (tiles ^ (tile << (bits * target)) ^ (tile << (bits * blank))) | (target << blank_shift)
+                if new_state in mine:
+                    continue
+                mine[new_state] = current
+                my_depth[new_state] = my_depth[current] + 1
+                next_frontier.append(new_state)
+                if new_state in other:       # Frontiers touch: keep the cheapest meeting in this layer
+                    cost = my_depth[new_state] + other_depth[new_state]
+                    if best is None or cost < best[0]:
+                        best = (cost, new_state)
+        frontiers[side][:] = next_frontier
+    
+    if best is None:
+        return None
+    # Walk back to the start, then forward to the goal, through the meeting state
+    cost, meet = best
+    path = []
+    state = meet
+    while state is not None:
+        path.append(state)
+        state = parents[0][state]
+    path.reverse()
+    state = parents[1][meet]
+    while state is not None:
+        path.append(state)
+        state = parents[1][state]
+    return SearchResult(path, cost, nodes_expanded, effective_branching_factor(nodes_expanded, cost))
+
+
+# ---- Batch solving ----
+# Many instances are fanned out over a process pool. States cross the process
+# boundary as packed ints (and come back as SearchResults of packed ints), and
+# are sent in chunks with a bounded number in flight, so results stream back
+# in input order without reading the whole input into memory first.
+BATCH_METHODS = ("table", "ida*", "a*", "bidirectional")
+
+# Function to read one board from a line: the tiles in reading order,
+# separated by spaces or commas ("1 2 3 4 0 6 7 5 8")
+def parse_board(line):
+    tiles = [int(t) for t in line.replace(",", " ").split()]
+    size = int(round(len(tiles) ** 0.5))
+    if size * size != len(tiles) or sorted(tiles) != list(range(len(tiles))):
+        raise ValueError(f"not a square sliding-puzzle board: {line.strip()!r}")
+    return [tiles[r * size:(r + 1) * size] for r in range(size)]
+
+# Function to solve one packed instance (runs inside a worker process)
+def solve_packed(start, goal, size, method, heuristic):
+    if method == "table":
+        path = solve_with_table(start, goal, size=size)
+        return None if path is None else SearchResult(path, len(path) - 1, len(path) - 1, 1.0)
+    if method == "bidirectional":
+        return bidirectional_bfs(start, goal, size=size)
+    return solve(start, goal, method=method, heuristic=heuristic, size=size)
+
+# Function to solve a chunk of packed starts in one worker round trip
+def solve_chunk(starts, goal, size, method, heuristic):
+    return [solve_packed(start, goal, size, method, heuristic) for start in starts]
+
+# Function to solve many boards in parallel, yielding SearchResults (or None
+# for unsolvable starts) in the same order as `starts`
+def solve_batch(starts, goal, method="ida*", heuristic="linear_conflict", workers=None, chunksize=32):
+    if method not in BATCH_METHODS:
+        raise ValueError(f"unknown method {method!r}, expected one of {BATCH_METHODS}")
+    size = board_size(goal)
+    if method == "table":
+        check_table_size(goal)                   # Here, not in every worker
+    goal = as_state(goal)
+    workers = workers or os.cpu_count() or 1
+    
+    # Function to cut the (possibly lazy) input into packed chunks
+    def chunks():
+        chunk = []
+        for board in starts:
+            if not isinstance(board, int) and len(board) != size:
+                raise ValueError(f"a {len(board)}x{len(board)} board can't reach a {size}x{size} goal")
+            chunk.append(as_state(board))
+            if len(chunk) == chunksize:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    
+    from concurrent.futures import ProcessPoolExecutor   # Only batch runs pay for the import
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks():
+            pending.append(pool.submit(solve_chunk, chunk, goal, size, method, heuristic))
+            if len(pending) >= 2 * workers:      # Keep every worker busy, but no more
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+# Function to read the boards of a file lazily, one per non-blank line,
+# naming the line of a bad one (or of one that isn't size x size)
+def read_boards(f, size=None):
+    for n, line in enumerate(f, 1):
+        if line.strip():
+            try:
+                board = parse_board(line)
+                if size and len(board) != size:
+                    raise ValueError(f"a {len(board)}x{len(board)} board, the goal is {size}x{size}")
+            except ValueError as e:
+                raise ValueError(f"line {n}: {e}") from None
+            yield board
+
+# Function to solve every board in a file and write one line per board:
+# "<cost> <nodes expanded>", or "unsolvable"
+def run_batch(path, goal, out, method="ida*", heuristic="linear_conflict", workers=None):
+    with open(path) as f:
+        for result in solve_batch(read_boards(f), goal, method, heuristic, workers):
+            out.write("unsolvable\n" if result is None else f"{result.cost} {result.nodes_expanded}\n")
+
+# Command line: no arguments runs the demo, --batch FILE solves a file of boards
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Sliding puzzle search (8-puzzle, 15-puzzle, ...)")
+    parser.add_argument("--batch", metavar="FILE", help="solve every board in FILE, one per line")
+    parser.add_argument("--goal", help="goal board in the same format (default: tiles in order, blank last)")
+    parser.add_argument("--method", choices=BATCH_METHODS, default="ida*")
+    parser.add_argument("--heuristic", choices=sorted(HEURISTICS), default="linear_conflict")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per core)")
+    args = parser.parse_args(argv)
+    
+    if not args.batch:
+        demo()
+        return
+    try:
+        goal = parse_board(args.goal) if args.goal else None
+    except ValueError as e:
+        parser.error(f"--goal: {e}")
+    try:
+        with open(args.batch) as f:              # Check every board before any work starts
+            first = next(read_boards(f), None)   # Default goal matches the first board's size
+            size = len(goal) if goal else len(first) if first else SIZE
+            f.seek(0)
+            deque(read_boards(f, size), maxlen=0)
+    except (OSError, ValueError) as e:
+        parser.error(f"{args.batch}: {e}")
+    if goal is None:
+        goal = parse_board(" ".join(map(str, list(range(1, size * size)) + [0])))
+    if args.method == "table" and size != 3:
+        parser.error(f"--method table only solves 3x3 boards, not {size}x{size}")
+    run_batch(args.batch, goal, sys.stdout, args.method, args.heuristic, args.workers)
+
+
+def demo():
     # Define start state
     start = [
         [1, 2, 3],
@@ -138,3 +911,37 @@ if __name__ == "__main__":
     # Run DFS search with max depth = 10
     bfs_limited(start, goal, max_depth=10)
     # dfs_limited(start, goal, max_depth=10)
+    
+    # Optimal solve from the precomputed distance table (built on first run)
+    path = solve_with_table(start, goal)
+    print(f"Optimal solution from distance table: {len(path) - 1} moves")
+    
+    # Informed search: compare the heuristics on the same instance
+    for name in HEURISTICS:
+        result = a_star(start, goal, heuristic=name)
+        print(f"A* ({name}): {result.cost} moves, {result.nodes_expanded} nodes expanded, "
+              f"effective branching factor {result.branching_factor:.2f}")
+    
+    # The informed solvers work on any N x N board, e.g. the 15-puzzle
+    start15 = [
+        [5, 1, 3, 4],
+        [9, 2, 7, 8],
+        [0, 6, 10, 12],
+        [13, 14, 11, 15]
+    ]
+    goal15 = [
+        [1, 2, 3, 4],
+        [5, 6, 7, 8],
+        [9, 10, 11, 12],
+        [13, 14, 15, 0]
+    ]
+    result = ida_star(start15, goal15, heuristic="linear_conflict")
+    print(f"IDA* (15-puzzle): {result.cost} moves, {result.nodes_expanded} nodes expanded")
+    
+    # Bidirectional BFS meets in the middle instead of growing one big frontier
+    result = bidirectional_bfs(start, goal)
+    print(f"Bidirectional BFS: {result.cost} moves, {result.nodes_expanded} nodes expanded")
+
+
+if __name__ == "__main__":
+    main()
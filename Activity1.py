@@ -17,9 +17,11 @@ Problem Statement: Implement and compare all types of AI searching algorithms
 # 1️⃣ UNINFORMED SEARCH — BFS and DFS in a Maze
 
 from collections import deque
-import heapq
 import random
 import math
+from GridMap import GridMap
+from JumpPoint import JumpPointSearch
+from Frontier import make_frontier, cell_costs
 
 maze = [
     ['S', '.', '.', '#', '.', '.', '.'],
@@ -31,6 +33,12 @@ maze = [
 rows, cols = len(maze), len(maze[0])
 directions = [(1,0), (-1,0), (0,1), (0,-1)]  # Down, Up, Right, Left
 
+# The maze searches run on a GridMap (see GridMap.py): cells are flat indices
+# r*cols+c, and each cell's open neighbors come from a precomputed table, so
+# the loops do no bounds or wall checks. Paths are still (row, col) tuples.
+grid = GridMap.from_rows(maze, directions)
+GOAL = ord('G')
+
 
 def print_maze(maze):
     for r in maze:
@@ -38,54 +46,49 @@ def print_maze(maze):
     print()
 
 
-def reconstruct_path(visited, end):
+def cell_path(visited, end):
+    """Follow parent links between cell indices back from end, as (row, col) positions"""
     path = []
-    while end:
-        path.append(end)
+    while end is not None:
+        path.append(divmod(end, cols))
         end = visited[end]
     return path[::-1]
 
 
 def bfs(start):
     """Breadth-First Search (Level-wise, Optimal for uniform cost)"""
-    queue = deque([start])
-    visited = {start: None}
+    cells, deltas, mask = grid.cells, grid.deltas, grid.mask
+    s = grid.index(*start)
+    queue = deque([s])
+    visited = {s: None}
     while queue:
-        x, y = queue.popleft()
-        if maze[x][y] == 'G':
-            return reconstruct_path(visited, (x, y))
-        for dx, dy in directions:
-            nx, ny = x+dx, y+dy
-            if 0 <= nx < rows and 0 <= ny < cols and maze[nx][ny] != '#' and (nx, ny) not in visited:
-                visited[(nx, ny)] = (x, y)
-                queue.append((nx, ny))
+        i = queue.popleft()
+        if cells[i] == GOAL:
+            return cell_path(visited, i)
+        for d in deltas[mask[i]]:
+            if i+d not in visited:
+                visited[i+d] = i
+                queue.append(i+d)
     return None
 
 
 def dfs(start):
     """Depth-First Search (Can get stuck in deep branches)"""
-    stack = [start]
-    visited = {start: None}
+    cells, deltas, mask = grid.cells, grid.deltas, grid.mask
+    s = grid.index(*start)
+    stack = [s]
+    visited = {s: None}
     while stack:
-        x, y = stack.pop()
-        if maze[x][y] == 'G':
-            return reconstruct_path(visited, (x, y))
-        for dx, dy in directions:
-            nx, ny = x+dx, y+dy
-            if 0 <= nx < rows and 0 <= ny < cols and maze[nx][ny] != '#' and (nx, ny) not in visited:
-                visited[(nx, ny)] = (x, y)
-                stack.append((nx, ny))
+        i = stack.pop()
+        if cells[i] == GOAL:
+            return cell_path(visited, i)
+        for d in deltas[mask[i]]:
+            if i+d not in visited:
+                visited[i+d] = i
+                stack.append(i+d)
     return None
 
 
-print("==== UNINFORMED SEARCH ====")
-print_maze(maze)
-print("BFS Path:", bfs((0, 0)))
-print("DFS Path:", dfs((0, 0)))
-print("BFS => Time: O(b^d), Space: O(b^d)")
-print("DFS => Time: O(b^m), Space: O(bm)")
-print("\n")
-
 # 2️⃣ INFORMED SEARCH — A* Algorithm (Heuristic = Manhattan Distance)
 
 def heuristic(a, b):
@@ -100,50 +103,62 @@ def reconstruct_path(came_from, current):
         path.append(current)
     return path[::-1]  # reverse to start→goal
 
-def a_star(start, goal):
-    """A* Search uses f(n) = g(n) + h(n)"""
-    open_set = [(0, start)]      # priority queue → stores (f(n), node)
-    g_score = {start: 0}         # cost from start to current node
+def a_star(start, goal, method="a*", frontier=None, costs=None, landmarks=None):
+    """
+    A* Search uses f(n) = g(n) + h(n); method="jps" expands only jump points.
+    costs: step cost per map character, e.g. {'~': 3} (1 for the rest).
+    frontier: "heap" (default), "bucket" or a frontier class (see Frontier.py).
+    landmarks: a Landmarks built for grid (see Landmarks.py) for h(n) instead of Manhattan.
+    """
+    deltas, mask, cells = grid.deltas, grid.mask, grid.cells
+    s, t = grid.index(*start), grid.index(*goal)   # work on flat cell indices
+    if method == "jps":
+        if costs:
+            raise ValueError("Jump Point Search needs uniform step costs")
+        path = JumpPointSearch(grid).search(s, t)
+        return None if path is None else [divmod(i, cols) for i in path]
+    step_cost, cheapest, integer = cell_costs(grid, costs)
+    # h(n) on cell indices; the landmark bound is None where the goal can't be reached
+    h = landmarks.heuristic(t) if landmarks else lambda i: heuristic(divmod(i, cols), goal)
+    open_set = make_frontier(frontier, integer)   # pops lowest f(n), then highest g(n)
+    open_set.push((h(s) or 0) * cheapest, 0, s)
+    g_score = {s: 0}             # cost from start to current node
     came_from = {}               # to reconstruct path later
+    closed = set()               # nodes already expanded with their final g
 
     while open_set:
-        _, current = heapq.heappop(open_set)
+        _, g, current = open_set.pop()
+        if current in closed:
+            continue             # stale entry, a cheaper copy was expanded already
         
         # ✅ If we reached the goal — reconstruct and return path
-        if current == goal:
-            return reconstruct_path(came_from, current)
+        if current == t:
+            return [divmod(i, cols) for i in reconstruct_path(came_from, current)]
+        closed.add(current)
         
-        # Explore all 4 directions
-        for dx, dy in directions:
-            nx, ny = current[0]+dx, current[1]+dy
+        # Explore the open neighbors (walls and edges are already excluded)
+        for d in deltas[mask[current]]:
+            nxt = current + d
+            if nxt in closed:
+                continue
+            tentative_g = g + step_cost[cells[nxt]]  # cost of stepping onto nxt
             
-            # ✅ Valid next position
-            if 0 <= nx < rows and 0 <= ny < cols and maze[nx][ny] != '#':
-                tentative_g = g_score[current] + 1  # uniform cost = 1
-                
-                # If new path is better or new node found
-                if (nx, ny) not in g_score or tentative_g < g_score[(nx, ny)]:
-                    g_score[(nx, ny)] = tentative_g
-                    f = tentative_g + heuristic((nx, ny), goal)
-                    heapq.heappush(open_set, (f, (nx, ny)))
-                    came_from[(nx, ny)] = current  # ✅ Store parent for path reconstruction
+            # If new path is better or new node found
+            if nxt not in g_score or tentative_g < g_score[nxt]:
+                estimate = h(nxt)
+                if estimate is None:
+                    continue     # cut off from the goal
+                g_score[nxt] = tentative_g
+                # Unit-step bound times the cheapest step never overestimates
+                f = tentative_g + estimate * cheapest
+                open_set.push(f, tentative_g, nxt)
+                came_from[nxt] = current  # ✅ Store parent for path reconstruction
     
     return None  # if no path found
 
-# ✅ Now test A*
-print("==== INFORMED SEARCH (A*) ====")
-path_a = a_star((0, 0), (3, 6))
-if path_a:
-    print("A* Path:", path_a)
-else:
-    print("No path found using A*")
-print("A* => Time: O(b^d), Space: O(b^d), Optimal if heuristic is admissible\n")
-
 
 # 3️⃣ CONSTRAINT SATISFACTION PROBLEM — Map Coloring Example
 
-print("==== CONSTRAINT SATISFACTION (Map Coloring) ====")
-
 colors = ['Red', 'Green', 'Blue']
 neighbors = {
     'A': ['B', 'C'],
@@ -171,33 +186,26 @@ def backtrack(assignment):
             assignment.pop(node)
     return None
 
-solution = backtrack({})
-print("Map Coloring Solution:", solution)
-print("CSP => Time: O(b^d), Space: O(d)\n")
-
 # 4️⃣ LOCAL SEARCH — Hill Climbing Example (Maximize a function)
 
-print("==== LOCAL SEARCH (Hill Climbing) ====")
-
 def objective(x):
     return x * math.sin(10 * math.pi * x) + 1.0  # Function to maximize
 
 def hill_climb():
+    # One walker; HillClimbing.py runs thousands of restarts at once
     x = random.uniform(0, 1)
+    value = objective(x)  # Kept, so each step evaluates only the new point
     step_size = 0.01
     for _ in range(1000):
         new_x = x + random.uniform(-step_size, step_size)
-        if 0 <= new_x <= 1 and objective(new_x) > objective(x):
-            x = new_x
-    return x, objective(x)
-
-x_best, y_best = hill_climb()
-print(f"Hill Climbing Result: x={x_best:.4f}, f(x)={y_best:.4f}")
-print("Local Search => Time: O(iterations), Space: O(1)\n")
+        if 0 <= new_x <= 1:
+            new_value = objective(new_x)
+            if new_value > value:
+                x, value = new_x, new_value
+    return x, value
 
 # 5️⃣ ADVERSARIAL SEARCH — MiniMax (Tic-Tac-Toe 1-move Example)
-
-print("==== ADVERSARIAL SEARCH (MiniMax) ====")
+# (random leaves; GameSearch.py plays real Tic-Tac-Toe and Connect-Four)
 
 def minimax(depth, is_maximizing):
     if depth == 0:
@@ -215,13 +223,8 @@ def minimax(depth, is_maximizing):
             best = min(best, value)
         return best
 
-score = minimax(3, True)
-print("MiniMax Decision Score:", score)
-print("Adversarial Search => Time: O(b^m), Space: O(m)\n")
-
 # 6️⃣ GENETIC ALGORITHM — Optimize f(x) = x² in [0,31]
-
-print("==== GENETIC ALGORITHM ====")
+# (six integers; GeneticAlgorithm.py evolves 10^5+ bit strings as NumPy arrays)
 
 def fitness(x):
     return x*x  # Our goal is to maximize this
@@ -240,12 +243,7 @@ def genetic_algorithm():
         population = next_gen
     return max(population, key=fitness)
 
-best = genetic_algorithm()
-print("Genetic Algorithm Best Solution:", best, "Fitness:", fitness(best))
-print("GA => Time: O(generations * population), Space: O(population)\n")
-
-print("==== COMPARISON SUMMARY ====")
-print("""
+COMPARISON_SUMMARY = """
 1. Uninformed Search — BFS, DFS
    ▪ Time: BFS O(b^d), DFS O(b^m)
    ▪ Space: BFS O(b^d), DFS O(bm)
@@ -275,4 +273,51 @@ print("""
    ▪ Evolution-based stochastic optimization.
    ▪ Time: O(generations × population)
    ▪ Space: O(population)
-""")
+"""
+
+
+# 🏁 DEMO — run every section in order (python Activity1.py)
+
+def demo():
+    print("==== UNINFORMED SEARCH ====")
+    print_maze(maze)
+    print("BFS Path:", bfs((0, 0)))
+    print("DFS Path:", dfs((0, 0)))
+    print("BFS => Time: O(b^d), Space: O(b^d)")
+    print("DFS => Time: O(b^m), Space: O(bm)")
+    print("\n")
+
+    print("==== INFORMED SEARCH (A*) ====")
+    path_a = a_star((0, 0), (3, 6))
+    if path_a:
+        print("A* Path:", path_a)
+    else:
+        print("No path found using A*")
+    print("A* => Time: O(b^d), Space: O(b^d), Optimal if heuristic is admissible\n")
+
+    print("==== CONSTRAINT SATISFACTION (Map Coloring) ====")
+    solution = backtrack({})
+    print("Map Coloring Solution:", solution)
+    print("CSP => Time: O(b^d), Space: O(d)\n")
+
+    print("==== LOCAL SEARCH (Hill Climbing) ====")
+    x_best, y_best = hill_climb()
+    print(f"Hill Climbing Result: x={x_best:.4f}, f(x)={y_best:.4f}")
+    print("Local Search => Time: O(iterations), Space: O(1)\n")
+
+    print("==== ADVERSARIAL SEARCH (MiniMax) ====")
+    score = minimax(3, True)
+    print("MiniMax Decision Score:", score)
+    print("Adversarial Search => Time: O(b^m), Space: O(m)\n")
+
+    print("==== GENETIC ALGORITHM ====")
+    best = genetic_algorithm()
+    print("Genetic Algorithm Best Solution:", best, "Fitness:", fitness(best))
+    print("GA => Time: O(generations * population), Space: O(population)\n")
+
+    print("==== COMPARISON SUMMARY ====")
+    print(COMPARISON_SUMMARY)
+
+
+if __name__ == "__main__":
+    demo()
@@ -0,0 +1,516 @@
+# Constraint solver for coloring-style CSPs
+# The problems are the ones Activity1.backtrack solves: variables with
+# neighbors, every variable takes one of the same values, and neighbors
+# must differ. backtrack() picks the first unassigned variable and checks
+# each value against every neighbor, with no look-ahead; that's fine for
+# four regions but hopeless for thousands of variables.
+#
+# Here:
+#   - variables are numbered 0..n-1 and the neighbors are tuples of ints;
+#   - a domain is an int bitset, bit c set = values[c] still allowed, so
+#     removing a value is one &= and a domain size is one bit_count();
+#   - the next variable is the one with the fewest values left (MRV), ties
+#     broken by weight: how often the variable took part in a failure
+#     lately (weighted degree), then at random. Unassigned variables sit in
+#     buckets by domain size, so finding it doesn't scan every variable;
+#   - values are tried least constraining first (LCV): the value the fewest
+#     unassigned neighbors still have. After a restart a variable first
+#     gets the value it had last time;
+#   - after each assignment, forward checking removes the value from the
+#     neighbors. With inference="mac" arc consistency is kept up as well.
+#     For a != constraint the arc x -> y only loses a value when y is down
+#     to a single value, so AC-3 comes down to assigning every variable
+#     that is left with a single value, and forward checking from it.
+#
+# Plain chronological backtracking stalls on big instances: a bad choice
+# near the top is only found out thousands of assignments later, and then
+# undone again and again from the bottom. So every removal remembers why
+# it happened (the assignment or removals that forced it). When a domain
+# is wiped out, those reasons are followed back to a nogood, a few
+# assignments/removals that can't hold together. The nogood is learned:
+# it prunes like any constraint from then on, and the search jumps straight
+# back to the level where it stops holding. The search also restarts after
+# luby(i) * RESTART_BASE failures; weights, saved values and learned
+# nogoods carry over, so each restart starts better informed. It stays
+# complete: an instance without a solution ends in a failure at level 0.
+#
+# Learning alone is slow to find the solution of a big instance that has
+# one, so after each restart a min-conflicts walk (see MinConflicts.py;
+# luby(i) * WALK_STEPS moves per variable) starts from the saved values and
+# leaves the best assignment it finds as the new saved values, the way SAT
+# solvers rephase.
+# If the walk ends with no conflicts, that's the solution.
+#
+# Every change goes on a trail and is undone from there; the search is a
+# loop, not recursion, so it isn't limited by Python's stack.
+#
+# Graph coloring instances load from DIMACS files ("p edge N M", then
+# "e U V" per edge, vertices numbered from 1):
+#
+#     csp = load_dimacs("le450_15a.col", colors=15)
+#     coloring = csp.solve()          # {vertex: color index} or None
+
+import random
+
+from MinConflicts import MinConflicts
+
+INFERENCES = ("fc", "mac")
+RESTART_BASE = 100      # Failures allowed before the first restart
+DECAY = 0.95            # How fast old failures stop counting in the weights
+WALK_STEPS = 200        # Local search steps per variable, times luby(i)
+
+
+class CSP:
+    """
+    A CSP where every variable takes one of values and neighbors must differ.
+
+    neighbors: dict variable -> its neighbors (made symmetric here)
+    values:    the values, in order, or how many (then values are 0..k-1)
+    domains:   optional dict variable -> allowed values, for variables that
+               don't allow them all
+    nodes, backtracks, prunings, restarts and learned count the work done
+    by the last solve().
+    """
+
+    def __init__(self, neighbors, values, domains=None):
+        self.values = list(range(values)) if isinstance(values, int) else list(values)
+        self.names = list(neighbors)
+        for v, ns in neighbors.items():         # Variables only named as neighbors
+            for n in ns:
+                if n not in neighbors and n not in self.names:
+                    self.names.append(n)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        adj = [set() for _ in self.names]
+        for v, ns in neighbors.items():
+            for n in ns:
+                a, b = self.index[v], self.index[n]
+                if a != b:
+                    adj[a].add(b)
+                    adj[b].add(a)
+        self.adj = [tuple(sorted(s)) for s in adj]
+        self.full = (1 << len(self.values)) - 1
+        self.domains = [self.full] * len(self.names)
+        for v, allowed in (domains or {}).items():
+            bits = 0
+            for value in allowed:
+                bits |= 1 << self.values.index(value)
+            self.domains[self.index[v]] = bits
+        self.solution = None
+        self.nodes = self.backtracks = self.prunings = self.restarts = self.learned = 0
+
+    def __len__(self):
+        return len(self.names)
+
+    def edges(self):
+        return sum(len(a) for a in self.adj) // 2
+
+    def is_solution(self, assignment):
+        """True if assignment (variable -> value) gives every variable an allowed value, neighbors differing."""
+        if assignment is None or len(assignment) != len(self.names):
+            return False
+        for v, value in assignment.items():
+            i = self.index[v]
+            if value not in self.values or not self.domains[i] >> self.values.index(value) & 1:
+                return False
+            if any(assignment[self.names[j]] == value for j in self.adj[i]):
+                return False
+        return True
+
+    def solve(self, inference="mac", lcv=True, restarts=True, seed=None, tracer=None):
+        """
+        Search with MRV + weighted degree ordering and nogood learning.
+        inference: "fc" (forward checking) or "mac" (forward checking plus
+        AC-3). lcv: order values least constraining first.
+        restarts: restart on the Luby schedule, with a local search walk
+        after each restart (ties are broken at random, seed makes that
+        repeatable); the search stays complete either way.
+        Returns {variable: value}, or None if there is no solution.
+        """
+        if inference not in INFERENCES:
+            raise ValueError(f"inference must be one of {INFERENCES}")
+        on_node = tracer.node_hook("csp") if tracer else None
+        _Search(self, inference, lcv, restarts, on_node, random.Random(seed)).run()
+        if tracer:
+            tracer.summary("csp", nodes=self.nodes, backtracks=self.backtracks,
+                           prunings=self.prunings, restarts=self.restarts,
+                           learned=self.learned, found=self.solution is not None)
+        return self.solution
+
+
+class _Search:
+    # State of one solve().
+    # Facts are literals over (variable v, value index c), atom a = v*k + c:
+    # 2a means "v = c", 2a+1 means "v != c", and lit ^ 1 is the opposite.
+    # "v = c" holds when fixed[v] == c, "v != c" when bit c is gone from
+    # domain[v]. Each fact on the trail has a level (the number of choices
+    # made when it was set) and a reason: the true literals that forced it,
+    # None for a choice. A conflict is a list of true literals that can't
+    # all hold; a nogood is learned as the clause of their opposites.
+    def __init__(self, csp, inference, lcv, restarts, on_node, rng):
+        self.csp = csp
+        self.adj = csp.adj
+        self.k = k = len(csp.values)
+        self.mac = inference == "mac"
+        self.lcv, self.restarts, self.on_node = lcv, restarts, on_node
+        self.rng = rng
+        self.noise = rng.random
+        n = len(csp)
+        self.domain = list(csp.domains)
+        self.fixed = [-1] * n           # Value index a variable is assigned, -1 if none
+        self.saved = [-1] * n           # Value to try first: its last one, or the walk's
+        self.weight = [float(len(a)) for a in self.adj]    # Degree until failures say otherwise
+        self.bump_by = 1.0
+        self.level = [0] * (n * k)
+        self.reason = [None] * (n * k)
+        self.trail = []
+        self.choices = []               # Trail length at each choice
+        self.head = 0                   # Trail facts propagated so far
+        self.clauses = []
+        self.watches = [[] for _ in range(2 * n * k)]
+        self.buckets = [set() for _ in range(k + 1)]
+        for v, d in enumerate(self.domain):
+            self.buckets[d.bit_count()].add(v)
+        csp.nodes = csp.backtracks = csp.prunings = csp.restarts = csp.learned = 0
+        csp.solution = None
+
+    def value(self, lit):
+        # True, False, or None when not decided yet
+        v, c = divmod(lit >> 1, self.k)
+        if self.fixed[v] == c:
+            holds = True
+        elif not self.domain[v] >> c & 1:
+            holds = False
+        else:
+            return None
+        return holds != bool(lit & 1)
+
+    def enqueue(self, lit, reason):
+        # Make lit true; returns a conflict if it's already false
+        holds = self.value(lit)
+        if holds:
+            return None
+        if holds is False:
+            return reason + [lit ^ 1]
+        a = lit >> 1
+        v, c = divmod(a, self.k)
+        self.level[a] = len(self.choices)
+        self.reason[a] = reason
+        self.trail.append(lit)
+        d = self.domain[v]
+        if lit & 1:
+            self.domain[v] = d & ~(1 << c)
+            self.csp.prunings += 1
+            if self.fixed[v] < 0:
+                self.buckets[d.bit_count()].discard(v)
+                self.buckets[d.bit_count() - 1].add(v)
+        else:
+            self.fixed[v] = c
+            self.buckets[d.bit_count()].discard(v)
+        return None
+
+    def propagate(self):
+        # Forward checking (plus AC-3 for "mac") and the learned nogoods,
+        # for every fact not propagated yet; returns a conflict or None
+        k, adj, domain, fixed, trail = self.k, self.adj, self.domain, self.fixed, self.trail
+        enqueue = self.enqueue
+        while self.head < len(trail):
+            lit = trail[self.head]
+            self.head += 1
+            v, c = divmod(lit >> 1, k)
+            if lit & 1:                             # v lost c
+                d = domain[v]
+                if not d:
+                    return [2 * (v * k + j) + 1 for j in range(k)]
+                if self.mac and fixed[v] < 0 and not d & (d - 1):
+                    j = d.bit_length() - 1          # Down to one value: assign it
+                    conflict = enqueue(2 * (v * k + j),
+                                       [2 * (v * k + i) + 1 for i in range(k) if i != j])
+                    if conflict:
+                        return conflict
+            else:                                   # v = c
+                bit, because = 1 << c, [lit]
+                d = domain[v] & ~bit
+                while d:
+                    j = d.bit_length() - 1
+                    d &= ~(1 << j)
+                    conflict = enqueue(2 * (v * k + j) + 1, because)
+                    if conflict:
+                        return conflict
+                for n in adj[v]:
+                    if domain[n] & bit:
+                        conflict = enqueue(2 * (n * k + c) + 1, because)
+                        if conflict:
+                            return conflict
+            conflict = self.propagate_clauses(lit ^ 1)
+            if conflict:
+                return conflict
+        return None
+
+    def propagate_clauses(self, false_lit):
+        # Learned clauses watch two literals that aren't false; false_lit
+        # just became false, so each clause watching it finds another
+        # literal to watch, or is down to its other watch
+        value, watches = self.value, self.watches
+        watching = watches[false_lit]
+        watches[false_lit] = keep = []
+        for i, clause in enumerate(watching):
+            if clause[0] == false_lit:
+                clause[0], clause[1] = clause[1], clause[0]
+            if value(clause[0]):
+                keep.append(clause)
+                continue
+            for j in range(2, len(clause)):
+                if value(clause[j]) is not False:
+                    clause[1], clause[j] = clause[j], clause[1]
+                    watches[clause[1]].append(clause)
+                    break
+            else:
+                keep.append(clause)
+                conflict = self.enqueue(clause[0], [x ^ 1 for x in clause[1:]])
+                if conflict:
+                    keep.extend(watching[i + 1:])
+                    return conflict
+        return None
+
+    def analyze(self, conflict):
+        # Follow the reasons back from the conflict until a single fact of
+        # the current level is left; returns the learned clause (that fact
+        # negated first, then the highest level fact) and the level to
+        # jump back to
+        level, reason, trail, k = self.level, self.reason, self.trail, self.k
+        current = len(self.choices)
+        seen = set()
+        learned = [None]
+        pending = 0
+        i = len(trail) - 1
+        lits = conflict
+        while True:
+            for q in lits:
+                a = q >> 1
+                if a in seen or level[a] == 0:
+                    continue
+                seen.add(a)
+                self.bump(a // k)
+                if level[a] == current:
+                    pending += 1
+                else:
+                    learned.append(q ^ 1)
+            while trail[i] >> 1 not in seen:
+                i -= 1
+            p = trail[i]
+            i -= 1
+            pending -= 1
+            if pending == 0:
+                break
+            lits = reason[p >> 1]
+        learned[0] = p ^ 1
+        # Drop facts that the other facts in the nogood already imply
+        learned[1:] = [q for q in learned[1:] if not self.implied(q ^ 1, seen, {})]
+        if len(learned) == 1:
+            return learned, 0
+        j = max(range(1, len(learned)), key=lambda j: level[learned[j] >> 1])
+        learned[1], learned[j] = learned[j], learned[1]
+        return learned, level[learned[1] >> 1]
+
+    def implied(self, lit, seen, memo, depth=0):
+        # True if lit (a true, forced fact) follows from facts in seen
+        reason = self.reason[lit >> 1]
+        if reason is None or depth > 20:
+            return False
+        for q in reason:
+            a = q >> 1
+            if a in seen or self.level[a] == 0:
+                continue
+            if a not in memo:
+                memo[a] = self.implied(q, seen, memo, depth + 1)
+            if not memo[a]:
+                return False
+        return True
+
+    def bump(self, v):
+        self.weight[v] += self.bump_by
+        if self.weight[v] > 1e100:
+            self.weight = [w * 1e-100 for w in self.weight]
+            self.bump_by *= 1e-100
+
+    def backjump(self, level):
+        # Undo every fact above level
+        if level >= len(self.choices):
+            return
+        k, trail, domain, fixed, buckets = self.k, self.trail, self.domain, self.fixed, self.buckets
+        mark = self.choices[level]
+        while len(trail) > mark:
+            lit = trail.pop()
+            a = lit >> 1
+            v, c = divmod(a, k)
+            self.reason[a] = None
+            d = domain[v]
+            if lit & 1:
+                domain[v] = d | 1 << c
+                if fixed[v] < 0:
+                    buckets[d.bit_count()].discard(v)
+                    buckets[d.bit_count() + 1].add(v)
+            else:
+                fixed[v] = -1
+                self.saved[v] = c
+                buckets[d.bit_count()].add(v)
+        del self.choices[level:]
+        self.head = len(trail)
+
+    def learn(self, clause):
+        self.csp.learned += 1
+        if len(clause) > 1:
+            self.clauses.append(clause)
+            self.watches[clause[0]].append(clause)
+            self.watches[clause[1]].append(clause)
+        return self.enqueue(clause[0], [x ^ 1 for x in clause[1:]])
+
+    def forget(self):
+        # At a restart, keep the shorter half of the learned clauses
+        if len(self.clauses) < 4 * len(self.csp):
+            return
+        self.clauses.sort(key=len)
+        del self.clauses[len(self.clauses) // 2:]
+        self.watches = [[] for _ in self.watches]
+        for clause in self.clauses:
+            self.watches[clause[0]].append(clause)
+            self.watches[clause[1]].append(clause)
+
+    def select(self):
+        # MRV, then weight, then at random; None once every variable is assigned
+        for bucket in self.buckets[1:]:
+            if bucket:
+                weight, noise, tiny = self.weight, self.noise, 1e-6 * self.bump_by
+                return max(bucket, key=lambda v: weight[v] + noise() * tiny)
+        return None
+
+    def choose(self, v):
+        # Value index to try for v
+        d = self.domain[v]
+        c = self.saved[v]
+        if c >= 0 and d >> c & 1:
+            return c
+        cs = [c for c in range(d.bit_length()) if d >> c & 1]
+        if not self.lcv or len(cs) == 1:
+            return cs[0]
+        domain, fixed, noise = self.domain, self.fixed, self.noise
+        ns = [domain[n] for n in self.adj[v] if fixed[n] < 0]
+        return min(cs, key=lambda c: sum(1 for d in ns if d >> c & 1) + noise())
+
+    def walk(self, steps):
+        # Min-conflicts (see MinConflicts.py) over the level 0 domains, from
+        # the current and saved values; the best assignment it finds becomes
+        # the saved values. True if that assignment has no conflicts at all.
+        start = [c if c >= 0 else saved for c, saved in zip(self.fixed, self.saved)]
+        search = MinConflicts(self.csp, start, self.domain, self.rng)
+        found = search.run(steps)
+        self.saved = search.best_value
+        return found
+
+    def run(self):
+        csp, k = self.csp, self.k
+        for v, d in enumerate(self.domain):
+            if not d:
+                return
+            if self.mac and not d & (d - 1):
+                if self.enqueue(2 * (v * k + d.bit_length() - 1), []):
+                    return
+        restart, failures = 1, 0
+        walk = False                    # Walk after each restart
+        while True:
+            conflict = self.propagate()
+            if not conflict and walk:
+                walk = False
+                if self.walk(luby(restart) * WALK_STEPS * len(csp)):
+                    csp.solution = {csp.names[v]: csp.values[c] for v, c in enumerate(self.saved)}
+                    return
+            if conflict:
+                csp.backtracks += 1
+                if not self.choices:
+                    return                          # Failed without a choice: no solution
+                clause, level = self.analyze(conflict)
+                self.backjump(level)
+                self.bump_by /= DECAY
+                failures += 1
+                self.learn(clause)
+                continue
+            if self.restarts and failures >= luby(restart) * RESTART_BASE:
+                self.backjump(0)
+                self.forget()
+                restart += 1
+                failures = 0
+                csp.restarts += 1
+                walk = True
+                continue
+            v = self.select()
+            if v is None:
+                csp.solution = {csp.names[v]: csp.values[c] for v, c in enumerate(self.fixed)}
+                return
+            csp.nodes += 1
+            if self.on_node:
+                self.on_node(csp.nodes, len(self.choices), csp.names[v])
+            self.choices.append(len(self.trail))
+            self.enqueue(2 * (v * k + self.choose(v)), None)
+
+
+def luby(i):
+    """The i-th term (from 1) of the Luby restart sequence 1 1 2 1 1 2 4 1 ..."""
+    k = 1
+    while (1 << k) - 1 < i:
+        k += 1
+    while i != (1 << k) - 1:
+        i -= (1 << (k - 1)) - 1
+        k = 1
+        while (1 << k) - 1 < i:
+            k += 1
+    return 1 << (k - 1)
+
+
+def load_dimacs(path, colors):
+    """
+    Read a DIMACS graph coloring file as a CSP with the given colors
+    (a count or a list). Variables are the vertex numbers.
+    """
+    neighbors = {}
+    with open(path) as f:
+        for line in f:
+            parts = line.split()
+            if not parts:
+                continue
+            if parts[0] == "p":
+                neighbors = {v: [] for v in range(1, int(parts[2]) + 1)}
+            elif parts[0] == "e":
+                u, v = int(parts[1]), int(parts[2])
+                neighbors.setdefault(u, []).append(v)
+                neighbors.setdefault(v, [])
+    return CSP(neighbors, colors)
+
+
+def demo():
+    import time
+    from Activity1 import neighbors, colors
+
+    print("Map coloring:", CSP(neighbors, colors).solve())
+
+    # Random graphs with a hidden coloring: only vertices of different
+    # hidden colors are joined, so a coloring exists
+    rng = random.Random(7)
+    for n, k, degree in ((1000, 4, 8), (3000, 4, 16)):
+        hidden = [rng.randrange(k) for _ in range(n)]
+        graph = {v: [] for v in range(n)}
+        edges = 0
+        while edges < degree * n // 2:
+            u, v = rng.randrange(n), rng.randrange(n)
+            if hidden[u] != hidden[v]:
+                graph[u].append(v)
+                edges += 1
+        csp = CSP(graph, k)
+        t = time.perf_counter()
+        solution = csp.solve(seed=1)
+        print(f"\nRandom graph, {len(csp)} vertices, {csp.edges()} edges, {k} colors: "
+              f"{time.perf_counter() - t:.2f}s, {csp.nodes} choices, {csp.backtracks} failures, "
+              f"{csp.restarts} restarts, valid={csp.is_solution(solution)}")
+
+
+if __name__ == "__main__":
+    demo()
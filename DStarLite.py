@@ -0,0 +1,154 @@
+# Incremental replanning with D* Lite
+# A* plans once; when a road closes halfway along the route the only option
+# is to search again from scratch. D* Lite searches backwards from the goal
+# and keeps two values per cell:
+#   g   - the distance to the goal it settled on earlier
+#   rhs - a one-step lookahead, min over neighbors of (step cost + g)
+# A cell is "consistent" while g == rhs. A closure only changes the rhs of
+# the cells next to it, so only those become inconsistent, and repairing
+# them walks outwards just as far as distances really changed. The rest of
+# the earlier search is reused. As the courier moves on, km (the total
+# heuristic drift) keeps the old queue keys valid without re-sorting them.
+#
+# Events are cell changes (set_cells, which also edits the GridMap) or edge
+# closures between two neighboring cells (close_edge / open_edge); both
+# repair the plan before returning.
+
+import heapq
+
+INF = float("inf")
+
+
+class DStarLite:
+    """
+    D* Lite from a moving start to a fixed goal on a GridMap (unit steps).
+
+    start, goal: cell indices. Call plan() once, then alternate move_to()
+    as the courier advances with set_cells() / close_edge() as closures
+    come in; path() is always the current shortest route, or None.
+    expanded counts the cells taken off the queue, over all repairs.
+    """
+
+    def __init__(self, grid, start, goal):
+        self.grid = grid
+        self.start = start
+        self.goal = goal
+        self.last = start       # where km was last brought up to date
+        self.km = 0
+        self.g = {}             # missing = INF
+        self.rhs = {goal: 0}
+        self.closed_edges = set()
+        self.queue = []         # (key, cell), stale entries skipped on pop
+        self.keys = {}          # cell -> its current key in the queue
+        self.expanded = 0
+        self._push(goal)
+
+    # ---- Costs and keys ----
+    def _h(self, a, b):
+        cols = self.grid.cols
+        ar, ac = divmod(a, cols)
+        br, bc = divmod(b, cols)
+        return abs(ar - br) + abs(ac - bc)
+
+    def _neighbors(self, u):
+        # Open neighbors of u, minus those behind a closed edge
+        grid = self.grid
+        closed = self.closed_edges
+        for d in grid.deltas[grid.mask[u]]:
+            v = u + d
+            if not closed or (min(u, v), max(u, v)) not in closed:
+                yield v
+
+    def _key(self, u):
+        m = min(self.g.get(u, INF), self.rhs.get(u, INF))
+        return (m + self._h(self.start, u) + self.km, m)
+
+    def _push(self, u):
+        key = self._key(u)
+        self.keys[u] = key
+        heapq.heappush(self.queue, (key, u))
+
+    def _top_key(self):
+        queue, keys = self.queue, self.keys
+        while queue and keys.get(queue[0][1]) != queue[0][0]:
+            heapq.heappop(queue)            # Stale entry
+        return queue[0][0] if queue else (INF, INF)
+
+    def _update(self, u):
+        g = self.g
+        if u != self.goal:
+            self.rhs[u] = min((1 + g.get(v, INF) for v in self._neighbors(u)), default=INF)
+        self.keys.pop(u, None)
+        if g.get(u, INF) != self.rhs.get(u, INF):
+            self._push(u)
+
+    # ---- Planning ----
+    def plan(self):
+        """Bring every cell that matters for the start back to consistency."""
+        g, rhs, keys = self.g, self.rhs, self.keys
+        start = self.start
+        while (self._top_key() < self._key(start)
+               or rhs.get(start, INF) != g.get(start, INF)):
+            k_old, u = heapq.heappop(self.queue)
+            del keys[u]
+            self.expanded += 1
+            k_new = self._key(u)
+            if k_old < k_new:
+                self._push(u)               # Key went up since it was queued
+            elif g.get(u, INF) > rhs.get(u, INF):
+                g[u] = rhs[u]               # Distance went down: settle it
+                for v in self._neighbors(u):
+                    self._update(v)
+            else:
+                g[u] = INF                  # Distance went up: redo u and its neighbors
+                self._update(u)
+                for v in self._neighbors(u):
+                    self._update(v)
+        return self.distance()
+
+    def distance(self):
+        d = self.rhs.get(self.start, INF)
+        return None if d == INF else d
+
+    def path(self):
+        """Cell indices from the current start to the goal, or None if cut off."""
+        if self.distance() is None:
+            return None
+        g = self.g
+        u = self.start
+        path = [u]
+        while u != self.goal:
+            u = min(self._neighbors(u), key=lambda v: g.get(v, INF), default=None)
+            if u is None or g.get(u, INF) == INF:
+                return None
+            path.append(u)
+        return path
+
+    # ---- Events ----
+    def move_to(self, cell):
+        """The courier is now on cell."""
+        self.start = cell
+        self.km += self._h(self.last, cell)
+        self.last = cell
+
+    def set_cells(self, changes):
+        """Apply (row, col, symbol) changes to the map and repair the plan."""
+        touched = set()
+        for r, c, symbol in changes:
+            touched.update(self.grid.set_cell(r, c, symbol))
+        for u in touched:
+            self._update(u)
+        return self.plan()
+
+    def close_edge(self, a, b):
+        """Block the move between neighboring cells a and b (both ways)."""
+        self.closed_edges.add((min(a, b), max(a, b)))
+        self._update(a)
+        self._update(b)
+        return self.plan()
+
+    def open_edge(self, a, b):
+        self.closed_edges.discard((min(a, b), max(a, b)))
+        self._update(a)
+        self._update(b)
+        return self.plan()
@@ -0,0 +1,139 @@
+# Vectorized BFS distance fields for GridMap worlds (needs NumPy)
+# A distance field holds, for every cell of the map, the number of moves to
+# the nearest source cell (-1 where no source can be reached). It is grown as
+# a wavefront: the whole frontier is one array of cell indices, and each step
+# pulls every frontier cell's open-neighbor bits out of the GridMap masks,
+# adds the matching offsets, drops cells already reached with a boolean
+# mask, and stamps the step number on the rest, all as array operations.
+# One field answers "how far is every cell from restaurant R / customer C",
+# so any number of couriers heading for the same target share one
+# computation, and their routes come from walking downhill on the field
+# instead of a fresh search.
+#
+# Shifting whole boolean maps one cell per step does the same job, but it
+# touches every cell of the map on every step; on a 2000 x 2000 map that was
+# about 10 s per field against about 1 s for the frontier arrays.
+
+import numpy as np
+from RouteCache import MISS
+
+UNREACHABLE = -1
+
+
+def open_cells(grid):
+    """Boolean (rows, cols) array, True where the cell can be walked on"""
+    table = np.frombuffer(grid.open_table, dtype=np.uint8).astype(bool)
+    return table[np.frombuffer(grid.cells, dtype=np.uint8)].reshape(grid.rows, grid.cols)
+
+
+def distance_field(grid, sources, passable=None, cache=None):
+    """
+    Moves from every cell to the nearest of sources, as an int32 (rows, cols) array.
+
+    grid:     a GridMap (every move costs 1)
+    sources:  one (row, col) position or a list of them
+    passable: open_cells(grid), when the caller already has it
+    cache:    a RouteCache to reuse fields across calls (don't modify the result)
+    """
+    if isinstance(sources, tuple):
+        sources = [sources]
+    if cache is not None:
+        key = ("field", tuple(sorted(sources)))
+        field = cache.get(grid, key)
+        if field is MISS:
+            field = cache.put_field(grid, key, distance_field(grid, sources, passable))
+        return field
+    if passable is None:
+        passable = open_cells(grid)
+    dist = np.full(grid.rows * grid.cols, UNREACHABLE, dtype=np.int32)
+    unseen = passable.ravel().copy()        # Open cells the wave hasn't reached
+    frontier = np.unique([grid.index(r, c) for r, c in sources if passable[r, c]]).astype(np.int64)
+    dist[frontier] = 0
+    unseen[frontier] = False
+    mask = np.frombuffer(grid.mask, dtype=np.uint8)
+
+    step = 0
+    while frontier.size:
+        bits = mask[frontier]
+        # Neighbors through each open side, for the whole frontier at once
+        grown = np.concatenate([frontier[(bits >> k) & 1 == 1] + offset
+                                for k, offset in enumerate(grid.offsets)])
+        grown = np.unique(grown[unseen[grown]])   # Unreached, and each cell once
+        step += 1
+        dist[grown] = step
+        unseen[grown] = False
+        frontier = grown
+    return dist.reshape(grid.rows, grid.cols)
+
+
+def follow_field(grid, field, start):
+    """
+    Walk downhill on a distance field from start to its nearest source.
+
+    Returns the (row, col) positions along the way, or None if start can't
+    reach any source.
+    """
+    flat = field.ravel()
+    i = grid.index(*start)
+    if flat[i] == UNREACHABLE:
+        return None
+    path = [start]
+    while flat[i]:
+        for d in grid.deltas[grid.mask[i]]:   # Some open neighbor is one step closer
+            if flat[i + d] == flat[i] - 1:
+                i += d
+                break
+        path.append(grid.position(i))
+    return path
+
+
+def delivery_fields(grid, restaurant, customer, cache=None):
+    """
+    Fields for the pizza problem: (to_restaurant, to_customer, delivery).
+
+    delivery[cell] is the length of the shortest pickup-then-dropoff route
+    for a courier starting on that cell: moves to R plus moves from R to C.
+    Moves cost the same both ways, so the field grown from R also gives
+    every courier's distance to R.
+    """
+    passable = open_cells(grid)
+    to_restaurant = distance_field(grid, restaurant, passable, cache)
+    to_customer = distance_field(grid, customer, passable, cache)
+    leg = to_customer[restaurant]           # R -> C, the same for every courier
+    delivery = np.full_like(to_restaurant, UNREACHABLE)
+    if leg != UNREACHABLE:
+        reachable = to_restaurant != UNREACHABLE
+        delivery[reachable] = to_restaurant[reachable] + leg
+    return to_restaurant, to_customer, delivery
+
+
+def delivery_route(grid, start, restaurant, customer, fields=None):
+    """Shortest start -> R -> C route from the fields (computed if not given)."""
+    to_restaurant, to_customer, _ = fields or delivery_fields(grid, restaurant, customer)
+    pickup = follow_field(grid, to_restaurant, start)
+    dropoff = follow_field(grid, to_customer, restaurant)
+    if pickup is None or dropoff is None:
+        return None
+    return pickup + dropoff[1:]
+
+
+def demo():
+    from GridMap import GridMap
+
+    city = [
+        "S...#..",
+        "..##..C",
+        ".R..#..",
+        "...##..",
+        "......."
+    ]
+    grid = GridMap.from_rows(city, [(0,1),(1,0),(0,-1),(-1,0)])
+    restaurant, customer = grid.position(grid.find("R")), grid.position(grid.find("C"))
+    fields = delivery_fields(grid, restaurant, customer)
+    print("Delivery distance from every cell:")
+    print(fields[2])
+    print("Route from S:", delivery_route(grid, grid.position(grid.find("S")), restaurant, customer, fields))
+
+
+if __name__ == "__main__":
+    demo()
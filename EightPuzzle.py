@@ -0,0 +1,15 @@
+# Importable name for 8Puzzle.py
+# A module name can't start with a digit, so `import 8Puzzle` doesn't parse.
+# `import EightPuzzle` runs 8Puzzle.py as this module instead, so the CLI,
+# the route service and pool workers (which re-import functions by module
+# name) all share one copy of it under one name:
+#
+#     from EightPuzzle import bfs_limited, solve_batch
+
+import importlib.util
+import os
+import sys
+
+_spec = importlib.util.spec_from_file_location(
+    __name__, os.path.join(os.path.dirname(os.path.abspath(__file__)), "8Puzzle.py"))
+_spec.loader.exec_module(sys.modules[__name__])
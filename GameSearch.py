@@ -0,0 +1,385 @@
+# Adversarial search over real game positions
+# Activity1.minimax scores random leaves of a made-up binary tree, so it
+# can't play a game. Here the positions are real, stored as bitboards (one
+# int per player, one bit per cell), and searched with:
+#   - negamax alpha-beta: every score is from the point of view of the
+#     player to move, so one function plays both sides;
+#   - iterative deepening: search 1 ply, 2 plies, ... until max_depth or
+#     time_limit, keeping the last finished depth's move;
+#   - move ordering: the best move stored for the position, then the
+#     killer moves of that ply, then the game's own order (center first),
+#     so the best move is usually tried first and the rest get cut off;
+#   - a transposition table of Zobrist keys (random 64-bit numbers XORed
+#     per stone). It has a fixed number of buckets of two slots: one that
+#     keeps the deepest entry (unless it's from an older search) and one
+#     that always takes the newest, so it never grows and the entries that
+#     save the most work survive.
+# Wins score WIN minus the number of stones on the board at the end, so a
+# faster win scores higher and a score doesn't depend on how the position
+# was reached, which keeps table entries valid across transpositions.
+#
+# Tic-Tac-Toe also merges the 8 symmetries of the board (rotations and
+# reflections): a position's key is the smallest of its 8 images' keys, so
+# each shape is searched once. Connect-Four uses the standard 7-bits-per-
+# column layout, where a move is one addition and a four-in-a-row test is
+# a few shifts.
+#
+#     engine = Engine(ConnectFour())
+#     move, score = engine.search(engine.game.after([3, 3, 2]), time_limit=2)
+
+import random
+import time
+
+WIN = 10_000
+INF = 1_000_000
+EXACT, LOWER, UPPER = range(3)      # Table entry is the value, a lower bound, an upper bound
+TABLE_BITS = 18                     # 2**18 buckets of two entries
+CHECK_EVERY = 4096                  # Nodes between clock checks
+
+
+def zobrist_keys(count, seed):
+    rng = random.Random(seed)
+    return [rng.getrandbits(64) for _ in range(count)]
+
+
+class TicTacToe:
+    """
+    Tic-Tac-Toe. A state is (mine, theirs, stones): the cells of the player
+    to move and of the other player as 9-bit ints (bit r*3 + c), and the
+    number of stones on the board. Moves are cell numbers 0..8.
+    symmetries=False searches the 8 images of a position separately.
+    """
+
+    name = "tic_tac_toe"
+    LINES = (0b000000111, 0b000111000, 0b111000000, 0b001001001,
+             0b010010010, 0b100100100, 0b100010001, 0b001010100)
+    ORDER = (4, 0, 2, 6, 8, 1, 3, 5, 7)     # Center, corners, edges
+
+    def __init__(self, symmetries=True):
+        self.cells = 9
+        images = [lambda r, c: (r, c), lambda r, c: (c, 2 - r), lambda r, c: (2 - r, 2 - c),
+                  lambda r, c: (2 - c, r), lambda r, c: (r, 2 - c), lambda r, c: (2 - r, c),
+                  lambda r, c: (c, r), lambda r, c: (2 - c, 2 - r)]
+        if not symmetries:
+            images = images[:1]
+        mine_keys, theirs_keys = zobrist_keys(9, 1), zobrist_keys(9, 2)
+        # keys[s][board]: Zobrist key of the image of a 9-bit board under symmetry s
+        self.mine_keys, self.theirs_keys = [], []
+        for image in images:
+            target = [image(*divmod(cell, 3)) for cell in range(9)]
+            target = [r * 3 + c for r, c in target]
+            for keys, table in ((mine_keys, self.mine_keys), (theirs_keys, self.theirs_keys)):
+                row = []
+                for board in range(512):
+                    key = 0
+                    for cell in range(9):
+                        if board >> cell & 1:
+                            key ^= keys[target[cell]]
+                    row.append(key)
+                table.append(row)
+        self.images = list(zip(self.mine_keys, self.theirs_keys))
+
+    def start(self):
+        return (0, 0, 0)
+
+    def after(self, moves):
+        state = self.start()
+        for move in moves:
+            state = self.play(state, move)
+        return state
+
+    def moves(self, state):
+        taken = state[0] | state[1]
+        return [cell for cell in self.ORDER if not taken >> cell & 1]
+
+    def play(self, state, move):
+        mine, theirs, stones = state
+        return (theirs, mine | 1 << move, stones + 1)
+
+    def result(self, state):
+        # Score for the player to move if the game is over, else None
+        theirs = state[1]
+        for line in self.LINES:
+            if theirs & line == line:
+                return state[2] - WIN
+        return 0 if state[2] == 9 else None
+
+    def evaluate(self, state):
+        return 0                            # Never reached: the whole tree is 9 plies
+
+    def key(self, state):
+        mine, theirs = state[0], state[1]
+        return min(m[mine] ^ t[theirs] for m, t in self.images)
+
+
+class ConnectFour:
+    """
+    Connect-Four on rows x cols (6 x 7 by default). A state is (position,
+    mask, key, stones): the stones of the player to move, all stones, the
+    Zobrist key and the stone count. Column c holds bits c*(rows+1) up, the
+    extra bit on top of each column keeps the columns apart. Moves are
+    column numbers.
+    """
+
+    name = "connect_four"
+
+    def __init__(self, rows=6, cols=7):
+        self.rows, self.cols = rows, cols
+        self.cells = rows * cols
+        self.height = h = rows + 1
+        self.bottom = [1 << (c * h) for c in range(cols)]
+        self.top = [1 << (c * h + rows - 1) for c in range(cols)]
+        self.board = sum(((1 << rows) - 1) << (c * h) for c in range(cols))
+        self.order = sorted(range(cols), key=lambda c: abs(2 * c - cols + 1))
+        self.zobrist = [zobrist_keys(cols * h, 3), zobrist_keys(cols * h, 4)]
+
+    def start(self):
+        return (0, 0, 0, 0)
+
+    def after(self, moves):
+        state = self.start()
+        for move in moves:
+            state = self.play(state, move)
+        return state
+
+    def moves(self, state):
+        mask = state[1]
+        return [c for c in self.order if not mask & self.top[c]]
+
+    def play(self, state, move):
+        position, mask, key, stones = state
+        new_mask = mask | (mask + self.bottom[move])
+        cell = (new_mask ^ mask).bit_length() - 1
+        return (position ^ mask, new_mask, key ^ self.zobrist[stones & 1][cell], stones + 1)
+
+    def aligned(self, stones):
+        h = self.height
+        for shift in (1, h, h - 1, h + 1):  # Vertical, horizontal, both diagonals
+            pairs = stones & (stones >> shift)
+            if pairs & (pairs >> 2 * shift):
+                return True
+        return False
+
+    def result(self, state):
+        position, mask, _, stones = state
+        if self.aligned(position ^ mask):   # The player who just moved won
+            return stones - WIN
+        return 0 if stones == self.cells else None
+
+    def threats(self, stones, mask):
+        # Empty cells that would complete four of stones
+        h = self.height
+        won = (stones << 1) & (stones << 2) & (stones << 3)
+        for shift in (h, h - 1, h + 1):
+            pair = (stones << shift) & (stones << 2 * shift)
+            won |= pair & (stones << 3 * shift)
+            won |= pair & (stones >> shift)
+            pair = (stones >> shift) & (stones >> 2 * shift)
+            won |= pair & (stones << shift)
+            won |= pair & (stones >> 3 * shift)
+        return won & (self.board ^ mask)
+
+    def evaluate(self, state):
+        # Depth cutoff: open threats, then stones in the middle column
+        position, mask = state[0], state[1]
+        middle = ((1 << self.rows) - 1) << (self.cols // 2 * self.height)
+        other = position ^ mask
+        return (4 * (self.threats(position, mask).bit_count() - self.threats(other, mask).bit_count())
+                + (position & middle).bit_count() - (other & middle).bit_count())
+
+    def key(self, state):
+        return state[2]
+
+
+class _OutOfTime(Exception):
+    pass
+
+
+class Engine:
+    """
+    Alpha-beta game-tree search with iterative deepening.
+
+    game:       TicTacToe, ConnectFour or anything with their methods
+    table_bits: the transposition table has 2**table_bits buckets
+    The table is kept between searches. nodes, hits (table entries that
+    answered or narrowed a node) and cutoffs count the work of the last
+    search; depth is the deepest depth it finished.
+    """
+
+    def __init__(self, game, table_bits=TABLE_BITS):
+        self.game = game
+        self.table = [None] * (2 << table_bits)
+        self.buckets = (1 << table_bits) - 1
+        self.generation = 0
+        self.killers = [[None, None] for _ in range(game.cells + 1)]
+        self.nodes = self.hits = self.cutoffs = self.depth = 0
+        self.deadline = None
+        self.on_node = None
+
+    def probe(self, key):
+        i = (key & self.buckets) << 1
+        table = self.table
+        for entry in (table[i], table[i + 1]):
+            if entry is not None and entry[0] == key:
+                return entry
+        return None
+
+    def store(self, key, depth, flag, value, move):
+        i = (key & self.buckets) << 1
+        deep = self.table[i]
+        entry = (key, depth, flag, value, move, self.generation)
+        if deep is None or deep[0] == key or depth >= deep[1] or deep[5] != self.generation:
+            self.table[i] = entry
+        else:
+            self.table[i + 1] = entry
+
+    def ordered(self, state, first, ply):
+        moves = self.game.moves(state)
+        front = []
+        for move in (first, *self.killers[ply]):
+            if move is not None and move in moves and move not in front:
+                front.append(move)      # A stored move may come from a mirrored position
+        return front + [move for move in moves if move not in front]
+
+    def negamax(self, state, depth, alpha, beta, ply):
+        self.nodes += 1
+        if self.on_node:
+            self.on_node(self.nodes, ply, state)
+        if self.deadline is not None and not self.nodes % CHECK_EVERY and time.perf_counter() > self.deadline:
+            raise _OutOfTime
+        game = self.game
+        result = game.result(state)
+        if result is not None:
+            return result
+        if depth == 0:
+            return game.evaluate(state)
+
+        key = game.key(state)
+        entry = self.probe(key)
+        first = None
+        start_alpha = alpha
+        if entry is not None:
+            first = entry[4]
+            if entry[1] >= depth:
+                value, flag = entry[3], entry[2]
+                self.hits += 1
+                if flag == EXACT:
+                    return value
+                if flag == LOWER:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+
+        best, best_move = -INF, None
+        for move in self.ordered(state, first, ply):
+            value = -self.negamax(game.play(state, move), depth - 1, -beta, -alpha, ply + 1)
+            if value > best:
+                best, best_move = value, move
+                if value > alpha:
+                    alpha = value
+                    if alpha >= beta:
+                        self.cutoffs += 1
+                        killers = self.killers[ply]
+                        if killers[0] != move:
+                            killers[0], killers[1] = move, killers[0]
+                        break
+        flag = UPPER if best <= start_alpha else LOWER if best >= beta else EXACT
+        self.store(key, depth, flag, best, best_move)
+        return best
+
+    def search_root(self, state, depth, alpha=-INF, beta=INF, moves=None):
+        """
+        One alpha-beta search of the given depth: (best move, score).
+        moves: the root moves to try, in order (all of them by default).
+        """
+        best, best_move = -INF, None
+        for move in moves if moves is not None else self.ordered(state, None, 0):
+            value = -self.negamax(self.game.play(state, move), depth - 1, -beta, -alpha, 1)
+            if value > best:
+                best, best_move = value, move
+                alpha = max(alpha, value)
+                if alpha >= beta:
+                    break
+        return best_move, best
+
+    def search(self, state, max_depth=None, time_limit=None, tracer=None):
+        """
+        Best move for the player to move and its score, deepening until
+        max_depth (default: to the end of the game) or time_limit seconds.
+        (None, score) if the game is already over.
+        """
+        game = self.game
+        self.nodes = self.hits = self.cutoffs = self.depth = 0
+        self.generation += 1
+        self.on_node = tracer.node_hook(game.name) if tracer else None
+        self.deadline = None if time_limit is None else time.perf_counter() + time_limit
+        result = game.result(state)
+        best = (None, result)
+        if result is None:
+            stones = state[-1]
+            limit = game.cells - stones if max_depth is None else min(max_depth, game.cells - stones)
+            order = self.ordered(state, None, 0)
+            try:
+                for depth in range(1, limit + 1):
+                    move, score = self.search_root(state, depth, moves=order)
+                    best, self.depth = (move, score), depth
+                    order = [move] + [m for m in order if m != move]
+                    if abs(score) >= WIN - game.cells:
+                        break               # Won or lost by force: deeper changes nothing
+            except _OutOfTime:
+                if best[0] is None:         # Not even depth 1 finished: any move
+                    best = (order[0], 0)
+            self.deadline = None
+        if tracer:
+            tracer.summary(game.name, nodes=self.nodes, depth=self.depth, hits=self.hits,
+                           cutoffs=self.cutoffs, move=best[0], score=best[1])
+        return best
+
+
+def describe(score):
+    if abs(score) > WIN - 100:
+        stones = WIN - abs(score)
+        return f"{'win' if score > 0 else 'loss'} with stone {stones}"
+    return f"{score:+d}"
+
+
+def demo():
+    for symmetries in (False, True):
+        engine = Engine(TicTacToe(symmetries))
+        t = time.perf_counter()
+        move, score = engine.search(engine.game.start())
+        print(f"Tic-Tac-Toe, {'with' if symmetries else 'without'} symmetries: best first "
+              f"move {move}, value {describe(score)}, {engine.nodes} nodes, "
+              f"{time.perf_counter() - t:.3f}s")
+
+    game = ConnectFour()
+    engine = Engine(game)
+    t = time.perf_counter()
+    move, score = engine.search(game.start(), time_limit=5)
+    print(f"\nConnect-Four, empty board, 5s: depth {engine.depth}, column {move}, "
+          f"score {describe(score)}, {engine.nodes} nodes, {engine.hits} table hits, "
+          f"{time.perf_counter() - t:.1f}s")
+
+    # A midgame position (columns played, 0-based), solved to the end
+    moves = [int(c) for c in "33332444556434432110"]
+    engine = Engine(game)
+    t = time.perf_counter()
+    move, score = engine.search(game.after(moves))
+    print(f"Connect-Four after {len(moves)} moves: column {move}, {describe(score)}, "
+          f"{engine.nodes} nodes, {time.perf_counter() - t:.2f}s")
+
+    # Engine against itself, 0.2s a move
+    state, engine, played = game.start(), Engine(game), []
+    while game.result(state) is None:
+        move, _ = engine.search(state, time_limit=0.2)
+        played.append(move)
+        state = game.play(state, move)
+    result = game.result(state)
+    outcome = "draw" if result == 0 else f"won by the {'first' if len(played) % 2 else 'second'} player"
+    print(f"\nSelf-play, 0.2s a move: {''.join(str(m) for m in played)}, {outcome}")
+
+
+if __name__ == "__main__":
+    demo()
@@ -0,0 +1,187 @@
+# Grid maps for the maze / city searches
+# A map is stored as one flat bytearray with a byte per cell (the map
+# character itself, row-major, cell index = r * cols + c) plus a second
+# byte per cell with a bit for every passable neighbor. Bit k stands for
+# moves[k], and deltas[mask] lists the index offsets of those neighbors,
+# so expanding a cell is one lookup instead of four bounds and wall checks:
+#
+#     for d in grid.deltas[grid.mask[i]]:
+#         j = i + d                     # a passable neighbor of cell i
+#
+# This is the compressed form of a CSR neighbor array: row i of the CSR
+# is deltas[mask[i]] shifted by i, at one byte per cell instead of an
+# offset plus up to four 32-bit neighbor ids.
+#
+# Maps load from text files (one row per line) or from the binary format
+# written by save(), which is memory-mapped so even 10k x 10k maps open
+# without being copied into memory.
+
+import mmap
+
+MAGIC = b"GRIDMAP1"
+WALLS = b"#"
+
+
+def _moves_key(moves):
+    # How the moves order is written in a binary map header, e.g. b"0,1;1,0;0,-1;-1,0"
+    return ";".join(f"{dr},{dc}" for dr, dc in moves).encode()
+
+
+class GridMap:
+    """
+    A rectangular grid of map characters with precomputed neighbor masks.
+
+    rows, cols: size of the map
+    cells:      one byte per cell holding the map character
+    mask:       one byte per cell, bit k set if moves[k] leads to an open cell
+    moves:      the (dr, dc) moves, in the order searches should try them
+    deltas:     deltas[mask] = tuple of index offsets of the open neighbors
+    """
+
+    def __init__(self, rows, cols, cells, moves, walls=WALLS, mask=None):
+        if len(cells) != rows * cols:
+            raise ValueError(f"expected {rows * cols} cells, got {len(cells)}")
+        self.rows = rows
+        self.cols = cols
+        self.cells = cells
+        self.moves = tuple(moves)
+        self.walls = walls
+        self.offsets = tuple(dr * cols + dc for dr, dc in self.moves)
+        self.deltas = tuple(
+            tuple(self.offsets[k] for k in range(len(self.moves)) if m >> k & 1)
+            for m in range(1 << len(self.moves))
+        )
+        # open_table[byte] is 1 for characters you can walk on, 0 for walls
+        self.open_table = bytes(0 if bytes([b]) in walls else 1 for b in range(256))
+        self.mask = mask if mask is not None else self._build_mask()
+        self.version = 0        # bumped by every set_cell, so caches can tell the map changed
+
+    # ---- Building ----
+    @classmethod
+    def from_rows(cls, rows, moves, walls=WALLS):
+        """Build from a list of strings or a list of lists of characters."""
+        data = bytearray(b"".join("".join(row).encode("ascii") for row in rows))
+        return cls(len(rows), len(rows[0]) if rows else 0, data, moves, walls)
+
+    @classmethod
+    def load(cls, path, moves, walls=WALLS):
+        """Load a text map (one row per line) or a binary map written by save()."""
+        with open(path, "rb") as f:
+            if not f.seek(0, 2):
+                raise ValueError(f"{path}: the map is empty")
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if mm[:len(MAGIC)] == MAGIC:
+            # Binary: header line, then the cells, then the neighbor masks.
+            # Both stay views into the mapped file, nothing is copied.
+            end = mm.find(b"\n")
+            _, rows, cols, saved_moves = mm[:end].split()
+            rows, cols = int(rows), int(cols)
+            view = memoryview(mm)
+            n = rows * cols
+            # The saved masks are only valid for the same moves order
+            mask = view[end + 1 + n:end + 1 + 2 * n] if saved_moves == _moves_key(moves) else None
+            return cls(rows, cols, view[end + 1:end + 1 + n], moves, walls, mask=mask)
+        lines = [line.rstrip(b"\r") for line in mm[:].split(b"\n")]
+        mm.close()
+        while lines and not lines[-1]:
+            lines.pop()
+        cols = len(lines[0]) if lines else 0
+        if any(len(line) != cols for line in lines):
+            raise ValueError(f"{path}: every row must have the same width")
+        return cls(len(lines), cols, bytearray(b"".join(lines)), moves, walls)
+
+    def save(self, path):
+        """Write the binary format that load() memory-maps."""
+        with open(path, "wb") as f:
+            f.write(MAGIC + f" {self.rows} {self.cols} ".encode() + _moves_key(self.moves) + b"\n")
+            f.write(self.cells)
+            f.write(self.mask)
+
+    def _build_mask(self):
+        # Works on the whole map at once: each cell's open/blocked flag becomes
+        # one byte of a big integer, so "is the cell to the right open" for
+        # every cell is a single shift-and-AND done in C, not a Python loop.
+        n = self.rows * self.cols
+        if n == 0:
+            return bytearray()
+        open_cells = int.from_bytes(bytes(self.cells).translate(self.open_table), "little")
+        ones = int.from_bytes(b"\x01" * n, "little")
+        not_first_col = int.from_bytes((b"\x00" + b"\x01" * (self.cols - 1)) * self.rows, "little")
+        not_last_col = int.from_bytes((b"\x01" * (self.cols - 1) + b"\x00") * self.rows, "little")
+        mask = 0
+        for k, ((dr, dc), offset) in enumerate(zip(self.moves, self.offsets)):
+            # Line each cell up with its neighbor's flag
+            shifted = open_cells >> (8 * offset) if offset > 0 else (open_cells << (-8 * offset)) & ones
+            bits = open_cells & shifted
+            if dc > 0:                      # No wrapping from the last column to the next row
+                bits &= not_last_col
+            elif dc < 0:
+                bits &= not_first_col
+            mask |= bits << k
+        return bytearray(mask.to_bytes(n, "little"))
+
+    def _cell_mask(self, i):
+        # The mask byte of one cell, the slow way (for single-cell edits)
+        if not self.is_open(i):
+            return 0
+        r, c = divmod(i, self.cols)
+        m = 0
+        for k, (dr, dc) in enumerate(self.moves):
+            if self.is_valid(r + dr, c + dc):
+                m |= 1 << k
+        return m
+
+    # ---- Editing ----
+    def set_cell(self, r, c, symbol):
+        """
+        Change one cell, e.g. to '#' when a road closes, and fix the neighbor
+        masks around it. Returns the indices whose masks were recomputed.
+        """
+        if not isinstance(self.cells, bytearray):
+            # Memory-mapped maps are read-only; edits go to a private copy
+            self.cells = bytearray(self.cells)
+        if not isinstance(self.mask, bytearray):
+            self.mask = bytearray(self.mask)
+        i = r * self.cols + c
+        self.cells[i] = ord(symbol)
+        touched = [i] + self.around(i)
+        for j in touched:
+            self.mask[j] = self._cell_mask(j)
+        self.version += 1
+        return touched
+
+    # ---- Queries ----
+    def index(self, r, c):
+        return r * self.cols + c
+
+    def position(self, i):
+        return divmod(i, self.cols)
+
+    def char(self, r, c):
+        return chr(self.cells[r * self.cols + c])
+
+    def find(self, symbol):
+        """Index of the first cell holding symbol, or None."""
+        target = ord(symbol)
+        chunk = 1 << 20                     # Scan a memory-mapped map a slice at a time
+        for start in range(0, len(self.cells), chunk):
+            i = bytes(self.cells[start:start + chunk]).find(target)
+            if i >= 0:
+                return start + i
+        return None
+
+    def is_open(self, i):
+        return self.open_table[self.cells[i]] == 1
+
+    def is_valid(self, r, c):
+        return 0 <= r < self.rows and 0 <= c < self.cols and self.is_open(r * self.cols + c)
+
+    def neighbors(self, i):
+        """Indices of the open neighbors of cell i, in moves order."""
+        return [i + d for d in self.deltas[self.mask[i]]]
+
+    def around(self, i):
+        """Indices of the cells next to cell i inside the map, open or not."""
+        r, c = divmod(i, self.cols)
+        return [(r + dr) * self.cols + c + dc for dr, dc in self.moves
+                if 0 <= r + dr < self.rows and 0 <= c + dc < self.cols]
@@ -0,0 +1,157 @@
+# Batched random-restart hill climbing (needs NumPy)
+# Activity1.hill_climb is one walker: 1000 random steps, each one scored by
+# calling the objective on the new point and again on the old one. A
+# multimodal function like x * sin(10*pi*x) traps a lone walker on whichever
+# peak it started under, and the usual cure, many restarts, multiplies that
+# cost by the number of restarts.
+#
+# A HillClimber moves all of its walkers together as one array:
+#   - each step draws a candidate for every walker, scores all candidates
+#     with a single call of a vectorized objective, and keeps the ones that
+#     are better (and inside the bounds) with a boolean mask;
+#   - the current value of every walker is kept next to its position, so
+#     the objective is only ever called on new points: one evaluation per
+#     walker per step instead of two;
+#   - a walker that hasn't improved for `stall` steps is stuck on a peak,
+#     and is restarted at a random point (its peak is remembered if it's the
+#     best so far), so thousands of restarts run side by side;
+#   - the run stops after max_steps, once the best value hasn't improved for
+#     `patience` steps, or when time_limit seconds are up.
+#
+#     climber = HillClimber(lambda x: x * np.sin(10 * np.pi * x) + 1.0, 0.0, 1.0)
+#     x, value = climber.run(patience=200, time_limit=1.0)
+
+import time
+
+import numpy as np
+
+WALKERS = 4096          # Walkers moved together
+STEP = 0.01             # Largest move per step, as a share of the range
+
+
+class HillClimber:
+    """
+    Maximizes a vectorized objective with many hill climbers at once.
+
+    objective: takes an array of points, (walkers,) for scalar bounds or
+               (walkers, dims) for sequence bounds, and returns an array of
+               their values, shape (walkers,)
+    low, high: bounds of the search box (scalars or one per dimension)
+    walkers:   number of climbers moved together
+    step:      largest move per step and dimension, as a share of high - low
+    seed:      seed for the NumPy random generator
+    After run(), steps, evaluations and restarts tell how the search went.
+    """
+
+    def __init__(self, objective, low, high, walkers=WALKERS, step=STEP, seed=None):
+        self.objective = objective
+        self.low, self.high = np.asarray(low, dtype=float), np.asarray(high, dtype=float)
+        self.shape = (walkers,) + self.low.shape
+        self.step = step * (self.high - self.low)
+        self.rng = np.random.default_rng(seed)
+        self.x = self.random_points(walkers)
+        self.fx = self.evaluate(self.x)                  # Value of every walker's point
+        self.age = np.zeros(walkers, dtype=np.int64)     # Steps since each walker improved
+        best = int(np.argmax(self.fx))
+        self.best_x, self.best_value = self.x[best].copy(), self.fx[best]
+        self.steps = 0
+        self.evaluations = walkers
+        self.restarts = 0
+
+    def random_points(self, count):
+        return self.rng.uniform(self.low, self.high, (count,) + self.low.shape)
+
+    def evaluate(self, points):
+        values = np.asarray(self.objective(points), dtype=float)
+        if values.shape != points.shape[:1]:
+            raise ValueError(f"objective returned shape {values.shape}, expected {points.shape[:1]}")
+        return values
+
+    def restart(self, stuck):
+        # Send the stuck walkers to fresh random points
+        count = int(np.count_nonzero(stuck))
+        self.x[stuck] = self.random_points(count)
+        self.fx[stuck] = self.evaluate(self.x[stuck])
+        self.age[stuck] = 0
+        self.evaluations += count
+        self.restarts += count
+
+    def run(self, max_steps=1000, stall=None, patience=None, time_limit=None, tracer=None):
+        """
+        Climb until max_steps, `patience` steps without a better best value,
+        or time_limit seconds; can be called again to go on.
+        stall: steps without improvement after which a walker restarts
+        (default: never). Returns (best point, best value).
+        """
+        x, fx, age, low, high, step = self.x, self.fx, self.age, self.low, self.high, self.step
+        deadline = None if time_limit is None else time.perf_counter() + time_limit
+        since_best = 0
+        for _ in range(max_steps):
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+            candidates = x + self.rng.uniform(-step, step, self.shape)
+            inside = (candidates >= low) & (candidates <= high)
+            if inside.ndim > 1:
+                inside = inside.all(axis=1)
+            values = self.evaluate(np.clip(candidates, low, high))
+            better = inside & (values > fx)
+            x[better] = candidates[better]
+            fx[better] = values[better]
+            age += 1
+            age[better] = 0
+            self.steps += 1
+            self.evaluations += len(fx)
+
+            best = int(np.argmax(fx))
+            if fx[best] > self.best_value:
+                self.best_x, self.best_value = x[best].copy(), fx[best]
+                since_best = 0
+            else:
+                since_best += 1
+                if patience is not None and since_best >= patience:
+                    break
+            if stall is not None:
+                stuck = age >= stall
+                if stuck.any():
+                    self.restart(stuck)
+        if tracer:
+            tracer.summary("hill_climb", steps=self.steps, evaluations=self.evaluations,
+                           restarts=self.restarts, best=float(self.best_value))
+        return self.best_x, self.best_value
+
+
+def demo():
+    from Activity1 import hill_climb
+
+    def objective(x):
+        return x * np.sin(10 * np.pi * x) + 1.0
+
+    # The old scalar climber, restarted the same number of times in a loop
+    runs = 200
+    t = time.perf_counter()
+    best = max((hill_climb() for _ in range(runs)), key=lambda result: result[1])
+    scalar = (time.perf_counter() - t) / runs
+    print(f"Activity1.hill_climb x {runs}: x={best[0]:.4f}, f(x)={best[1]:.4f}, "
+          f"{scalar * 1e3:.2f} ms per restart")
+
+    climber = HillClimber(objective, 0.0, 1.0, walkers=WALKERS, seed=1)
+    t = time.perf_counter()
+    x, value = climber.run(max_steps=1000, stall=50, patience=200, time_limit=5.0)
+    elapsed = time.perf_counter() - t
+    restarts = climber.restarts + WALKERS
+    print(f"HillClimber, {WALKERS} walkers: x={x:.4f}, f(x)={value:.4f} after "
+          f"{climber.steps} steps, {restarts} restarts, {elapsed:.2f}s, "
+          f"{elapsed / restarts * 1e3:.3f} ms per restart")
+
+    # Same climber in 2D: Rastrigin, many local minima, maximize its negative
+    def rastrigin(p):
+        return -(20 + (p ** 2 - 10 * np.cos(2 * np.pi * p)).sum(axis=1))
+
+    climber = HillClimber(rastrigin, [-5.12, -5.12], [5.12, 5.12], seed=1)
+    p, value = climber.run(max_steps=2000, stall=100, patience=500, time_limit=5.0)
+    print(f"Rastrigin 2D: point=({p[0]:.3f}, {p[1]:.3f}), value={value:.4f} "
+          f"(best is 0 at the origin), {climber.steps} steps, {climber.restarts} restarts")
+
+
+if __name__ == "__main__":
+    demo()
@@ -1,6 +1,10 @@
-import heapq
-import time
-import os
+import sys
+from GridMap import GridMap
+from JumpPoint import JumpPointSearch
+from Frontier import make_frontier, cell_costs
+from DStarLite import DStarLite
+from RouteCache import MISS
+from Renderer import Renderer, Animation, cell_text
 
 # City map layout
 # S = Start (Delivery Boy)
@@ -16,22 +20,33 @@ city = [
     "......."
 ]
 
-ROWS, COLS = len(city), len(city[0])
-
 # Movements: Right, Down, Left, Up
 moves = [(0,1),(1,0),(0,-1),(-1,0)]
 
+# ---- Map ----
+# Searches run on a GridMap (see GridMap.py): flat cell indices r*COLS+c with
+# a precomputed table of open neighbors per cell. start/restaurant/customer
+# stay (row, col) tuples; the *_i names are their cell indices.
+def use_map(new_grid):
+    """Point the search and the renderer at another map"""
+    global grid, ROWS, COLS, start, restaurant, customer, start_i, restaurant_i, customer_i
+    grid = new_grid
+    ROWS, COLS = grid.rows, grid.cols
+    start_i, restaurant_i, customer_i = grid.find("S"), grid.find("R"), grid.find("C")
+    start, restaurant, customer = (None if i is None else grid.position(i)
+                                   for i in (start_i, restaurant_i, customer_i))
+
+def load_city(path):
+    """Load a map file (text, or binary from GridMap.save) and use it"""
+    use_map(GridMap.load(path, moves))
+
+use_map(GridMap.from_rows(city, moves))
+
 # ---- Helper functions ----
 def find(symbol):
     """Find coordinates of a symbol in the city map"""
-    for r in range(ROWS):
-        for c in range(COLS):
-            if city[r][c] == symbol:
-                return (r,c)
-
-start = find("S")
-restaurant = find("R")
-customer = find("C")
+    i = grid.find(symbol)
+    return None if i is None else grid.position(i)
 
 def heuristic(x, y, goal):
     """Manhattan distance heuristic"""
@@ -39,76 +54,205 @@ def heuristic(x, y, goal):
 
 def is_valid(r,c):
     """Check if cell is within bounds and not blocked"""
-    return 0 <= r < ROWS and 0 <= c < COLS and city[r][c] != "#"
+    return grid.is_valid(r,c)
+
+COURIER, TRAIL = "🚴", "*"     # Delivery boy emoji, path marker
+
+def city_cell(r, c, path=(), current=None):
+    """What the map shows at (r, c)"""
+    if (r,c) == current:
+        return COURIER
+    if (r,c) in path:
+        return TRAIL
+    return grid.char(r,c)
 
 def print_city(path=set(), current=None):
     """Prints the city map with path and current position"""
     for r in range(ROWS):
-        row_str = ""
-        for c in range(COLS):
-            if (r,c) == current:
-                row_str += "🚴 "  # Delivery boy emoji
-            elif (r,c) in path:
-                row_str += "* "   # Path marker
-            else:
-                row_str += city[r][c] + " "
-        print(row_str)
+        print("".join(cell_text(city_cell(r, c, path, current)) for c in range(COLS)))
     print("\n")
 
+def reconstruct_path(came_from, state):
+    """Follow parent pointers from the goal state back to the start"""
+    path = []
+    while state is not None:
+        path.append(divmod(state[0], COLS))
+        state = came_from[state]
+    return path[::-1]
+
 # ---- A* with CSP ----
-def a_star_pizza():
+def a_star_pizza(tracer=None, method="a*", frontier=None, costs=None, landmarks=None, cache=None):
     """
     A* search with constraint:
     Delivery boy must collect pizza from Restaurant (R)
     before going to Customer (C).
+    Pass a Tracer (see Tracing.py) to record expansions and counters.
+    method="jps" runs Jump Point Search instead (same path length).
+    costs: step cost per map character, e.g. {'~': 3} (1 for the rest).
+    frontier: "heap" (default), "bucket" or a frontier class (see Frontier.py).
+    landmarks: a Landmarks built for grid (see Landmarks.py) to estimate
+    with landmark bounds instead of Manhattan distance.
+    cache: a RouteCache (see RouteCache.py) for repeated unweighted queries.
     """
-    # Priority Queue: (f=g+h, g, position, has_pizza, path)
-    pq = [(0,0,start,False,[start])]
+    if cache is not None and not costs:
+        key = ("a_star_pizza", start_i, restaurant_i, customer_i)
+        path = cache.get(grid, key)
+        if path is MISS:
+            path = a_star_pizza(tracer, method, frontier, landmarks=landmarks)
+            cache.put_path(grid, key, path, [start, restaurant, customer])
+        return None if path is None else list(path)
+    if method == "jps":
+        if costs:
+            raise ValueError("Jump Point Search needs uniform step costs")
+        return jps_pizza(tracer)
+    source = (start_i,False)
+    deltas, mask, cells = grid.deltas, grid.mask, grid.cells
+    step_cost, cheapest, integer = cell_costs(grid, costs)
+    # Frontier of (f=g+h, g, (cell, has_pizza)), lowest f first, then highest g
+    pq = make_frontier(frontier, integer)
+    pq.push(0, 0, source)
+    if landmarks:
+        to_restaurant = landmarks.heuristic(restaurant_i)
+        to_customer = landmarks.heuristic(customer_i)
+        # Before the pickup the R -> C leg is still ahead, so it's added on
+        leg = to_customer(restaurant_i)
+        if leg is None:
+            if tracer:
+                tracer.summary("a_star_pizza", nodes=0, found=False)
+            return None
+    g_score = {source: 0}         # cheapest known cost to each (position, has_pizza)
+    came_from = {source: None}    # parent pointers, the path is rebuilt once at the goal
     visited = set()
+    nodes = 0
+    on_node = tracer.node_hook("a_star_pizza") if tracer else None
 
     while pq:
-        f,g,pos,has_pizza,path = heapq.heappop(pq)
+        f,g,state = pq.pop()
+        pos,has_pizza = state
 
         # Goal condition: reached customer with pizza
-        if pos == customer and has_pizza:
-            return path
+        if pos == customer_i and has_pizza:
+            if tracer:
+                tracer.summary("a_star_pizza", nodes=nodes, cost=g, found=True)
+            return reconstruct_path(came_from, state)
 
-        state = (pos,has_pizza)
         if state in visited:
             continue
         visited.add(state)
+        nodes += 1
+        if on_node:
+            on_node(nodes, g, state)
 
-        for dr,dc in moves:
-            nr,nc = pos[0]+dr,pos[1]+dc
-            if not is_valid(nr,nc):
-                continue
+        for d in deltas[mask[pos]]:  # Open neighbors only
+            nxt = pos + d
 
             new_has_pizza = has_pizza
-            if (nr,nc) == restaurant:
+            if nxt == restaurant_i:
                 new_has_pizza = True  # Constraint satisfied (pickup pizza)
 
+            new_state = (nxt,new_has_pizza)
+            new_g = g + step_cost[cells[nxt]]
+            if new_g >= g_score.get(new_state, new_g+1):
+                continue  # Already reached at least as cheaply
+
             # Heuristic changes based on whether we have pizza
-            target = customer if new_has_pizza else restaurant
-            h = heuristic(nr,nc,target)
+            if landmarks:
+                h = to_customer(nxt) if new_has_pizza else to_restaurant(nxt)
+                if h is None:
+                    continue  # Cut off from where we're heading
+                if not new_has_pizza:
+                    h += leg
+            else:
+                target = customer if new_has_pizza else restaurant
+                nr,nc = divmod(nxt, COLS)
+                h = heuristic(nr,nc,target)
+            h *= cheapest
+            g_score[new_state] = new_g
+            came_from[new_state] = state
 
-            heapq.heappush(pq,(g+1+h,g+1,(nr,nc),new_has_pizza,path+[(nr,nc)]))
+            pq.push(new_g+h,new_g,new_state)
 
+    if tracer:
+        tracer.summary("a_star_pizza", nodes=nodes, found=False)
     return None
 
+def jps_pizza(tracer=None):
+    """
+    Jump Point Search version of a_star_pizza (see JumpPoint.py).
+    The two phases are two searches: S -> R, then R -> C with the pizza.
+    """
+    jps = JumpPointSearch(grid)
+    if tracer:
+        tracer.node_hook("jps_pizza")     # Only jump points are expanded, so just the summary
+    to_restaurant = jps.search(start_i, restaurant_i)
+    nodes = jps.nodes_expanded
+    to_customer = jps.search(restaurant_i, customer_i) if to_restaurant else None
+    nodes += jps.nodes_expanded if to_restaurant else 0
+    if to_customer is None:
+        if tracer:
+            tracer.summary("jps_pizza", nodes=nodes, found=False)
+        return None
+    path = to_restaurant + to_customer[1:]
+    if tracer:
+        tracer.summary("jps_pizza", nodes=nodes, cost=len(path) - 1, found=True)
+    return [divmod(i, COLS) for i in path]
+
+# ---- Replanning on the way ----
+def deliver_with_closures(closures=None):
+    """
+    Walk the delivery one step at a time while roads close (D* Lite, see DStarLite.py).
+    closures maps a step number to the (row, col) cells that turn into '#'
+    just before that step. The closures are written into grid and only the
+    part of the plan they affect is repaired. Yields the courier's position
+    after every step; if the courier gets cut off the walk stops short of C.
+    """
+    closures = closures or {}
+    step = 0
+    here = start_i
+    yield start
+    for target in (restaurant_i, customer_i):   # Pick up the pizza, then deliver it
+        planner = DStarLite(grid, here, target)
+        planner.plan()
+        while here != target:
+            if step in closures:
+                planner.set_cells([(r, c, "#") for r, c in closures[step]])
+            path = planner.path()
+            if path is None:
+                return
+            here = path[1]
+            planner.move_to(here)
+            step += 1
+            yield divmod(here, COLS)
+
 # ---- Run the Game ----
-solution = a_star_pizza()
+def demo(delay=0.5, record=None):
+    """
+    Find the delivery route and animate it (delay = seconds per step).
+    record: path of a file to record the frames in instead of drawing
+    them (see Renderer.py; Renderer.replay plays it back).
+    """
+    solution = a_star_pizza()
+
+    if solution:
+        print("✅ Pizza Delivered! Steps followed:\n")
 
-if solution:
-    print("✅ Pizza Delivered! Steps followed:\n")
+        # Only the courier's old and new cells change per step; the
+        # animation thread draws them while this loop carries on
+        renderer = Renderer(grid, out=None if record else sys.stdout, record=record)
+        animation = Animation(renderer, delay)
+        previous = None
+        for step in solution:
+            changes = [(*step, COURIER)]
+            if previous:
+                changes.append((*previous, TRAIL))
+            animation.put(changes, focus=step)
+            previous = step
+        animation.close()
 
-    visited_path = set()
-    for step in solution:
-        os.system("cls" if os.name == "nt" else "clear")
-        visited_path.add(step)
-        print_city(path=visited_path, current=step)
-        time.sleep(0.5)  # animation speed
+        print("🍕 Pizza successfully delivered to the customer!")
 
-    print("🍕 Pizza successfully delivered to the customer!")
+    else:
+        print("❌ Could not deliver pizza. Path blocked!")
 
-else:
-    print("❌ Could not deliver pizza. Path blocked!")
+if __name__ == "__main__":
+    demo()
@@ -0,0 +1,124 @@
+# Jump Point Search for 4-connected, uniform-cost GridMaps
+# On open grids plain A* pushes every neighbor, and most of those pushes are
+# the many equally short orderings of the same moves. JPS only keeps one
+# canonical ordering: vertical moves before horizontal ones. A path turns
+# from horizontal back to vertical only where a wall makes the vertical-first
+# version impossible (a "forced" neighbor), so
+#   - a horizontal jump runs straight until the goal, a wall, or a cell
+#     whose up/down neighbor is open while the one behind it is blocked;
+#   - a vertical jump runs straight until the goal, a wall, or a cell from
+#     which a horizontal jump (either way) finds a jump point.
+# Only the cells where jumps stop go on the heap. g between them is the
+# straight-line distance, so path lengths are the same as plain A*.
+
+import heapq
+
+
+class JumpPointSearch:
+    """
+    JPS over one GridMap. search(start, goal) takes and returns cell indices;
+    nodes_expanded counts the jump points taken off the heap by the last search.
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.cols = grid.cols
+        # Mask bits for the four directions, whatever order grid.moves uses
+        bit = {move: 1 << k for k, move in enumerate(grid.moves)}
+        self.up, self.down = bit[(-1, 0)], bit[(1, 0)]
+        self.left, self.right = bit[(0, -1)], bit[(0, 1)]
+        self.nodes_expanded = 0
+
+    def _jump_horizontal(self, i, dx, goal):
+        mask = self.grid.mask
+        step_bit = self.right if dx > 0 else self.left
+        up, down = self.up, self.down
+        while mask[i] & step_bit:
+            prev, i = i, i + dx
+            if i == goal:
+                return i
+            here = mask[i]
+            back = mask[prev]
+            # Forced: can turn up/down here, but couldn't have one cell earlier
+            if (here & up and not back & up) or (here & down and not back & down):
+                return i
+        return None
+
+    def _jump_vertical(self, i, dy, goal):
+        mask = self.grid.mask
+        step_bit = self.down if dy > 0 else self.up
+        step = dy * self.cols
+        while mask[i] & step_bit:
+            i += step
+            if i == goal:
+                return i
+            if self._jump_horizontal(i, 1, goal) is not None or self._jump_horizontal(i, -1, goal) is not None:
+                return i
+        return None
+
+    def _successors(self, i, came, goal):
+        # came: None at the start, else ("h", dx) or ("v", dy) for the last move
+        mask = self.grid.mask
+        jumps = []
+        if came is None or came[0] == "v":
+            if came is None:
+                jumps += [("v", 1), ("v", -1)]
+            else:
+                jumps.append(came)
+            jumps += [("h", 1), ("h", -1)]
+        else:
+            jumps.append(came)
+            back = mask[i - came[1]]
+            if mask[i] & self.up and not back & self.up:
+                jumps.append(("v", -1))
+            if mask[i] & self.down and not back & self.down:
+                jumps.append(("v", 1))
+        for axis, d in jumps:
+            j = self._jump_horizontal(i, d, goal) if axis == "h" else self._jump_vertical(i, d, goal)
+            if j is not None:
+                yield j, (axis, d)
+
+    def search(self, start, goal):
+        """Shortest path from start to goal as a list of cell indices, or None."""
+        cols = self.cols
+        gr, gc = divmod(goal, cols)
+
+        def h(i):
+            r, c = divmod(i, cols)
+            return abs(r - gr) + abs(c - gc)
+
+        self.nodes_expanded = 0
+        open_heap = [(h(start), 0, start, None)]
+        g_score = {start: 0}
+        came_from = {start: None}
+        closed = set()
+        while open_heap:
+            _, g, i, came = heapq.heappop(open_heap)
+            if i in closed:
+                continue
+            closed.add(i)
+            if i == goal:
+                return self._unfold(came_from, goal)
+            self.nodes_expanded += 1
+            for j, direction in self._successors(i, came, goal):
+                # Jump points lie on a straight line from i
+                new_g = g + (abs(j - i) if direction[0] == "h" else abs(j - i) // cols)
+                if new_g < g_score.get(j, new_g + 1):
+                    g_score[j] = new_g
+                    came_from[j] = i
+                    heapq.heappush(open_heap, (new_g + h(j), new_g, j, direction))
+        return None
+
+    def _unfold(self, came_from, goal):
+        # Fill in the straight runs between consecutive jump points
+        points = []
+        i = goal
+        while i is not None:
+            points.append(i)
+            i = came_from[i]
+        points.reverse()
+        path = [points[0]]
+        for a, b in zip(points, points[1:]):
+            step = (1 if b > a else -1) * (1 if a // self.cols == b // self.cols else self.cols)
+            path += range(a + step, b + step, step)
+        return path
@@ -0,0 +1,106 @@
+# Landmark (ALT) heuristics for the grid A* searches
+# Manhattan distance ignores walls, so on maze-like maps it is far below the
+# real distance and A* expands most of the map. ALT ("A*, Landmarks,
+# Triangle inequality") does one preprocessing pass per map instead:
+#   1. pick K landmark cells, spread out by farthest-point selection (each
+#      new landmark is the cell furthest from all landmarks so far),
+#   2. BFS from every landmark and keep the exact distances, 4 bytes a cell.
+# For any landmark L the triangle inequality gives
+#     d(n, t) >= |d(L, t) - d(L, n)|
+# so the largest of these over all landmarks (and Manhattan) is a heuristic
+# that never overestimates, and stays consistent. It knows about walls, so
+# on mazes it is often exact. The distance tables cost K BFS runs once, and
+# every later query on the same map reuses them until the map is edited.
+
+from array import array
+from collections import deque
+
+UNREACHABLE = -1
+
+
+def bfs_distances(grid, source):
+    """Moves from cell source to every cell, as an array('i') (-1 = unreachable)."""
+    deltas, mask = grid.deltas, grid.mask
+    dist = array("i", [UNREACHABLE]) * (grid.rows * grid.cols)
+    dist[source] = 0
+    queue = deque([source])
+    while queue:
+        i = queue.popleft()
+        step = dist[i] + 1
+        for d in deltas[mask[i]]:
+            if dist[i+d] == UNREACHABLE:
+                dist[i+d] = step
+                queue.append(i+d)
+    return dist
+
+
+class Landmarks:
+    """
+    Landmark distance tables for one GridMap.
+
+    count: how many landmarks to place
+    seed:  a cell index in the part of the map the searches use (the first
+           open cell by default); landmarks are picked among the cells it reaches
+
+    heuristic(target) returns h(i), a lower bound on the moves from cell i
+    to cell target, for plugging into A*. The tables belong to one version
+    of the map: a road that opens can make real distances shorter than the
+    stored ones, and the bound too high. So, like RouteCache entries, they
+    remember grid.version, and heuristic() rebuilds them after an edit.
+    """
+
+    def __init__(self, grid, count=8, seed=None):
+        self.grid = grid
+        self.count = count
+        self.seed = seed
+        self.build()
+
+    def build(self):
+        """Pick the landmarks and BFS from each, on the map as it is now."""
+        grid = self.grid
+        self.version = grid.version
+        self.cells = []         # landmark cell indices
+        self.tables = []        # tables[k][i] = moves from landmark k to cell i
+        seed = self.seed
+        if seed is None or not grid.is_open(seed):
+            seed = next((i for i in range(grid.rows * grid.cols) if grid.is_open(i)), None)
+        if seed is None:
+            return
+        # Farthest-point selection: start from the cell furthest from the
+        # seed, then keep adding the cell furthest from every landmark so far
+        nearest = bfs_distances(grid, seed)
+        for _ in range(self.count):
+            far = max(range(len(nearest)), key=nearest.__getitem__)
+            if nearest[far] <= 0:
+                break           # Every reachable cell is already a landmark
+            table = bfs_distances(grid, far)
+            self.cells.append(far)
+            self.tables.append(table)
+            for i, d in enumerate(table):
+                if d < nearest[i]:
+                    nearest[i] = d
+
+    def heuristic(self, target):
+        """Lower bound on the moves from any cell to target (None if they can't meet)."""
+        if self.version != self.grid.version:
+            self.build()            # The map changed since the tables were made
+        cols = self.grid.cols
+        tr, tc = divmod(target, cols)
+        pairs = [(table, table[target]) for table in self.tables if table[target] != UNREACHABLE]
+        if len(pairs) < len(self.tables):
+            # target is outside the landmarks' region, only Manhattan holds there
+            pairs = []
+
+        def h(i):
+            r, c = divmod(i, cols)
+            best = abs(r - tr) + abs(c - tc)
+            for table, to_target in pairs:
+                d = table[i]
+                if d == UNREACHABLE:
+                    return None             # i can't reach the landmarks, so not target either
+                if d - to_target > best:
+                    best = d - to_target
+                elif to_target - d > best:
+                    best = to_target - d
+            return best
+        return h
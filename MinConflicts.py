@@ -0,0 +1,193 @@
+# Min-conflicts local search for coloring-style CSPs
+# Activity1.backtrack and ConstraintSolver are exact: they either find a
+# solution or prove there is none. On hundreds of thousands of variables
+# that proof is out of reach, but a solution usually isn't: start from a
+# full assignment, and keep moving a conflicted variable to the value that
+# clashes with the fewest neighbors until nothing clashes.
+#
+# Nothing is ever rechecked from scratch (no is_valid over all neighbors):
+#   - counts[v*k + c] is how many neighbors of v have value c, so the
+#     conflicts of every value of v are read off in O(k), and a move of v
+#     from a to b only touches counts[u*k + a] and counts[u*k + b] for
+#     v's neighbors u: O(degree) per move;
+#   - the conflicted variables are kept in a list with each one's position
+#     in it, so one is added, removed (swapped with the last) or drawn at
+#     random in O(1);
+#   - to get out of local minima, a variable may not go back to a value it
+#     just left for TENURE..2*TENURE moves (tabu), and NOISE of the moves
+#     are random (random walk);
+#   - the best assignment so far is kept by logging the variables changed
+#     since it, not by copying the whole assignment at every improvement.
+#
+# The problem is a ConstraintSolver.CSP (neighbors + values, optional
+# domains); ConstraintSolver also uses MinConflicts between its restarts.
+#
+#     search = MinConflicts(CSP(neighbors, colors))
+#     solution = search.solve(time_limit=10)     # {variable: value} or None
+
+import random
+import time
+
+NOISE = 0.02            # Share of random moves
+TENURE = 10             # Minimum moves before a variable may take back a value
+
+
+class MinConflicts:
+    """
+    Min-conflicts local search with tabu and random walk.
+
+    csp:     a ConstraintSolver.CSP
+    start:   optional list of value indexes per variable to start from;
+             -1 (or a value outside the domain) is picked greedily
+    domains: optional bitsets to use instead of csp.domains
+    seed:    int or random.Random
+    steps, best (fewest conflicted variables seen) and best_value (value
+    indexes of that assignment) tell how the search went.
+    """
+
+    def __init__(self, csp, start=None, domains=None, seed=None, noise=NOISE, tenure=TENURE):
+        self.csp = csp
+        self.adj = adj = csp.adj
+        self.k = k = len(csp.values)
+        self.domains = domains = list(csp.domains if domains is None else domains)
+        self.rng = rng = seed if isinstance(seed, random.Random) else random.Random(seed)
+        self.noise, self.tenure = noise, tenure
+        n = len(adj)
+        self.value = value = list(start) if start is not None else [-1] * n
+        self.counts = counts = [0] * (n * k)     # counts[v*k + c]: neighbors of v with value c
+        for v, c in enumerate(value):
+            if c >= 0 and domains[v] >> c & 1:
+                for u in adj[v]:
+                    counts[u * k + c] += 1
+            else:
+                value[v] = -1
+        for v, c in enumerate(value):           # Greedy start for the rest
+            if c < 0:
+                d, base = domains[v], v * k
+                if not d:
+                    raise ValueError(f"{csp.names[v]!r} has no values left")
+                c = min((j for j in range(d.bit_length()) if d >> j & 1),
+                        key=lambda j: counts[base + j] + rng.random())
+                value[v] = c
+                for u in adj[v]:
+                    counts[u * k + c] += 1
+        self.conflicted, self.where = [], [-1] * n
+        for v in range(n):
+            self.update(v)
+        self.tabu = [0] * (n * k)               # Move until which v may not go back to c
+        self.steps = 0
+        self.best, self.best_value = len(self.conflicted), list(value)
+        self.changed = set()                    # Variables moved since best_value
+
+    def update(self, v):
+        # Keep v in conflicted exactly while a neighbor shares its value
+        where, conflicted = self.where, self.conflicted
+        if self.counts[v * self.k + self.value[v]]:
+            if where[v] < 0:
+                where[v] = len(conflicted)
+                conflicted.append(v)
+        elif where[v] >= 0:
+            last = conflicted.pop()
+            if last != v:
+                conflicted[where[v]] = last
+                where[last] = where[v]
+            where[v] = -1
+
+    def run(self, max_steps=None, time_limit=None):
+        """
+        Make up to max_steps moves (or for time_limit seconds); can be
+        called again to go on. True once no variable is conflicted.
+        """
+        k, adj, domains, value, counts, tabu = self.k, self.adj, self.domains, self.value, self.counts, self.tabu
+        conflicted, update, changed = self.conflicted, self.update, self.changed
+        randrange, random_ = self.rng.randrange, self.rng.random
+        noise, tenure = self.noise, self.tenure
+        deadline = None if time_limit is None else time.perf_counter() + time_limit
+        step = self.steps
+        end = None if max_steps is None else step + max_steps
+        while conflicted and step != end:
+            step += 1
+            if deadline is not None and not step & 1023 and time.perf_counter() > deadline:
+                break
+            v = conflicted[randrange(len(conflicted))]
+            old, d, base = value[v], domains[v], v * k
+            if random_() < noise:
+                c = randrange(d.bit_length())
+                if not d >> c & 1:
+                    continue
+            else:
+                # Fewest conflicts, ties (staying put included) drawn
+                # uniformly: the t-th tie found replaces c with chance 1/t
+                c, least, ties = old, counts[base + old], 1
+                for j in range(d.bit_length()):
+                    if d >> j & 1 and j != old and tabu[base + j] < step:
+                        conflicts = counts[base + j]
+                        if conflicts < least:
+                            c, least, ties = j, conflicts, 1
+                        elif conflicts == least:
+                            ties += 1
+                            if not randrange(ties):
+                                c = j
+            if c == old:
+                continue
+            tabu[base + old] = step + tenure + randrange(tenure)
+            value[v] = c
+            changed.add(v)
+            for u in adj[v]:
+                counts[u * k + old] -= 1
+                counts[u * k + c] += 1
+                if value[u] == old or value[u] == c:
+                    update(u)
+            update(v)
+            if len(conflicted) < self.best:
+                self.best = len(conflicted)
+                for u in changed:
+                    self.best_value[u] = value[u]
+                changed.clear()
+        self.steps = step
+        return not conflicted
+
+    def assignment(self):
+        """The best assignment found, as {variable: value}."""
+        csp = self.csp
+        return {csp.names[v]: csp.values[c] for v, c in enumerate(self.best_value)}
+
+    def solve(self, max_steps=None, time_limit=None, tracer=None):
+        """Search until solved or out of steps/time; {variable: value} or None."""
+        found = self.run(max_steps, time_limit)
+        if tracer:
+            tracer.summary("min_conflicts", steps=self.steps, conflicted=self.best, found=found)
+        return self.assignment() if found else None
+
+
+def demo():
+    from ConstraintSolver import CSP
+    from Activity1 import neighbors, colors
+
+    print("Map coloring:", MinConflicts(CSP(neighbors, colors), seed=1).solve())
+
+    # Random graphs with a hidden coloring (only vertices of different hidden
+    # colors are joined), far past what the exact searches can take on
+    rng = random.Random(7)
+    for n, k, degree in ((200_000, 3, 3), (100_000, 4, 6)):
+        hidden = [rng.randrange(k) for _ in range(n)]
+        graph = {v: [] for v in range(n)}
+        edges = 0
+        while edges < degree * n // 2:
+            u, v = rng.randrange(n), rng.randrange(n)
+            if hidden[u] != hidden[v]:
+                graph[u].append(v)
+                edges += 1
+        csp = CSP(graph, k)
+        t = time.perf_counter()
+        search = MinConflicts(csp, seed=1)
+        start = search.best
+        solution = search.solve(time_limit=120)
+        print(f"\nRandom graph, {len(csp)} vertices, {csp.edges()} edges, {k} colors: "
+              f"{start} conflicted after the greedy start, {search.best} after "
+              f"{search.steps} moves, {time.perf_counter() - t:.1f}s, "
+              f"valid={csp.is_solution(solution)}")
+
+
+if __name__ == "__main__":
+    demo()
@@ -0,0 +1,251 @@
+# Multi-order delivery routing
+# A courier starts somewhere and has several orders, each picked up at a
+# restaurant and dropped off at a customer (pickup before dropoff). Instead
+# of running grid A* for every pair of stops the plan might use, we
+#   1. BFS once from each point of interest (start, restaurants, customers)
+#      over the GridMap, keeping only the distances to the other points, and
+#   2. solve the visiting order over that small distance matrix: exactly for
+#      a handful of orders, by insertion plus local repair beyond that.
+# Only the legs of the chosen route are ever turned back into grid paths.
+#
+# A DistanceMatrix belongs to one map and grows as new points are added; a
+# new point costs one BFS, and pairs already known are never searched again.
+
+from collections import deque
+
+EXACT_LIMIT = 6     # Up to this many orders the route is provably shortest
+
+
+class DistanceMatrix:
+    """
+    Cached shortest-path distances between points of interest on a GridMap.
+
+    Points are (row, col) positions; get(a, b) is the number of moves from
+    a to b, or None if b can't be reached from a. Moves cost the same in both
+    directions, so one BFS from a new point fills its row and column.
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.points = []
+        self.dist = {}      # point -> {point: moves}
+        self.searches = 0   # BFS runs so far
+
+    def add(self, points):
+        """Make sure every point has distances to every other point."""
+        for p in points:
+            if p in self.dist:
+                continue
+            self.points.append(p)
+            row = self._bfs(p)
+            self.dist[p] = row
+            for q, d in row.items():
+                self.dist[q][p] = d
+
+    def get(self, a, b):
+        return self.dist[a].get(b)
+
+    def _bfs(self, source):
+        # Plain BFS on cell indices, stopping once every known point is reached
+        grid = self.grid
+        deltas, mask = grid.deltas, grid.mask
+        targets = {grid.index(*q): q for q in self.points}
+        s = grid.index(*source)
+        seen = {s: 0}
+        queue = deque([s])
+        found = {}
+        while queue and len(found) < len(targets):
+            i = queue.popleft()
+            if i in targets:
+                found[targets[i]] = seen[i]
+            for d in deltas[mask[i]]:
+                if i+d not in seen:
+                    seen[i+d] = seen[i] + 1
+                    queue.append(i+d)
+        self.searches += 1
+        return found
+
+
+def _route_cost(matrix, start, stops):
+    cost = 0
+    here = start
+    for _, _, pos in stops:
+        d = matrix.get(here, pos)
+        if d is None:
+            return None
+        cost += d
+        here = pos
+    return cost
+
+
+def _plan_exact(matrix, start, orders):
+    # DP over (which orders are picked up / delivered, where we are).
+    # Order i's status lives in base-3 digit i: 0 waiting, 1 on board, 2 done.
+    n = len(orders)
+    INF = float("inf")
+    powers = [3 ** i for i in range(n)]
+    done = sum(2 * p for p in powers)
+    # best[(status, stop)] = (cost, previous key); stop 2i = pickup i, 2i+1 = dropoff i
+    positions = [pos for order in orders for pos in order]
+    best = {(0, None): (0, None)}
+    layer = [(0, None)]
+    for _ in range(2 * n):                  # Every step visits exactly one stop
+        nxt = {}
+        for key in layer:
+            status, stop = key
+            cost = best[key][0]
+            here = start if stop is None else positions[stop]
+            for i in range(n):
+                digit = status // powers[i] % 3
+                if digit == 2:
+                    continue
+                to = 2 * i + digit          # Pickup if waiting, dropoff if on board
+                d = matrix.get(here, positions[to])
+                if d is None:
+                    continue
+                new_key = (status + powers[i], to)
+                if cost + d < nxt.get(new_key, (INF,))[0]:
+                    nxt[new_key] = (cost + d, key)
+        best.update(nxt)
+        layer = list(nxt)
+    finals = [key for key in layer if key[0] == done]
+    if not finals:
+        return None, None
+    key = min(finals, key=lambda k: best[k][0])
+    cost = best[key][0]
+    stops = []
+    while key[1] is not None:
+        i, kind = divmod(key[1], 2)
+        stops.append(("dropoff" if kind else "pickup", i, positions[key[1]]))
+        key = best[key][1]
+    return cost, stops[::-1]
+
+
+def _best_insertion(matrix, start, stops, i, order):
+    # Cheapest place to put order i's pickup and then its dropoff into stops.
+    # Returns (new total cost, new stops), or (None, None) if it can't fit.
+    INF = float("inf")
+    here = [start] + [pos for _, _, pos in stops]
+    pickup, dropoff = order
+
+    def dist(a, b):
+        d = matrix.get(a, b)
+        return INF if d is None else d
+
+    def detour(k, pos):
+        # Extra moves for visiting pos right after stop k (k = 0 is the start)
+        if k + 1 == len(here):
+            return dist(here[k], pos)
+        return dist(here[k], pos) + dist(pos, here[k + 1]) - dist(here[k], here[k + 1])
+
+    base = 0
+    for k in range(len(here) - 1):
+        base += dist(here[k], here[k + 1])
+    best, where = INF, None
+    for a in range(len(here)):
+        add_pickup = detour(a, pickup)
+        if add_pickup >= best:
+            continue
+        # Both stops in the same gap: ... here[a], pickup, dropoff, here[a+1] ...
+        tail = dist(dropoff, here[a + 1]) - dist(here[a], here[a + 1]) if a + 1 < len(here) else 0
+        together = dist(here[a], pickup) + dist(pickup, dropoff) + tail
+        if together < best:
+            best, where = together, (a, a)
+        for b in range(a + 1, len(here)):
+            extra = add_pickup + detour(b, dropoff)
+            if extra < best:
+                best, where = extra, (a, b)
+    if where is None or base + best == INF:
+        return None, None
+    a, b = where
+    new_stops = stops[:a] + [("pickup", i, pickup)] + stops[a:b] + [("dropoff", i, dropoff)] + stops[b:]
+    return base + best, new_stops
+
+
+def _plan_heuristic(matrix, start, orders):
+    # Insert orders one by one where they add the least, then keep taking an
+    # order out and putting it back in its best place while that helps
+    stops = []
+    cost = 0
+    for i, order in enumerate(orders):
+        cost, stops = _best_insertion(matrix, start, stops, i, order)
+        if stops is None:
+            return None, None
+    improved = True
+    while improved:
+        improved = False
+        for i, order in enumerate(orders):
+            rest = [s for s in stops if s[1] != i]
+            new_cost, new_stops = _best_insertion(matrix, start, rest, i, order)
+            if new_cost is not None and new_cost < cost:
+                cost, stops, improved = new_cost, new_stops, True
+    return cost, stops
+
+
+def plan_route(grid, start, orders, matrix=None):
+    """
+    Order the stops for a list of (restaurant, customer) orders.
+
+    Returns (total moves, stops) where each stop is ("pickup" | "dropoff",
+    order number, position), or (None, None) if some stop can't be reached.
+    Pass the same DistanceMatrix across calls on one map to reuse its BFS runs.
+    """
+    matrix = matrix or DistanceMatrix(grid)
+    matrix.add([start] + [pos for order in orders for pos in order])
+    if len(orders) <= EXACT_LIMIT:
+        return _plan_exact(matrix, start, orders)
+    return _plan_heuristic(matrix, start, orders)
+
+
+def grid_path(grid, a, b):
+    """Shortest list of (row, col) positions from a to b (BFS), or None."""
+    deltas, mask = grid.deltas, grid.mask
+    s, t = grid.index(*a), grid.index(*b)
+    parent = {s: None}
+    queue = deque([s])
+    while queue:
+        i = queue.popleft()
+        if i == t:
+            path = []
+            while i is not None:
+                path.append(grid.position(i))
+                i = parent[i]
+            return path[::-1]
+        for d in deltas[mask[i]]:
+            if i+d not in parent:
+                parent[i+d] = i
+                queue.append(i+d)
+    return None
+
+
+def route_path(grid, start, stops):
+    """Turn a planned list of stops into one cell-by-cell path."""
+    path = [start]
+    for _, _, pos in stops:
+        path += grid_path(grid, path[-1], pos)[1:]
+    return path
+
+
+def demo():
+    from GridMap import GridMap
+
+    # Restaurants are upper case letters, their customers the same letter in lower case
+    city = [
+        "S...#..a..",
+        "..##..C...",
+        ".A..#...#.",
+        "...##..B..",
+        "..c.....b.",
+        "......#...",
+    ]
+    grid = GridMap.from_rows(city, [(0,1),(1,0),(0,-1),(-1,0)])
+    at = lambda symbol: grid.position(grid.find(symbol))
+    orders = [(at("A"), at("a")), (at("B"), at("b")), (at("C"), at("c"))]
+    cost, stops = plan_route(grid, at("S"), orders)
+    print(f"Route of {cost} moves:")
+    for kind, i, pos in stops:
+        print(f"  {kind} order {i} at {pos}")
+
+
+if __name__ == "__main__":
+    demo()
@@ -0,0 +1,194 @@
+# Parallel alpha-beta for the GameSearch engines
+# Game-tree searches are CPU-bound and GameSearch.Engine uses one core. This
+# splits each depth of the iterative deepening at the root, in the
+# Young Brothers Wait style:
+#   - the eldest brother (the root move the last depth found best) is
+#     searched first, here in the main process, to get a good alpha;
+#   - the younger brothers are then searched in parallel by worker
+#     processes, one root move per task;
+#   - alpha lives in shared memory. A worker publishes its move's score
+#     as soon as it has it, and re-reads alpha before each reply it
+#     searches, so a bound found by one worker prunes the others while
+#     they run, not only the tasks started afterwards.
+# Each worker keeps its own Engine, and so its own transposition table, for
+# the whole search, so the table and killers carry over from depth to depth.
+#
+# Splitting costs extra nodes: a worker may search a move with a weaker
+# alpha than the serial search would have had. compare() reports that
+# search overhead next to the speedup over a serial Engine.
+#
+#     with ParallelSearch(ConnectFour(), workers=4) as search:
+#         move, score = search.search(state, max_depth=12)
+
+import multiprocessing
+import os
+import time
+
+from GameSearch import Engine, INF, WIN, TABLE_BITS, LOWER, EXACT, ConnectFour, describe
+
+_engine = None          # This worker's Engine
+_alpha = None           # Shared root alpha
+
+
+def _start_worker(game, alpha, table_bits):
+    global _engine, _alpha
+    _engine = Engine(game, table_bits)
+    _alpha = alpha
+
+
+def _search_move(task):
+    # Score of one root move, from the root's point of view, and whether
+    # it is exact; an inexact score is an upper bound no better than alpha
+    state, move, depth = task
+    engine, game = _engine, _engine.game
+    engine.nodes = 0
+    engine.generation = depth
+    reply_state = game.play(state, move)
+    result = game.result(reply_state)
+    if result is not None or depth == 1:
+        score = -(result if result is not None else game.evaluate(reply_state))
+        return move, score, True, 1
+    engine.nodes = 1
+    best, best_reply, exact = -INF, None, True   # best is from the replying player's view
+    entry = engine.probe(game.key(reply_state))
+    for reply in engine.ordered(reply_state, entry[4] if entry else None, 1):
+        beta = -_alpha.value            # A reply this good refutes the root move
+        if best >= beta:
+            exact = False
+            break
+        value = -engine.negamax(game.play(reply_state, reply), depth - 2,
+                                -beta, -best, 2)
+        if value > best:
+            best, best_reply = value, reply
+    else:
+        exact = -best > _alpha.value
+    score = -best
+    if exact:
+        with _alpha.get_lock():
+            if score > _alpha.value:
+                _alpha.value = score
+    flag = EXACT if exact else LOWER
+    engine.store(game.key(reply_state), depth - 1, flag, best, best_reply)
+    return move, score, exact, engine.nodes
+
+
+class ParallelSearch:
+    """
+    Root-split alpha-beta search over a pool of worker processes.
+
+    game:       TicTacToe, ConnectFour or another GameSearch game
+    workers:    number of processes (default: one per CPU)
+    table_bits: size of each process's transposition table (see Engine)
+    Use it as a context manager, or call close(), to stop the workers.
+    After search(), nodes counts the nodes of every process and depth is
+    the deepest depth finished.
+    """
+
+    def __init__(self, game, workers=None, table_bits=TABLE_BITS):
+        self.game = game
+        self.workers = workers or os.cpu_count() or 1
+        self.engine = Engine(game, table_bits)       # Searches the eldest brother
+        self.alpha = multiprocessing.Value("q", -INF)
+        self.pool = multiprocessing.Pool(self.workers, _start_worker, (game, self.alpha, table_bits))
+        self.nodes = self.depth = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+
+    def search_depth(self, state, depth, order):
+        """One depth: (best move, score) with the root moves tried in order."""
+        engine = self.engine
+        engine.nodes = 0
+        engine.generation = depth
+        eldest, younger = order[0], order[1:]
+        _, alpha = engine.search_root(state, depth, moves=[eldest])
+        self.nodes += engine.nodes
+        best = (eldest, alpha)
+        self.alpha.value = alpha
+        if alpha >= WIN - self.game.cells:
+            return best                 # A forced win: no brother can beat it
+        tasks = [(state, move, depth) for move in younger]
+        for move, score, exact, nodes in self.pool.imap(_search_move, tasks):
+            self.nodes += nodes
+            if exact and score > best[1]:
+                best = (move, score)
+        return best
+
+    def search(self, state, max_depth=None, tracer=None):
+        """
+        Best move for the player to move and its score, deepening until
+        max_depth (default: to the end of the game). (None, score) if the
+        game is already over.
+        """
+        game = self.game
+        self.nodes = self.depth = 0
+        if tracer:
+            tracer.node_hook("parallel_" + game.name)   # Workers aren't traced node by node
+        result = game.result(state)
+        best = (None, result)
+        if result is None:
+            stones = state[-1]
+            limit = game.cells - stones if max_depth is None else min(max_depth, game.cells - stones)
+            order = self.engine.ordered(state, None, 0)
+            for depth in range(1, limit + 1):
+                best = self.search_depth(state, depth, order)
+                self.depth = depth
+                order = [best[0]] + [m for m in order if m != best[0]]
+                if abs(best[1]) >= WIN - game.cells:
+                    break
+        if tracer:
+            tracer.summary("parallel_" + game.name, nodes=self.nodes, depth=self.depth,
+                           workers=self.workers, move=best[0], score=best[1])
+        return best
+
+
+def compare(game, state, depth, workers=None):
+    """
+    Search state to depth serially and in parallel, each with fresh tables,
+    and return a report: both results and times, the speedup and the
+    search overhead (extra nodes of the parallel search).
+    """
+    engine = Engine(game)
+    t = time.perf_counter()
+    serial_move, serial_score = engine.search(state, max_depth=depth)
+    serial_time = time.perf_counter() - t
+    with ParallelSearch(game, workers) as search:
+        t = time.perf_counter()
+        move, score = search.search(state, max_depth=depth)
+        parallel_time = time.perf_counter() - t
+        return {"depth": depth, "workers": search.workers,
+                "serial": {"move": serial_move, "score": serial_score,
+                           "nodes": engine.nodes, "seconds": serial_time},
+                "parallel": {"move": move, "score": score,
+                             "nodes": search.nodes, "seconds": parallel_time},
+                "speedup": serial_time / parallel_time,
+                "overhead": search.nodes / engine.nodes - 1}
+
+
+def demo():
+    game = ConnectFour()
+    moves = [int(c) for c in "33332444556434432110"]
+    print(f"{os.cpu_count()} CPUs")
+    for label, state, depth in (("empty board", game.start(), 10),
+                                (f"after {len(moves)} moves", game.after(moves), 22)):
+        report = compare(game, state, depth)
+        serial, parallel = report["serial"], report["parallel"]
+        print(f"Connect-Four, {label}, depth {depth}, {report['workers']} workers: "
+              f"serial column {serial['move']} ({describe(serial['score'])}) "
+              f"{serial['nodes']} nodes {serial['seconds']:.2f}s, "
+              f"parallel column {parallel['move']} ({describe(parallel['score'])}) "
+              f"{parallel['nodes']} nodes {parallel['seconds']:.2f}s, "
+              f"speedup {report['speedup']:.2f}x, overhead {report['overhead']:+.0%}")
+
+
+if __name__ == "__main__":
+    demo()
@@ -0,0 +1,223 @@
+# Terminal rendering for the grid animations
+# Redrawing the whole map for every step (clear the screen, rebuild every
+# row, print it all again) costs O(rows * cols) per frame plus a shell for
+# the clear. A Renderer keeps one frame buffer of what is on screen: a
+# bytearray copy of the map's characters, one byte per cell, plus a dict
+# for the few cells showing something else (the courier, its trail).
+# Callers only say which cells change, and each frame is sent as a single
+# write of ANSI cursor moves to just those cells, so a step of the courier
+# costs two cells, whatever the size of the map.
+#
+# Only a viewport the size of the terminal is drawn, so the first frame of
+# a huge map costs a screenful, not the map. keep_in_view() scrolls it to
+# follow a cell.
+#
+# Headless (out=None, record=PATH) nothing is drawn: frames are written to
+# PATH as JSON lines, {"frame": n, "cells": [[row, col, text], ...]}, after
+# a first {"rows": R, "cols": C, "map": [row, ...]} line. Every frame holds
+# only its changes. replay() plays a recording back.
+#
+# An Animation draws on its own thread: the search (or the demo loop) just
+# queues each step's changes and carries on, and the thread paces the
+# frames with its delay.
+
+import json
+import os
+import queue
+import shutil
+import sys
+import threading
+import time
+import types
+import unicodedata
+
+CELL_WIDTH = 2          # Terminal columns per map cell
+CLEAR = "\x1b[2J"
+HIDE_CURSOR, SHOW_CURSOR = "\x1b[?25l", "\x1b[?25h"
+
+
+def cell_text(text):
+    # Pad a cell to CELL_WIDTH columns; emoji already take two
+    wide = sum(2 if unicodedata.east_asian_width(ch) in "WF" else 1 for ch in text)
+    return text + " " * (CELL_WIDTH - wide)
+
+
+def terminal_view(out):
+    # Cells that fit on out's terminal, keeping a line for what follows the map
+    try:
+        size = os.get_terminal_size(out.fileno())
+    except (AttributeError, OSError, ValueError):     # Not a terminal: $LINES/$COLUMNS or 24x80
+        size = shutil.get_terminal_size()
+    return max(1, size.lines - 1), max(1, size.columns // CELL_WIDTH)
+
+
+class Renderer:
+    """
+    Draws a grid of cells with the fewest terminal writes.
+
+    grid:   GridMap whose characters make up the first frame
+    out:    text stream to draw on (stdout by default), None for headless
+    record: path of a JSON lines file to record the frames in
+    view:   (rows, cols) of cells to show, the terminal's size by default
+    Call set() for the cells that change, then frame() to show them.
+    """
+
+    def __init__(self, grid, out=sys.stdout, record=None, view=None):
+        self.rows, self.cols = grid.rows, grid.cols
+        self.out = out
+        self.screen = bytearray(grid.cells)     # Map character showing in each cell
+        self.marks = {}                         # cell index -> text, where it isn't one
+        self.pending = {}                       # cell index -> new text
+        self.frames = 0
+        view = view or (terminal_view(out) if out is not None else (self.rows, self.cols))
+        self.view_rows, self.view_cols = min(view[0], self.rows), min(view[1], self.cols)
+        self.top = self.left = 0
+        self.redraw = True                      # The whole viewport goes out with the next frame
+        self.record = open(record, "w") if record else None
+        if self.record:
+            rows = [self.screen[r * self.cols:(r + 1) * self.cols].decode("latin-1")
+                    for r in range(self.rows)]
+            self.record.write(json.dumps({"rows": self.rows, "cols": self.cols, "map": rows}) + "\n")
+
+    def text(self, r, c):
+        """What the cell at (r, c) shows once the last frame is drawn."""
+        i = r * self.cols + c
+        mark = self.marks.get(i)
+        return chr(self.screen[i]) if mark is None else mark
+
+    def set(self, r, c, text):
+        """Stage a change of the cell at (r, c); shown by the next frame()."""
+        i = r * self.cols + c
+        if self.text(r, c) == text:
+            self.pending.pop(i, None)
+        else:
+            self.pending[i] = text
+
+    def keep_in_view(self, r, c):
+        """Scroll the viewport, centering (r, c), if the cell is outside it."""
+        if self.top <= r < self.top + self.view_rows and self.left <= c < self.left + self.view_cols:
+            return
+        top = min(max(0, r - self.view_rows // 2), self.rows - self.view_rows)
+        left = min(max(0, c - self.view_cols // 2), self.cols - self.view_cols)
+        if (top, left) != (self.top, self.left):
+            self.top, self.left = top, left
+            self.redraw = True
+
+    def frame(self):
+        """Send the staged changes as one frame."""
+        changes = sorted(self.pending.items())
+        self.pending = {}
+        for i, text in changes:
+            if len(text) == 1 and ord(text) < 256:
+                self.screen[i] = ord(text)
+                self.marks.pop(i, None)
+            else:
+                self.marks[i] = text
+        if self.out is not None:
+            self.out.write(self._draw_view() if self.redraw else self._draw(changes))
+            self.out.flush()
+        self.redraw = False
+        if self.record:
+            cells = [[*divmod(i, self.cols), text] for i, text in changes]
+            self.record.write(json.dumps({"frame": self.frames, "cells": cells}) + "\n")
+        self.frames += 1
+
+    def _draw(self, changes):
+        parts = []
+        last = None
+        bottom, right = self.top + self.view_rows, self.left + self.view_cols
+        for i, text in changes:
+            r, c = divmod(i, self.cols)
+            if not (self.top <= r < bottom and self.left <= c < right):
+                continue
+            if i - 1 != last or c == self.left:    # Else the cursor is already there
+                parts.append(f"\x1b[{r - self.top + 1};{(c - self.left) * CELL_WIDTH + 1}H")
+            parts.append(cell_text(text))
+            last = i
+        return "".join(parts)
+
+    def _draw_view(self):
+        parts = [HIDE_CURSOR + CLEAR] if self.frames == 0 else [CLEAR]
+        for row in range(self.view_rows):
+            r = self.top + row
+            parts.append(f"\x1b[{row + 1};1H")
+            parts.extend(cell_text(self.text(r, c))
+                         for c in range(self.left, self.left + self.view_cols))
+        return "".join(parts)
+
+    def close(self):
+        """Put the cursor under the map and stop recording."""
+        if self.out is not None:
+            self.out.write(f"\x1b[{self.view_rows + 1};1H" + SHOW_CURSOR)
+            self.out.flush()
+        if self.record:
+            self.record.close()
+            self.record = None
+
+
+class Animation:
+    """
+    Runs a Renderer on a background thread.
+
+    put(changes, focus) queues one frame, a list of (row, col, text), and
+    returns at once; the thread draws the frames in order, delay seconds
+    apart, scrolling to keep the focus (row, col) on screen.
+    With keep_up=True a backlog is merged into one frame instead, so a live
+    view never falls behind the search feeding it. close() waits for
+    every queued frame to be drawn.
+    """
+
+    def __init__(self, renderer, delay=0.0, keep_up=False):
+        self.renderer = renderer
+        self.delay = delay
+        self.keep_up = keep_up
+        self.frames = queue.Queue()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def put(self, changes, focus=None):
+        self.frames.put((changes, focus))
+
+    def _run(self):
+        renderer = self.renderer
+        while True:
+            batch = [self.frames.get()]
+            if self.keep_up:
+                while True:
+                    try:
+                        batch.append(self.frames.get_nowait())
+                    except queue.Empty:
+                        break
+            stop = None in batch
+            for changes, focus in filter(None, batch):
+                for r, c, text in changes:
+                    renderer.set(r, c, text)
+                if focus:
+                    renderer.keep_in_view(*focus)
+            if renderer.pending or renderer.redraw:
+                renderer.frame()
+                if self.delay and not stop:
+                    time.sleep(self.delay)
+            if stop:
+                return
+
+    def close(self):
+        self.frames.put(None)       # Drawn after everything queued before it
+        self.thread.join()
+        self.renderer.close()
+
+
+def replay(path, out=sys.stdout, delay=0.0, view=None):
+    """Play back a recording made by a headless Renderer."""
+    with open(path) as f:
+        header = json.loads(f.readline())
+        grid = types.SimpleNamespace(rows=header["rows"], cols=header["cols"],
+                                     cells="".join(header["map"]).encode("latin-1"))
+        renderer = Renderer(grid, out, view=view)
+        for n, line in enumerate(f):
+            if n and delay:
+                time.sleep(delay)
+            for r, c, text in json.loads(line)["cells"]:
+                renderer.set(r, c, text)
+            renderer.frame()
+        renderer.close()
@@ -0,0 +1,158 @@
+# Caching route queries on a GridMap
+# Most route questions repeat: the same start, restaurant and customer on
+# the same map. A RouteCache keeps the answers (paths, or whole distance
+# fields) in a bounded LRU and evicts the least recently used past maxsize.
+#
+# Entries are kept per map: the same key on two maps (say the same S, R
+# and C cells on two cities) is two entries, so maps sharing a cache don't
+# evict each other. Every entry also remembers its map's version
+# (GridMap.version goes up on every set_cell). An entry whose map changed
+# behind the cache's back is dropped on its next lookup. Edits made through
+# RouteCache.set_cells() are smarter: each entry is checked against the
+# cells that actually turned into walls or roads, and only the ones the
+# change can touch are dropped:
+#   - a cell turning into a wall only matters to paths that run through it,
+#     and to fields that reached it;
+#   - a cell opening up only matters to a path leg a -> b of length L if
+#     going via that cell could be shorter, i.e. manhattan(a, cell) +
+#     manhattan(cell, b) < L, and to fields that reach one of its neighbors.
+# Everything else is carried over to the new map version.
+
+from collections import OrderedDict
+
+MISS = object()     # get() result when nothing usable is cached
+
+
+def _manhattan(grid, a, b):
+    ar, ac = divmod(a, grid.cols)
+    br, bc = divmod(b, grid.cols)
+    return abs(ar - br) + abs(ac - bc)
+
+
+class _PathEntry:
+    # A path through the stops in order, as (row, col) positions, or None
+    def __init__(self, grid, value, stops):
+        self.grid, self.version, self.value = grid, grid.version, value
+        self.cells = set()
+        self.legs = []              # (from cell, to cell, moves) per pair of stops
+        if value is None:
+            return
+        cells = [grid.index(r, c) for r, c in value]
+        self.cells = set(cells)
+        k = 0
+        stops = [grid.index(r, c) for r, c in stops]
+        for a, b in zip(stops, stops[1:]):
+            j = cells.index(b, k)   # Each leg ends where the path first reaches the next stop
+            self.legs.append((a, b, j - k))
+            k = j
+
+    def affected(self, opened, blocked):
+        if self.value is None:
+            return bool(opened)     # A new road might connect the stops
+        if any(i in self.cells for i in blocked):
+            return True
+        grid = self.grid
+        return any(_manhattan(grid, a, i) + _manhattan(grid, i, b) < moves
+                   for i in opened for a, b, moves in self.legs)
+
+
+class _FieldEntry:
+    # A distance field (anything indexable by flat cell, -1 = unreachable)
+    def __init__(self, grid, value):
+        self.grid, self.version, self.value = grid, grid.version, value
+        self.flat = value.ravel() if hasattr(value, "ravel") else value
+
+    def affected(self, opened, blocked):
+        flat = self.flat
+        if any(flat[i] != -1 for i in blocked):
+            return True
+        return any(flat[j] != -1 for i in opened for j in self.grid.around(i))
+
+
+class RouteCache:
+    """
+    Bounded LRU cache of route answers, invalidated per map change.
+
+    Keys are any hashable description of the query, e.g.
+    ("bfs", start, restaurant, customer); the map is passed separately and
+    each map has its own entries.
+    hits, misses, evictions and invalidations count what happened so far.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0          # dropped for room
+        self.invalidations = 0      # dropped because the map changed
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, grid, key):
+        """The cached answer for key on grid, or MISS."""
+        slot = (id(grid), key)      # The entry holds grid, so its id stays unique
+        entry = self.entries.get(slot)
+        if entry is not None and entry.version != grid.version:
+            del self.entries[slot]
+            self.invalidations += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return MISS
+        self.entries.move_to_end(slot)
+        self.hits += 1
+        return entry.value
+
+    def _put(self, key, entry):
+        slot = (id(entry.grid), key)
+        self.entries[slot] = entry
+        self.entries.move_to_end(slot)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def put_path(self, grid, key, path, stops):
+        """Cache a shortest path (or None) that visits the (row, col) stops in order."""
+        self._put(key, _PathEntry(grid, path, stops))
+        return path
+
+    def put_field(self, grid, key, field):
+        """Cache a distance field over grid."""
+        self._put(key, _FieldEntry(grid, field))
+        return field
+
+    def set_cells(self, grid, changes):
+        """
+        Apply (row, col, symbol) changes to grid and drop only the entries
+        they can affect; the rest stay valid for the new map version.
+        """
+        old_version = grid.version
+        opened, blocked = [], []
+        for r, c, symbol in changes:
+            i = grid.index(r, c)
+            was_open = grid.is_open(i)
+            grid.set_cell(r, c, symbol)
+            if grid.is_open(i) != was_open:
+                (blocked if was_open else opened).append(i)
+        for slot, entry in list(self.entries.items()):
+            if entry.grid is not grid:
+                continue
+            if entry.version != old_version or entry.affected(opened, blocked):
+                del self.entries[slot]
+                self.invalidations += 1
+            else:
+                entry.version = grid.version
+
+    def discard(self, grid):
+        """Drop every entry on grid, e.g. once the map is unloaded."""
+        for slot in [slot for slot, entry in self.entries.items() if entry.grid is grid]:
+            del self.entries[slot]
+
+    def stats(self):
+        return {"size": len(self.entries), "hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions, "invalidations": self.invalidations}
+
+    def clear(self):
+        self.entries.clear()
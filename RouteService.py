@@ -0,0 +1,300 @@
+# Asyncio front end for the route searches
+# A long-running service that answers route queries sent as JSON lines, on
+# stdin/stdout or on a local socket, so maps stay loaded between queries
+# instead of paying for interpreter start-up and map parsing every time.
+#
+# One request per line, one response per line carrying the same "id".
+# Responses are written as soon as each search finishes, so they can come
+# back in a different order than the requests went in:
+#
+#   {"id": 1, "search": "a_star_pizza", "map": ["S..#", ".R.C"]}
+#   {"id": 2, "search": "bfs", "map_file": "city.txt"}
+#   {"id": 3, "search": "bfs_limited", "start": [[1,2,3],[4,0,6],[7,5,8]],
+#    "goal": [[1,2,3],[4,5,6],[7,8,0]], "max_depth": 20}
+#
+#   {"id": 1, "ok": true, "path": [[0,0], ...], "length": 6}
+#   {"id": 3, "ok": true, "found": true, "nodes": 14, "depth": 3}
+#   {"id": 9, "ok": false, "error": "..."}
+#
+# The searches run in a process pool. Each worker keeps its recent maps
+# (and a RouteCache of answers on them) warm between requests. On the
+# service side:
+#   - identical queries that are already running share one search;
+#   - queries for the same map that arrive together go to a worker as one
+#     batch (at most MAX_BATCH), so the map is sent and looked up once.
+
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import importlib
+import io
+import json
+import multiprocessing
+import os
+import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+SEARCHES = ("a_star_pizza", "bfs", "bfs_limited")
+GRID_SEARCHES = {"a_star_pizza": "InformedSearch", "bfs": "UninformedSearch"}
+MAX_BATCH = 16          # Queries per worker round trip
+MAX_PENDING = 256       # Requests a connection may have unanswered before reading stops
+WARM_MAPS = 32          # Maps each worker keeps loaded
+
+
+# ---- Worker side ----
+_maps = OrderedDict()   # map key -> GridMap
+_cache = None           # RouteCache shared by every map in this worker
+
+
+def _init_worker():
+    # Workers answer through the pool, never through stdout: on stdio that
+    # is the service's JSON stream. Anything else a worker prints (warnings,
+    # debugging) goes to stderr, where it can still be seen.
+    global _cache
+    sys.stdout = sys.stderr
+    from RouteCache import RouteCache
+    _cache = RouteCache()
+
+
+def _grid(map_key, rows, path, moves):
+    from GridMap import GridMap
+    key = (map_key, tuple(moves))
+    grid = _maps.get(key)
+    if grid is None:
+        grid = GridMap.load(path, moves) if path else GridMap.from_rows(rows, moves)
+        _maps[key] = grid
+        while len(_maps) > WARM_MAPS:
+            _, old = _maps.popitem(last=False)
+            if _cache is not None:
+                _cache.discard(old)
+    _maps.move_to_end(key)
+    return grid
+
+
+def _answer(map_key, rows, path, query):
+    search = query["search"]
+    if search == "bfs_limited":
+        from EightPuzzle import bfs_limited
+        from Tracing import Tracer, JsonLinesSink
+        tracer = Tracer(sink=JsonLinesSink(io.StringIO()))     # Just to collect the counters
+        with contextlib.redirect_stdout(io.StringIO()):        # It reports as it goes; the reply says it all
+            found = bfs_limited(query["start"], query["goal"], query.get("max_depth", 20), tracer=tracer)
+        counters = tracer.summaries[-1] if tracer.summaries else {}
+        return {"ok": True, "found": found, "nodes": counters.get("nodes", 0),
+                "depth": counters.get("depth")}
+    module = importlib.import_module(GRID_SEARCHES[search])
+    module.use_map(_grid(map_key, rows, path, module.moves))
+    if None in (module.start_i, module.restaurant_i, module.customer_i):
+        return {"ok": False, "error": "the map needs an S, an R and a C"}
+    if search == "a_star_pizza":
+        route = module.a_star_pizza(method=query.get("method", "a*"), cache=_cache)
+    else:
+        route = module.bfs(cache=_cache)
+    return {"ok": True, "path": route, "length": None if route is None else len(route) - 1}
+
+
+def run_queries(map_key, rows, path, queries):
+    """Answer a batch of queries on one map (runs inside a worker process)."""
+    results = []
+    for query in queries:
+        try:
+            results.append(_answer(map_key, rows, path, query))
+        except Exception as e:
+            results.append({"ok": False, "error": f"{type(e).__name__}: {e}"})
+    return results
+
+
+# ---- Service side ----
+def _map_key(request):
+    # Inline maps are keyed by their contents, files by path and modification
+    # time, so an edited file is loaded again
+    if "map_file" in request:
+        path = os.path.abspath(request["map_file"])
+        return ("file", path, os.stat(path).st_mtime_ns), None, path
+    rows = request.get("map")
+    if not isinstance(rows, list) or not rows:
+        raise ValueError("grid searches need a \"map\" (list of rows) or a \"map_file\"")
+    rows = ["".join(row) for row in rows]
+    return ("rows", hashlib.sha1("\n".join(rows).encode()).hexdigest()), rows, None
+
+
+class RouteService:
+    """
+    Routes JSON requests to a pool of search workers.
+
+    requests, coalesced and batches_sent count the requests answered, the ones
+    that joined an identical running query, and the worker round trips.
+    """
+
+    def __init__(self, workers=None):
+        # Spawned, not forked: a forked worker would inherit the open client
+        # connections and keep them from ever closing
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                        mp_context=multiprocessing.get_context("spawn"))
+        self.inflight = {}      # query key -> future shared by identical queries
+        self.batches = {}       # map key -> (rows, path, [(query key, query)]) not sent yet
+        self.requests = 0
+        self.coalesced = 0
+        self.batches_sent = 0
+
+    async def handle(self, request):
+        """Answer one request (a dict); the response always carries its id."""
+        self.requests += 1
+        reply = {"id": request.get("id")} if isinstance(request, dict) else {"id": None}
+        try:
+            if not isinstance(request, dict) or request.get("search") not in SEARCHES:
+                raise ValueError(f"\"search\" must be one of {list(SEARCHES)}")
+            query = {k: v for k, v in request.items() if k not in ("id", "map", "map_file")}
+            if query["search"] == "bfs_limited":
+                map_key, rows, path = ("8puzzle",), None, None
+            else:
+                map_key, rows, path = _map_key(request)
+            query_key = (map_key, json.dumps(query, sort_keys=True))
+            future = self.inflight.get(query_key)
+            if future is None:
+                future = self._submit(map_key, rows, path, query_key, query)
+            else:
+                self.coalesced += 1
+            reply.update(await asyncio.shield(future))
+        except (ValueError, OSError) as e:
+            reply.update(ok=False, error=str(e))
+        except Exception as e:                      # e.g. a worker died
+            reply.update(ok=False, error=f"{type(e).__name__}: {e}")
+        return reply
+
+    def _submit(self, map_key, rows, path, query_key, query):
+        loop = asyncio.get_running_loop()
+        future = self.inflight[query_key] = loop.create_future()
+        batch = self.batches.get(map_key)
+        if batch is None:
+            batch = self.batches[map_key] = (rows, path, [])
+            loop.call_soon(self._flush, map_key)    # Whatever else arrives this turn rides along
+        batch[2].append((query_key, query))
+        if len(batch[2]) >= MAX_BATCH:
+            self._flush(map_key)
+        return future
+
+    def _flush(self, map_key):
+        batch = self.batches.pop(map_key, None)
+        if batch is None:
+            return                                  # Already sent when it filled up
+        rows, path, items = batch
+        self.batches_sent += 1
+        loop = asyncio.get_running_loop()
+        done = loop.run_in_executor(self.pool, run_queries, map_key, rows, path,
+                                    [query for _, query in items])
+
+        def deliver(done):
+            error = done.exception()
+            results = [None] * len(items) if error else done.result()
+            for (query_key, _), result in zip(items, results):
+                future = self.inflight.pop(query_key)
+                if error:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+        done.add_done_callback(deliver)
+
+    async def serve(self, reader, write):
+        """
+        Answer every JSON line from reader, awaiting write(response) as each
+        finishes. A writer that waits for its client to catch up holds back
+        its request's task, and past MAX_PENDING such tasks no more lines are
+        read, so a client that doesn't read can't make the service buffer
+        responses without bound.
+        """
+        pending = set()
+
+        async def respond(line):
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                await write({"id": None, "ok": False, "error": f"bad JSON: {e}"})
+                return
+            await write(await self.handle(request))
+
+        while True:
+            if len(pending) >= MAX_PENDING:
+                await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                continue
+            line = await reader.readline()
+            if not line:
+                break
+            if line.strip():
+                task = asyncio.create_task(respond(line))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+        if pending:
+            await asyncio.gather(*pending)
+
+    def close(self):
+        self.pool.shutdown()
+
+
+class _FileReader:
+    # readline() for a stdin redirected from a regular file, which the event
+    # loop can't watch; each line is read in a helper thread instead
+    def __init__(self, file):
+        self.file = file
+
+    async def readline(self):
+        return await asyncio.to_thread(self.file.readline)
+
+
+async def serve_stdio(service):
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    try:
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+    except ValueError:                      # Not a pipe, socket or terminal
+        reader = _FileReader(sys.stdin.buffer)
+
+    async def write(response):
+        sys.stdout.write(json.dumps(response) + "\n")
+        sys.stdout.flush()
+    await service.serve(reader, write)
+
+
+async def serve_socket(service, path=None, port=None):
+    async def client(reader, writer):
+        async def write(response):
+            writer.write((json.dumps(response) + "\n").encode())
+            await writer.drain()            # Wait while the client isn't reading
+        try:
+            await service.serve(reader, write)
+        finally:
+            writer.close()
+
+    if path:
+        server = await asyncio.start_unix_server(client, path)
+    else:
+        server = await asyncio.start_server(client, "127.0.0.1", port)
+    async with server:
+        await server.serve_forever()
+
+
+# Command line: JSON lines on stdin/stdout by default, or a local socket
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Route query service (JSON lines)")
+    where = parser.add_mutually_exclusive_group()
+    where.add_argument("--socket", metavar="PATH", help="listen on a Unix socket instead of stdin")
+    where.add_argument("--port", type=int, help="listen on 127.0.0.1:PORT instead of stdin")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per core)")
+    args = parser.parse_args(argv)
+
+    service = RouteService(args.workers)
+    try:
+        if args.socket or args.port:
+            asyncio.run(serve_socket(service, args.socket, args.port))
+        else:
+            asyncio.run(serve_stdio(service))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
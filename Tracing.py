@@ -0,0 +1,113 @@
+# Tracing for the search functions
+# Searches used to print every node they expanded, which made terminal I/O
+# the bottleneck. A Tracer decides how much of a search gets recorded:
+#   OFF      - nothing at all
+#   SUMMARY  - one event per search with its counters and run time
+#   SAMPLED  - the summary, plus every Nth expanded node
+#   FULL     - the summary, plus every expanded node
+# Events are JSON objects written one per line to a buffered sink, so a full
+# trace costs one write per few thousand nodes instead of one per node.
+#
+# Searches take an optional tracer and ask it for a node hook once, before
+# their loop. The hook is None below SAMPLED, so an untraced search pays a
+# single `if` per node:
+#
+#     on_node = tracer.node_hook("bfs") if tracer else None
+#     ...
+#     if on_node:
+#         on_node(nodes_explored, depth, state)
+#     ...
+#     if tracer:
+#         tracer.summary("bfs", nodes=nodes_explored, found=True)
+
+import json
+import sys
+import time
+
+OFF, SUMMARY, SAMPLED, FULL = range(4)
+LEVELS = {"off": OFF, "summary": SUMMARY, "sampled": SAMPLED, "full": FULL}
+
+
+class JsonLinesSink:
+    """
+    Collects events and writes them as JSON lines in batches.
+
+    target is an open text file or a path (opened for appending).
+    Nothing reaches the file until buffer_size events are pending,
+    flush() is called, or the sink is closed.
+    """
+
+    def __init__(self, target=None, buffer_size=4096):
+        self.owns_file = isinstance(target, str)
+        self.file = open(target, "a") if self.owns_file else (target or sys.stderr)
+        self.buffer_size = buffer_size
+        self.pending = []
+
+    def write(self, event):
+        self.pending.append(json.dumps(event, default=list))   # tuples/sets as lists
+        if len(self.pending) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            self.file.write("\n".join(self.pending) + "\n")
+            self.pending = []
+        self.file.flush()
+
+    def close(self):
+        self.flush()
+        if self.owns_file:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class Tracer:
+    """
+    Records search activity at one of the levels above.
+
+    level: OFF, SUMMARY, SAMPLED, FULL (or their names as strings)
+    every: sampling interval in nodes for SAMPLED
+    sink:  where events go; a JsonLinesSink on stderr by default
+    The summaries of every finished search are also kept in self.summaries.
+    """
+
+    def __init__(self, level=SUMMARY, every=1000, sink=None):
+        self.level = LEVELS[level] if isinstance(level, str) else level
+        self.every = every
+        self.sink = sink if sink is not None else JsonLinesSink()
+        self.summaries = []
+        self.started = {}
+
+    def node_hook(self, search):
+        """Return the per-node callback for a search, or None if nodes aren't traced."""
+        self.started[search] = time.perf_counter()
+        if self.level < SAMPLED:
+            return None
+        write = self.sink.write
+        if self.level == FULL:
+            def on_node(n, depth, state):
+                write({"event": "node", "search": search, "n": n, "depth": depth, "state": state})
+        else:
+            every = self.every
+            def on_node(n, depth, state):
+                if n % every == 0:
+                    write({"event": "node", "search": search, "n": n, "depth": depth, "state": state})
+        return on_node
+
+    def summary(self, search, **counters):
+        """Record the end of a search along with its counters."""
+        if self.level == OFF:
+            return
+        event = {"event": "summary", "search": search, **counters}
+        if search in self.started:
+            event["seconds"] = round(time.perf_counter() - self.started.pop(search), 6)
+        self.summaries.append(event)
+        self.sink.write(event)
+
+    def close(self):
+        self.sink.close()
@@ -1,4 +1,6 @@
 from collections import deque
+from GridMap import GridMap
+from RouteCache import MISS
 
 # City map
 city = [
@@ -9,109 +11,245 @@ city = [
     "......."
 ]
 
-ROWS, COLS = len(city), len(city[0])
 moves = [(0,1),(1,0),(0,-1),(-1,0)]  # Right, Down, Left, Up
 
-def find(symbol):
-    for r in range(ROWS):
-        for c in range(COLS):
-            if city[r][c] == symbol:
-                return (r,c)
+# The searches run on a GridMap (see GridMap.py): cells are flat indices
+# r*COLS+c and each cell's open neighbors come from a precomputed table, so
+# there are no bounds or wall checks in the loops. Positions handed back to
+# callers are still (row, col) tuples.
+def use_map(new_grid):
+    """Point every search in this module at another map"""
+    global grid, ROWS, COLS, start, restaurant, customer, start_i, restaurant_i, customer_i
+    grid = new_grid
+    ROWS, COLS = grid.rows, grid.cols
+    start_i, restaurant_i, customer_i = grid.find("S"), grid.find("R"), grid.find("C")
+    start, restaurant, customer = (None if i is None else grid.position(i)
+                                   for i in (start_i, restaurant_i, customer_i))
+
+def load_city(path):
+    """Load a map file (text, or binary from GridMap.save) and search on it"""
+    use_map(GridMap.load(path, moves))
+
+use_map(GridMap.from_rows(city, moves))
 
-start = find("S")
-restaurant = find("R")
-customer = find("C")
+def find(symbol):
+    i = grid.find(symbol)
+    return None if i is None else grid.position(i)
 
 def is_valid(r,c):
-    return 0 <= r < ROWS and 0 <= c < COLS and city[r][c] != "#"
+    return grid.is_valid(r,c)
+
+# Searches keep one parent pointer per (position, has_pizza) state instead of
+# carrying a copy of the path in every frontier entry; the path is rebuilt
+# once, from the goal state back to the start.
+def reconstruct_path(parent, state):
+    path = []
+    while state is not None:
+        path.append(divmod(state[0], COLS))
+        state = parent[state]
+    return path[::-1]
 
 # ---------------- BFS ----------------
-def bfs():
-    q = deque([(start, False, [start])])  # (position, has_pizza, path)
-    visited = set()
+def bfs(tracer=None, cache=None):
+    # cache: a RouteCache (see RouteCache.py) to answer repeated queries from
+    if cache is not None:
+        key = ("bfs", start_i, restaurant_i, customer_i)
+        path = cache.get(grid, key)
+        if path is MISS:
+            path = cache.put_path(grid, key, bfs(tracer), [start, restaurant, customer])
+        return None if path is None else list(path)
+    source = (start_i, False)
+    deltas, mask = grid.deltas, grid.mask
+    q = deque([(source, 0)])  # (state, depth)
+    parent = {source: None}  # state -> state it was first reached from
+    nodes = 0
+    on_node = tracer.node_hook("bfs") if tracer else None  # see Tracing.py
 
     while q:
-        pos, has_pizza, path = q.popleft()
+        state, depth = q.popleft()
+        pos, has_pizza = state
 
         # Goal condition
-        if pos == customer and has_pizza:
-            return path
+        if pos == customer_i and has_pizza:
+            if tracer:
+                tracer.summary("bfs", nodes=nodes, length=depth+1, found=True)
+            return reconstruct_path(parent, state)
 
-        if (pos,has_pizza) in visited:
-            continue
-        visited.add((pos,has_pizza))
+        nodes += 1
+        if on_node:
+            on_node(nodes, depth, state)
 
-        for dr,dc in moves:
-            nr,nc = pos[0]+dr, pos[1]+dc
-            if not is_valid(nr,nc):
-                continue
+        for d in deltas[mask[pos]]:  # Open neighbors only
+            nxt = pos + d
 
             new_has_pizza = has_pizza
-            if (nr,nc) == restaurant:
+            if nxt == restaurant_i:
                 new_has_pizza = True
 
-            q.append(((nr,nc), new_has_pizza, path+[(nr,nc)]))
+            new_state = (nxt, new_has_pizza)
+            if new_state not in parent:
+                parent[new_state] = state
+                q.append((new_state, depth+1))
+    if tracer:
+        tracer.summary("bfs", nodes=nodes, found=False)
     return None
 
+# ---------------- Bidirectional BFS ----------------
+# Grows a frontier from (start, no pizza) and one backwards from
+# (customer, has pizza), expanding a whole layer of the smaller one each
+# round, and joins the two parent chains where they meet.
+def predecessors(pos, has_pizza):
+    # States that can step into (pos, has_pizza): a neighbor with the same
+    # pizza flag, or, on the restaurant, a neighbor that didn't have it yet
+    for d in grid.deltas[grid.mask[pos]]:
+        if has_pizza or pos != restaurant_i:
+            yield (pos+d, has_pizza)
+        if has_pizza and pos == restaurant_i:
+            yield (pos+d, False)
+
+def successors(pos, has_pizza):
+    for d in grid.deltas[grid.mask[pos]]:
+        yield (pos+d, has_pizza or pos+d == restaurant_i)
+
+def bidirectional_bfs(tracer=None):
+    source, target = (start_i, False), (customer_i, True)
+    parents = ({source: None}, {target: None})  # state -> next state towards that side's root
+    depth = ({source: 0}, {target: 0})
+    frontiers = ([source], [target])
+    expand = (successors, predecessors)
+    best = (0, source) if source == target else None  # (cost, meeting state)
+    nodes = 0
+    on_node = tracer.node_hook("bidirectional_bfs") if tracer else None
+
+    while frontiers[0] and frontiers[1] and best is None:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        mine, other = parents[side], parents[1-side]
+        next_frontier = []
+        for state in frontiers[side]:
+            nodes += 1
+            if on_node:
+                on_node(nodes, depth[side][state], state)
+            for new_state in expand[side](*state):
+                if new_state in mine:
+                    continue
+                mine[new_state] = state
+                depth[side][new_state] = depth[side][state] + 1
+                next_frontier.append(new_state)
+                if new_state in other:  # Frontiers meet: keep the cheapest join in this layer
+                    cost = depth[side][new_state] + depth[1-side][new_state]
+                    if best is None or cost < best[0]:
+                        best = (cost, new_state)
+        frontiers[side][:] = next_frontier
+
+    if tracer:
+        tracer.summary("bidirectional_bfs", nodes=nodes, found=best is not None)
+    if best is None:
+        return None
+    meet = best[1]
+    path = []
+    state = meet
+    while state is not None:  # back to the start...
+        path.append(divmod(state[0], COLS))
+        state = parents[0][state]
+    path.reverse()
+    state = parents[1][meet]
+    while state is not None:  # ...and on to the customer
+        path.append(divmod(state[0], COLS))
+        state = parents[1][state]
+    return path
+
 # ---------------- DFS ----------------
-def dfs():
-    stack = [(start, False, [start])]
-    visited = set()
+def dfs(tracer=None):
+    # (state, state it was pushed from, depth); the parent is only fixed when
+    # the state is popped, so the search order is the same as before
+    stack = [((start_i, False), None, 0)]
+    parent = {}
+    deltas, mask = grid.deltas, grid.mask
+    nodes = 0
+    on_node = tracer.node_hook("dfs") if tracer else None
 
     while stack:
-        pos, has_pizza, path = stack.pop()
+        state, prev, depth = stack.pop()
+        if state in parent:
+            continue
+        parent[state] = prev
+        pos, has_pizza = state
 
-        if pos == customer and has_pizza:
-            return path
+        if pos == customer_i and has_pizza:
+            if tracer:
+                tracer.summary("dfs", nodes=nodes, length=depth+1, found=True)
+            return reconstruct_path(parent, state)
 
-        if (pos,has_pizza) in visited:
-            continue
-        visited.add((pos,has_pizza))
+        nodes += 1
+        if on_node:
+            on_node(nodes, depth, state)
 
-        for dr,dc in moves:
-            nr,nc = pos[0]+dr, pos[1]+dc
-            if not is_valid(nr,nc):
-                continue
+        for d in deltas[mask[pos]]:
+            nxt = pos + d
 
             new_has_pizza = has_pizza
-            if (nr,nc) == restaurant:
+            if nxt == restaurant_i:
                 new_has_pizza = True
 
-            stack.append(((nr,nc), new_has_pizza, path+[(nr,nc)]))
+            stack.append(((nxt, new_has_pizza), state, depth+1))
+    if tracer:
+        tracer.summary("dfs", nodes=nodes, found=False)
     return None
 
 # ---------------- Iterative Deepening ----------------
-def dls(pos, has_pizza, path, depth, visited):
-    if pos == customer and has_pizza:
-        return path
+# `pos` is a cell index. `path` is one list shared by the whole recursion:
+# each call appends its cell on the way down and removes it on the way back
+# up, and it is turned into (row, col) positions only when the customer is
+# reached. `visited` holds the states on the current path, so the search
+# never walks in a circle.
+def dls(pos, has_pizza, path, depth, visited, counter=None, on_node=None):
+    if pos == customer_i and has_pizza:
+        return [divmod(i, COLS) for i in path]
     if depth == 0:
         return None
 
     visited.add((pos,has_pizza))
+    if counter is not None:  # counter[0] counts expansions across the whole IDS run
+        counter[0] += 1
+        if on_node:
+            on_node(counter[0], len(path)-1, (pos,has_pizza))
 
-    for dr,dc in moves:
-        nr,nc = pos[0]+dr, pos[1]+dc
-        if not is_valid(nr,nc):
-            continue
+    for d in grid.deltas[grid.mask[pos]]:
+        nxt = pos + d
         new_has_pizza = has_pizza
-        if (nr,nc) == restaurant:
+        if nxt == restaurant_i:
             new_has_pizza = True
 
-        if (nr,nc,new_has_pizza) not in visited:
-            result = dls((nr,nc), new_has_pizza, path+[(nr,nc)], depth-1, visited)
+        if (nxt,new_has_pizza) not in visited:
+            path.append(nxt)
+            result = dls(nxt, new_has_pizza, path, depth-1, visited, counter, on_node)
+            path.pop()
             if result:
+                visited.discard((pos,has_pizza))
                 return result
+    visited.discard((pos,has_pizza))
     return None
 
-def ids(max_depth=50):
+def ids(max_depth=50, tracer=None):
+    counter = [0]
+    on_node = tracer.node_hook("ids") if tracer else None
     for depth in range(max_depth):
         visited = set()
-        result = dls(start, False, [start], depth, visited)
+        result = dls(start_i, False, [start_i], depth, visited, counter, on_node)
         if result:
+            if tracer:
+                tracer.summary("ids", nodes=counter[0], depth_limit=depth, length=len(result), found=True)
             return result
+    if tracer:
+        tracer.summary("ids", nodes=counter[0], found=False)
     return None
 
 # ---- Run All Searches ----
-print("BFS Path:", bfs())
-print("DFS Path:", dfs())
-print("IDS Path:", ids())
+def demo():
+    print("BFS Path:", bfs())
+    print("Bidirectional BFS Path:", bidirectional_bfs())
+    print("DFS Path:", dfs())
+    print("IDS Path:", ids())
+
+if __name__ == "__main__":
+    demo()
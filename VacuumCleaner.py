@@ -120,18 +120,22 @@ class VacuumAgent:
             print(f"Location is clean -> Moving {direction} from ({old_x}, {old_y}) to ({self.x}, {self.y})")
 
 # SIMULATION / PROGRAM DRIVER 
-env = environment(size=2)
-agent = VacuumAgent(env)
+def demo(size=2):
+    env = environment(size=size)
+    agent = VacuumAgent(env)
 
-print("Initial Environment:")
-env.display()
+    print("Initial Environment:")
+    env.display()
 
-steps = 0
+    steps = 0
 
-while not env.all_clean():
-    steps +=1
-    print(f"Step {steps+1}:")
-    agent.perceive_and_act()
-    env.display
+    while not env.all_clean():
+        steps +=1
+        print(f"Step {steps+1}:")
+        agent.perceive_and_act()
+        env.display
 
-print(f"All cells are clean after {steps} steps!")
+    print(f"All cells are clean after {steps} steps!")
+
+if __name__ == "__main__":
+    demo()
@@ -0,0 +1,101 @@
+# Command line for the search demos and tools
+# Importing any module of this repo only defines things; nothing runs, prints
+# or sleeps. The demos and tools run from here instead:
+#
+#   python . demo                      every demo, one after the other
+#   python . demo informed puzzle      just those demos
+#   python . route city.txt            delivery route on a map file
+#   python . puzzle --batch boards.txt sliding puzzle batch solver (8Puzzle.py)
+#   python . serve --socket /tmp/r.sock  route service (RouteService.py)
+#
+# Each command imports only the modules it needs, so e.g. NumPy is loaded
+# by the distance-field demo alone and the pattern databases only when a
+# puzzle search asks for them.
+
+import argparse
+import importlib
+import sys
+
+DEMOS = {
+    "activity1": "Activity1",
+    "uninformed": "UninformedSearch",
+    "informed": "InformedSearch",
+    "vacuum": "VacuumCleaner",
+    "puzzle": "EightPuzzle",
+    "distance-field": "DistanceField",
+    "multi-delivery": "MultiDelivery",
+    "csp": "ConstraintSolver",
+    "min-conflicts": "MinConflicts",
+    "hill-climbing": "HillClimbing",
+    "games": "GameSearch",
+    "parallel-games": "ParallelSearch",
+    "genetic": "GeneticAlgorithm",
+}
+ROUTE_SEARCHES = ("a_star", "jps", "bfs", "bidirectional", "dfs", "ids")
+TOOLS = {"puzzle": "EightPuzzle", "serve": "RouteService"}     # Commands with their own argparse
+
+
+def load(name):
+    """Import one of the repo's modules (8Puzzle.py is EightPuzzle, see EightPuzzle.py)."""
+    return importlib.import_module(name)
+
+
+def run_demos(names):
+    for name in names or DEMOS:
+        if len(names) != 1:
+            print(f"==== {name} ====")
+        load(DEMOS[name]).demo()
+
+
+def run_route(path, search, parser):
+    module = load("InformedSearch" if search in ("a_star", "jps") else "UninformedSearch")
+    try:
+        module.load_city(path)
+    except (OSError, ValueError) as e:
+        parser.error(f"can't load the map: {e}")
+    if None in (module.start_i, module.restaurant_i, module.customer_i):
+        parser.error(f"{path}: the map needs an S, an R and a C")
+    if search in ("a_star", "jps"):
+        route = module.a_star_pizza(method="jps" if search == "jps" else "a*")
+    else:
+        route = {"bfs": module.bfs, "bidirectional": module.bidirectional_bfs,
+                 "dfs": module.dfs, "ids": module.ids}[search]()
+    if route is None:
+        print("No route: the customer can't be reached with the pizza.")
+        return 1
+    print(f"{len(route) - 1} moves:", " ".join(f"{r},{c}" for r, c in route))
+    return 0
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in TOOLS:           # Hand everything else, --help too, to the tool
+        return load(TOOLS[argv[0]]).main(argv[1:]) or 0
+
+    parser = argparse.ArgumentParser(prog="python .", description="AI search demos and tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    demo = commands.add_parser("demo", help="run module demos")
+    demo.add_argument("names", nargs="*", metavar="NAME",
+                      help=f"any of {', '.join(DEMOS)} (default: all)")
+
+    route = commands.add_parser("route", help="pizza delivery route on a map file (S, R, C, #)")
+    route.add_argument("map", help="text map, or a binary map written by GridMap.save")
+    route.add_argument("--search", choices=ROUTE_SEARCHES, default="a_star")
+
+    commands.add_parser("puzzle", help="sliding puzzle solver (python . puzzle --help)")
+    commands.add_parser("serve", help="route service (python . serve --help)")
+
+    args = parser.parse_args(argv)
+    if args.command == "demo":
+        unknown = [name for name in args.names if name not in DEMOS]
+        if unknown:
+            parser.error(f"unknown demo {unknown[0]!r}, pick from {', '.join(DEMOS)}")
+        run_demos(args.names)
+    elif args.command == "route":
+        return run_route(args.map, args.search, route)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+# Shared test fixtures
+# Small random maps, and the slow, obvious answers the grid searches are
+# checked against on them: plain BFS for unit steps and plain Dijkstra for
+# weighted ones. Each module's own behavior is tested on hand-made maps in
+# its test file.
+
+import heapq
+import random
+from collections import deque
+
+import pytest
+
+from GridMap import GridMap
+
+MOVES = [(0, 1), (1, 0), (0, -1), (-1, 0)]      # Same order as the city searches
+
+
+def _random_rows(rng, rows, cols, walls, symbols="S", extra=None):
+    cells = [["#" if rng.random() < walls else "." for _ in range(cols)] for _ in range(rows)]
+    if extra:
+        for _ in range(rows * cols // 4):
+            r, c = rng.randrange(rows), rng.randrange(cols)
+            if cells[r][c] == ".":
+                cells[r][c] = extra
+    spots = rng.sample([(r, c) for r in range(rows) for c in range(cols)], len(symbols))
+    for symbol, (r, c) in zip(symbols, spots):
+        cells[r][c] = symbol
+    return ["".join(row) for row in cells]
+
+
+def _bfs(grid, source):
+    # Moves from source to every cell, by the map's characters alone
+    dist = {source: 0}
+    queue = deque([source])
+    while queue:
+        i = queue.popleft()
+        r, c = grid.position(i)
+        for dr, dc in MOVES:
+            if grid.is_valid(r + dr, c + dc):
+                j = grid.index(r + dr, c + dc)
+                if j not in dist:
+                    dist[j] = dist[i] + 1
+                    queue.append(j)
+    return dist
+
+
+def _dijkstra(grid, source, cost):
+    # Cheapest cost from source to every cell, paying cost(char) to step onto a cell
+    dist = {source: 0}
+    heap = [(0, source)]
+    while heap:
+        d, i = heapq.heappop(heap)
+        if d > dist[i]:
+            continue
+        r, c = grid.position(i)
+        for dr, dc in MOVES:
+            if grid.is_valid(r + dr, c + dc):
+                j = grid.index(r + dr, c + dc)
+                nd = d + cost(grid.char(r + dr, c + dc))
+                if nd < dist.get(j, nd + 1):
+                    dist[j] = nd
+                    heapq.heappush(heap, (nd, j))
+    return dist
+
+
+@pytest.fixture
+def rng():
+    return random.Random(20261018)
+
+
+@pytest.fixture
+def random_grid(rng):
+    """random_grid(rows, cols, walls, symbols="S", extra=None) -> GridMap with those symbols placed."""
+    def make(rows, cols, walls=0.25, symbols="S", extra=None):
+        return GridMap.from_rows(_random_rows(rng, rows, cols, walls, symbols, extra), MOVES)
+    return make
+
+
+@pytest.fixture
+def bfs():
+    """bfs(grid, source) -> {cell: moves} for every cell source reaches."""
+    return _bfs
+
+
+@pytest.fixture
+def dijkstra():
+    """dijkstra(grid, source, cost) -> {cell: cost}, cost(char) being the price of entering a cell."""
+    return _dijkstra
+
+
+def assert_walk(grid, path, start, goal):
+    """path is a list of neighboring open cells from start to goal."""
+    assert path[0] == start and path[-1] == goal
+    for a, b in zip(path, path[1:]):
+        (ar, ac), (br, bc) = grid.position(a), grid.position(b)
+        assert abs(ar - br) + abs(ac - bc) == 1
+        assert grid.is_open(b)
+
+
+@pytest.fixture
+def walk():
+    return assert_walk
+
+
+@pytest.fixture
+def informed():
+    """InformedSearch, with its own map put back after the test."""
+    import InformedSearch
+    grid = InformedSearch.grid
+    yield InformedSearch
+    InformedSearch.use_map(grid)
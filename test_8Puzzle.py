@@ -0,0 +1,242 @@
+# Sliding puzzle searches (8Puzzle.py, imported as EightPuzzle): the packed
+# encoding must round-trip and move tiles like the 2D boards did
+
+import random
+
+import pytest
+
+import EightPuzzle as P
+
+GOAL = [[1, 2, 3], [4, 5, 6], [7, 8, 0]]
+GOAL15 = [[1, 2, 3, 4], [5, 6, 7, 8], [9, 10, 11, 12], [13, 14, 15, 0]]
+
+
+def scramble(goal, moves, rng):
+    # A board moves random slides away from goal (so always solvable)
+    size = len(goal)
+    state = P.encode_board(goal)
+    for _ in range(moves):
+        state = rng.choice(P.successors(state, size))
+    return state
+
+
+def slide_2d(board, target):
+    # The old way: copy the board and swap the blank with the tile on target
+    size = len(board)
+    board = [row[:] for row in board]
+    br, bc = next((r, c) for r in range(size) for c in range(size) if board[r][c] == 0)
+    tr, tc = divmod(target, size)
+    board[br][bc], board[tr][tc] = board[tr][tc], 0
+    return board
+
+
+@pytest.mark.parametrize("goal", [GOAL, GOAL15])
+def test_packed_moves_match_2d_moves(goal):
+    rng = random.Random(1)
+    size = len(goal)
+    for _ in range(50):
+        state = scramble(goal, 30, rng)
+        board = P.decode_board(state, size)
+        assert P.encode_board(board) == state
+        assert P.find_blank(state, size) == next((r, c) for r in range(size) for c in range(size) if board[r][c] == 0)
+        for target in P.layout(size).neighbors[state >> P.layout(size).blank_shift]:
+            assert P.decode_board(P.slide(state, target, size), size) == slide_2d(board, target)
+
+
+def test_limited_searches_find_the_demo_goal(capsys):
+    start = [[1, 2, 3], [4, 0, 6], [7, 5, 8]]
+    assert P.bfs_limited(start, GOAL, max_depth=10)
+    assert P.dfs_limited(start, GOAL, max_depth=10)
+    assert "depth 2" in capsys.readouterr().out     # BFS finds the 2-move solution
+    assert not P.bfs_limited(start, GOAL, max_depth=1)
+
+
+def bfs_distance(start, goal, size=3):
+    # Plain BFS over packed states: the slow, obvious optimal move count
+    frontier, seen, depth = [start], {start}, 0
+    while frontier:
+        if goal in seen:
+            return depth
+        depth += 1
+        frontier = [new for state in frontier for new in P.successors(state, size) if new not in seen]
+        seen.update(frontier)
+    return None
+
+
+def test_distance_table_matches_bfs():
+    rng = random.Random(2)
+    goal = P.encode_board(GOAL)
+    for _ in range(20):
+        start = scramble(GOAL, rng.randrange(25), rng)
+        distance = P.table_distance(start, goal)
+        assert distance == bfs_distance(start, goal)
+        path = P.solve_with_table(start, goal)
+        assert path[0] == start and path[-1] == goal and len(path) - 1 == distance
+        assert all(b in P.successors(a) for a, b in zip(path, path[1:]))
+
+
+def test_unsolvable_starts_are_rejected_up_front():
+    swapped = [[2, 1, 3], [4, 5, 6], [7, 8, 0]]     # One swap flips the inversion parity
+    assert not P.is_solvable(swapped, GOAL)
+    assert P.table_distance(swapped, GOAL) is None and P.solve_with_table(swapped, GOAL) is None
+    assert not P.bfs_limited(swapped, GOAL)
+    swapped15 = [row[:] for row in GOAL15]
+    swapped15[0][:2] = [2, 1]
+    assert not P.is_solvable(swapped15, GOAL15)
+    assert P.is_solvable(scramble(GOAL15, 40, random.Random(3)), GOAL15, size=4)
+
+
+def test_distance_table_refuses_other_sizes():
+    start15 = scramble(GOAL15, 10, random.Random(4))
+    goal15 = P.encode_board(GOAL15)
+    with pytest.raises(ValueError, match="3x3"):
+        P.solve_with_table(P.decode_board(start15, 4), GOAL15)
+    with pytest.raises(ValueError, match="3x3"):
+        P.solve_with_table(start15, goal15, size=4)
+    with pytest.raises(ValueError, match="3x3"):
+        P.table_distance(start15, goal15)           # Packed, size not given
+    with pytest.raises(ValueError, match="3x3"):
+        P.load_distance_table(goal15)
+
+
+def assert_solution(result, start, goal, size, cost):
+    assert result.cost == cost and len(result.path) - 1 == cost
+    assert result.path[0] == start and result.path[-1] == goal
+    assert all(b in P.successors(a, size) for a, b in zip(result.path, result.path[1:]))
+
+
+@pytest.mark.parametrize("heuristic", ["misplaced", "manhattan", "linear_conflict"])
+def test_a_star_and_ida_star_are_optimal(heuristic):
+    rng = random.Random(5)
+    goal = P.encode_board(GOAL)
+    for _ in range(15):
+        start = scramble(GOAL, rng.randrange(30), rng)
+        cost = P.table_distance(start, goal)
+        assert_solution(P.a_star(start, goal, heuristic), start, goal, 3, cost)
+        assert_solution(P.ida_star(start, goal, heuristic), start, goal, 3, cost)
+
+
+@pytest.mark.parametrize("heuristic", ["misplaced", "manhattan", "linear_conflict"])
+def test_heuristics_are_admissible_and_update_incrementally(heuristic):
+    rng = random.Random(6)
+    goal = P.encode_board(GOAL)
+    h = P.make_heuristic(heuristic, goal, 3)
+    lay = P.layout(3)
+    assert h(goal) == 0
+    for _ in range(200):
+        state = scramble(GOAL, rng.randrange(40), rng)
+        assert h(state) <= P.table_distance(state, goal)
+        blank = state >> lay.blank_shift
+        for target in lay.neighbors[blank]:
+            new_state = P.slide(state, target)
+            tile = (state >> (lay.bits * target)) & lay.tile_bits
+            assert h.update(h(state), state, new_state, tile, target, blank) == h(new_state)
+
+
+def test_15_puzzle_solvers_agree():
+    rng = random.Random(7)
+    goal = P.encode_board(GOAL15)
+    for _ in range(6):
+        start = scramble(GOAL15, 14, rng)
+        cost = bfs_distance(start, goal, 4)
+        assert_solution(P.ida_star(start, goal, "linear_conflict", size=4), start, goal, 4, cost)
+        assert_solution(P.a_star(start, goal, "manhattan", size=4), start, goal, 4, cost)
+
+
+def test_pattern_databases_are_admissible_and_dominate_manhattan(tmp_path, monkeypatch):
+    monkeypatch.setattr(P, "TABLE_DIR", str(tmp_path))     # Build fresh tables
+    rng = random.Random(8)
+    goal = P.encode_board(GOAL)
+    pdb, manhattan = P.PatternDatabase(goal, size=3), P.Manhattan(goal)
+    lay = P.layout(3)
+    for _ in range(200):
+        state = scramble(GOAL, rng.randrange(40), rng)
+        assert manhattan(state) <= pdb(state) <= P.table_distance(state, goal)
+        blank = state >> lay.blank_shift
+        target = lay.neighbors[blank][0]
+        tile = (state >> (lay.bits * target)) & lay.tile_bits
+        assert pdb.update(pdb(state), state, P.slide(state, target), tile, target, blank) == pdb(P.slide(state, target))
+    assert len(list(tmp_path.glob("pdb3x3_*.pdb"))) == 2
+
+
+def test_pattern_database_on_the_15_puzzle(tmp_path, monkeypatch):
+    monkeypatch.setattr(P, "TABLE_DIR", str(tmp_path))
+    rng = random.Random(9)
+    goal = P.encode_board(GOAL15)
+    pdb = P.PatternDatabase(goal, size=4, partition=[(1, 2, 5), (3, 4, 8)])   # Small, quick to build
+    for _ in range(5):
+        start = scramble(GOAL15, 12, rng)
+        cost = bfs_distance(start, goal, 4)
+        assert pdb(start) <= cost
+        assert_solution(P.ida_star(start, goal, pdb, size=4), start, goal, 4, cost)
+
+
+def test_pattern_database_partitions_are_checked():
+    with pytest.raises(ValueError):
+        P.PatternDatabase(GOAL, size=3, partition=[(1, 2), (2, 3)])     # Tile 2 twice
+    with pytest.raises(ValueError):
+        P.PatternDatabase(GOAL, size=3, partition=[(1, 9)])             # No tile 9 on a 3x3 board
+    with pytest.raises(ValueError):
+        P.PatternDatabase(P.parse_board(" ".join(map(str, range(1, 25))) + " 0"), size=5)   # No default for 5x5
+
+
+def test_bidirectional_bfs_is_optimal():
+    rng = random.Random(10)
+    goal = P.encode_board(GOAL)
+    for _ in range(20):
+        start = scramble(GOAL, rng.randrange(30), rng)
+        assert_solution(P.bidirectional_bfs(start, goal), start, goal, 3, P.table_distance(start, goal))
+    start15 = scramble(GOAL15, 12, rng)
+    goal15 = P.encode_board(GOAL15)
+    assert_solution(P.bidirectional_bfs(start15, goal15, size=4), start15, goal15, 4, bfs_distance(start15, goal15, 4))
+    assert P.bidirectional_bfs([[2, 1, 3], [4, 5, 6], [7, 8, 0]], GOAL) is None
+
+
+@pytest.mark.parametrize("method", P.BATCH_METHODS)
+def test_batch_results_match_serial_solves(method):
+    rng = random.Random(11)
+    goal = P.encode_board(GOAL)
+    starts = [scramble(GOAL, rng.randrange(20), rng) for _ in range(40)]
+    starts.append(P.encode_board([[2, 1, 3], [4, 5, 6], [7, 8, 0]]))
+    results = list(P.solve_batch(starts, GOAL, method=method, workers=2, chunksize=3))
+    assert len(results) == len(starts)
+    for start, result in zip(starts, results):
+        cost = P.table_distance(start, goal)
+        if cost is None:
+            assert result is None
+        else:
+            assert_solution(result, start, goal, 3, cost)
+
+
+def test_batch_refuses_boards_it_cant_solve():
+    with pytest.raises(ValueError, match="3x3"):
+        next(P.solve_batch([GOAL15], GOAL15, method="table", workers=1))
+    with pytest.raises(ValueError, match="4x4"):
+        next(P.solve_batch([GOAL15], GOAL, workers=1))
+
+
+def run_main(tmp_path, lines, *args):
+    boards = tmp_path / "boards.txt"
+    boards.write_text("".join(line + "\n" for line in lines))
+    return P.main(["--batch", str(boards), "--workers", "1", *args])
+
+
+def test_batch_cli_solves_a_file(tmp_path, capsys):
+    run_main(tmp_path, ["1 2 3 4 0 6 7 5 8", "", "8 1 2 0 4 3 7 6 5"], "--method", "table")
+    assert capsys.readouterr().out == "2 2\nunsolvable\n"
+    run_main(tmp_path, ["1 2 3 4 5 6 7 8 9 10 11 12 13 14 0 15"])
+    assert capsys.readouterr().out.split()[0] == "1"
+
+
+@pytest.mark.parametrize("lines, args, message", [
+    (["1 2 3 4 5 6 7 8 9 10 11 12 13 14 0 15"], ["--method", "table"], "only solves 3x3"),
+    (["1 2 3 4 0 6 7 5 8", "1 2 3"], [], "line 2: not a square"),
+    (["1 2 3 4 0 6 7 5 8", "", "1 2 3 4 5 6 7 8 9 10 11 12 13 14 0 15"], [], "line 3: a 4x4 board"),
+    (["1 2 3 4 0 6 7 5 8"], ["--goal", "1 2 3"], "--goal"),
+])
+def test_batch_cli_reports_bad_input_as_usage_errors(tmp_path, capsys, lines, args, message):
+    with pytest.raises(SystemExit) as exit:
+        run_main(tmp_path, lines, *args)
+    assert exit.value.code == 2
+    captured = capsys.readouterr()
+    assert message in captured.err and not captured.out
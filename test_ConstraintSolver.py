@@ -0,0 +1,101 @@
+# The solver must find a coloring exactly when one exists, whatever the
+# inference, value ordering and restart settings; small instances are
+# checked against trying every assignment
+
+import itertools
+import random
+
+import pytest
+
+import ConstraintSolver
+from ConstraintSolver import CSP, load_dimacs, luby
+
+
+def random_csp(rng):
+    n, k = rng.randrange(1, 8), rng.randrange(1, 5)
+    density = rng.random()
+    neighbors = {v: [u for u in range(v) if rng.random() < density] for v in range(n)}
+    domains = {v: rng.sample(range(k), rng.randrange(1, k + 1)) for v in range(n) if rng.random() < 0.3}
+    return neighbors, k, domains
+
+
+def brute_force(neighbors, k, domains):
+    n = len(neighbors)
+    options = [domains.get(v, range(k)) for v in range(n)]
+    for values in itertools.product(*options):
+        if all(values[u] != values[v] for v in neighbors for u in neighbors[v]):
+            return dict(enumerate(values))
+    return None
+
+
+@pytest.mark.parametrize("inference, lcv, restarts", [
+    ("fc", False, False), ("fc", True, True), ("mac", False, True), ("mac", True, False),
+])
+def test_solve_agrees_with_brute_force(rng, monkeypatch, inference, lcv, restarts):
+    monkeypatch.setattr(ConstraintSolver, "RESTART_BASE", 1)   # Restart, learn and walk a lot
+    monkeypatch.setattr(ConstraintSolver, "WALK_STEPS", 1)
+    restarted = 0
+    for _ in range(300):
+        neighbors, k, domains = random_csp(rng)
+        csp = CSP(neighbors, k, domains)
+        solution = csp.solve(inference=inference, lcv=lcv, restarts=restarts, seed=rng.random())
+        expected = brute_force(neighbors, k, domains)
+        if expected is None:
+            assert solution is None
+        else:
+            assert csp.is_solution(solution)
+        restarted += csp.restarts
+    assert (restarted > 0) == restarts
+
+
+@pytest.mark.parametrize("inference", ["fc", "mac"])
+def test_unsolvable_instances_fail_at_level_zero(inference):
+    clique = {v: list(range(v)) for v in range(6)}
+    csp = CSP(clique, 5)
+    assert csp.solve(inference=inference, seed=1) is None
+    assert csp.backtracks > 0 and csp.learned > 0
+    odd_cycle = {v: [(v + 1) % 7] for v in range(7)}
+    assert CSP(odd_cycle, 2).solve(inference=inference) is None
+    assert CSP(odd_cycle, 3).solve(inference=inference) is not None
+
+
+def test_names_values_and_domains():
+    from Activity1 import colors, neighbors
+    csp = CSP(neighbors, colors)
+    solution = csp.solve(seed=3)
+    assert csp.is_solution(solution) and set(solution) == set(neighbors)
+    assert set(solution.values()) <= set(colors)
+    csp = CSP({"a": ["b"], "c": []}, ["red", "green"], domains={"b": ["red"]})
+    assert csp.names == ["a", "c", "b"] and csp.edges() == 1
+    solution = csp.solve()
+    assert (solution["a"], solution["b"]) == ("green", "red")
+    assert not csp.is_solution({"a": "red", "b": "red", "c": "red"})
+    assert not csp.is_solution({"a": "green", "b": "green", "c": "red"})    # b only allows red
+    with pytest.raises(ValueError):
+        csp.solve(inference="ac-4")
+
+
+def test_large_colorable_graph():
+    rng = random.Random(5)
+    n, k = 600, 4
+    hidden = [rng.randrange(k) for _ in range(n)]
+    graph = {v: [] for v in range(n)}
+    for _ in range(4 * n):
+        u, v = rng.randrange(n), rng.randrange(n)
+        if hidden[u] != hidden[v]:
+            graph[u].append(v)
+    csp = CSP(graph, k)
+    assert csp.is_solution(csp.solve(seed=2))
+
+
+def test_luby_sequence():
+    assert [luby(i) for i in range(1, 16)] == [1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8]
+
+
+def test_load_dimacs(tmp_path):
+    path = tmp_path / "triangle.col"
+    path.write_text("c a triangle and a loner\np edge 4 3\ne 1 2\ne 2 3\ne 3 1\n")
+    csp = load_dimacs(path, 3)
+    assert len(csp) == 4 and csp.edges() == 3
+    assert csp.is_solution(csp.solve())
+    assert load_dimacs(path, 2).solve() is None
@@ -0,0 +1,122 @@
+# D* Lite must repair its plan after each closure, opening and courier move
+# to exactly what a fresh search would find, while redoing only the part of
+# the earlier search the change reaches
+
+from collections import deque
+
+from DStarLite import DStarLite
+from GridMap import GridMap
+
+MOVES = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+# Two ways from S to C: 5 moves along the top, 9 round the bottom
+TWO_ROUTES = ["S....C",
+              ".####.",
+              "......"]
+
+
+def test_repairs_follow_several_edits():
+    grid = GridMap.from_rows(TWO_ROUTES, MOVES)
+    planner = DStarLite(grid, 0, 5)
+    assert planner.plan() == 5 and planner.path() == [0, 1, 2, 3, 4, 5]
+    assert planner.set_cells([(0, 3, "#")]) == 9
+    assert planner.path() == [0, 6, 12, 13, 14, 15, 16, 17, 11, 5]
+    assert planner.set_cells([(2, 2, "#")]) is None and planner.path() is None
+    assert planner.set_cells([(0, 3, ".")]) == 5 and planner.path() == [0, 1, 2, 3, 4, 5]
+    assert planner.close_edge(2, 3) is None             # The top again, as an edge this time
+    planner.move_to(1)
+    assert planner.plan() is None
+    assert planner.open_edge(2, 3) == 4 and planner.path() == [1, 2, 3, 4, 5]
+    assert grid.char(2, 2) == "#"                       # set_cells edits the map itself
+
+
+def test_far_away_edits_cost_a_few_expansions():
+    grid = GridMap.from_rows(["." * 30] * 30, MOVES)
+    planner = DStarLite(grid, 0, 30 * 30 - 1)
+    planner.plan()
+    fresh = planner.expanded
+    for c in range(5):                                  # Five separate closures in a far corner
+        planner.set_cells([(29, c, "#")])
+    assert planner.distance() == 58
+    assert planner.expanded - fresh <= 10 < fresh
+
+
+def bfs_without(grid, source, closed_edges):
+    # BFS distances over the grid's open neighbors, minus the closed edges
+    dist = {source: 0}
+    queue = deque([source])
+    while queue:
+        i = queue.popleft()
+        for j in grid.neighbors(i):
+            if j not in dist and (min(i, j), max(i, j)) not in closed_edges:
+                dist[j] = dist[i] + 1
+                queue.append(j)
+    return dist
+
+
+def check(planner, grid, closed_edges, walk):
+    expected = bfs_without(grid, planner.goal, closed_edges).get(planner.start)
+    assert planner.distance() == expected
+    path = planner.path()
+    if expected is None:
+        assert path is None
+    else:
+        walk(grid, path, planner.start, planner.goal)
+        assert len(path) - 1 == expected
+        for a, b in zip(path, path[1:]):
+            assert (min(a, b), max(a, b)) not in closed_edges
+    return path
+
+
+def test_repairs_match_bfs(random_grid, walk, rng):
+    for _ in range(60):
+        grid = random_grid(rng.randrange(2, 12), rng.randrange(2, 12), 0.2, symbols="SC")
+        start, goal = grid.find("S"), grid.find("C")
+        planner = DStarLite(grid, start, goal)
+        planner.plan()
+        closed_edges = set()
+        path = check(planner, grid, closed_edges, walk)
+        for _ in range(30):
+            event = rng.random()
+            if event < 0.5:
+                # Close or open a few roads, never under the courier or the goal
+                changes = []
+                for _ in range(rng.randrange(1, 4)):
+                    r, c = rng.randrange(grid.rows), rng.randrange(grid.cols)
+                    if grid.index(r, c) not in (planner.start, goal):
+                        changes.append((r, c, "#" if rng.random() < 0.6 else "."))
+                planner.set_cells(changes)
+            elif event < 0.7:
+                i = rng.randrange(grid.rows * grid.cols)
+                around = grid.around(i)
+                j = rng.choice(around) if around else i
+                if i != j:
+                    edge = (min(i, j), max(i, j))
+                    if edge in closed_edges:
+                        closed_edges.discard(edge)
+                        planner.open_edge(i, j)
+                    else:
+                        closed_edges.add(edge)
+                        planner.close_edge(i, j)
+            elif path and len(path) > 1:
+                planner.move_to(path[1])
+            path = check(planner, grid, closed_edges, walk)
+            if planner.start == goal:
+                break
+
+
+def test_delivery_detours_around_a_closure(informed):
+    informed.use_map(GridMap.from_rows(["S.R..C",
+                                        ".####.",
+                                        "......"], informed.moves))
+    # Closed just as the courier picks up the pizza: back out and round the bottom
+    steps = list(informed.deliver_with_closures({2: [(0, 4)]}))
+    assert steps == [(0, 0), (0, 1), (0, 2), (0, 1), (0, 0), (1, 0),
+                     (2, 0), (2, 1), (2, 2), (2, 3), (2, 4), (2, 5), (1, 5), (0, 5)]
+
+
+def test_delivery_stops_when_cut_off(informed):
+    informed.use_map(GridMap.from_rows(["S.R..C",
+                                        ".####.",
+                                        "......"], informed.moves))
+    steps = list(informed.deliver_with_closures({3: [(0, 4), (2, 3)]}))
+    assert steps == [(0, 0), (0, 1), (0, 2), (0, 3)]
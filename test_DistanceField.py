@@ -0,0 +1,44 @@
+# The wavefront distance fields must hold the BFS distance of every cell,
+# and walking downhill on them must give shortest routes
+
+import numpy as np
+
+from DistanceField import UNREACHABLE, delivery_fields, delivery_route, distance_field, follow_field
+from GridMap import GridMap
+
+MOVES = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+
+
+def test_fields_match_bfs_from_several_sources(random_grid, bfs, rng):
+    for _ in range(60):
+        grid = random_grid(rng.randrange(1, 15), rng.randrange(1, 15), 0.3, symbols="")
+        cells = rng.sample(range(grid.rows * grid.cols), rng.randrange(1, 4))
+        field = distance_field(grid, [grid.position(i) for i in cells])
+        assert field.shape == (grid.rows, grid.cols) and field.dtype == np.int32
+        nearest = {}
+        for source in cells:
+            if grid.is_open(source):                # A source on a wall reaches nothing
+                for i, d in bfs(grid, source).items():
+                    nearest[i] = min(d, nearest.get(i, d))
+        for i in range(grid.rows * grid.cols):
+            assert field.flat[i] == nearest.get(i, UNREACHABLE)
+            if i in nearest:
+                path = follow_field(grid, field, grid.position(i))
+                assert len(path) - 1 == nearest[i] and grid.index(*path[-1]) in cells
+            else:
+                assert follow_field(grid, field, grid.position(i)) is None
+
+
+def test_delivery_route_picks_up_first():
+    grid = GridMap.from_rows(["S.#C",
+                              "..#.",
+                              "R..."], MOVES)
+    start, restaurant, customer = (0, 0), (2, 0), (0, 3)
+    to_restaurant, to_customer, delivery = delivery_fields(grid, restaurant, customer)
+    assert delivery[start] == 2 + 5 and delivery[customer] == 5 + 5
+    route = delivery_route(grid, start, restaurant, customer)
+    assert route[0] == start and route[2] == restaurant and route[-1] == customer
+    assert len(route) - 1 == delivery[start]
+    walled = GridMap.from_rows(["S.#C", "..#.", "R.#."], MOVES)
+    assert (delivery_fields(walled, restaurant, customer)[2] == UNREACHABLE).all()
+    assert delivery_route(walled, start, restaurant, customer) is None
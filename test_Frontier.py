@@ -0,0 +1,100 @@
+# Both frontiers pop the lowest f and, among equal f, the highest g; the
+# bucket queue must do so while walking its f values forward (and back,
+# when a lower f turns up). A* on either one must find the cheapest route.
+
+import pytest
+
+from Frontier import BucketFrontier, HeapFrontier, cell_costs, make_frontier
+from GridMap import GridMap
+
+
+@pytest.mark.parametrize("frontier", [HeapFrontier, BucketFrontier])
+def test_ties_on_f_go_to_the_deeper_entry(frontier):
+    queue = frontier()
+    for f, g, item in [(5, 1, 1), (5, 3, 2), (7, 7, 3), (5, 2, 4), (4, 0, 5)]:
+        queue.push(f, g, item)
+    assert [queue.pop() for _ in range(4)] == [(4, 0, 5), (5, 3, 2), (5, 2, 4), (5, 1, 1)]
+    queue.push(2, 1, 6)                 # Below everything popped so far
+    queue.push(7, 9, 7)
+    assert [queue.pop() for _ in range(3)] == [(2, 1, 6), (7, 9, 7), (7, 7, 3)]
+    assert not queue
+    with pytest.raises(IndexError):
+        queue.pop()
+
+
+def test_bucket_frontier_keeps_equal_entries_apart():
+    queue = BucketFrontier()
+    for item in range(5):
+        queue.push(3, 1, item)
+    queue.push(3, 2, "deeper")
+    assert queue.pop() == (3, 2, "deeper")
+    assert sorted(queue.pop()[2] for _ in range(5)) == list(range(5))
+    assert len(queue) == 0
+
+
+def test_frontiers_pop_in_the_same_order(rng):
+    for _ in range(50):
+        heap, bucket = HeapFrontier(), BucketFrontier()
+        popped = {"heap": [], "bucket": []}
+        for item in range(200):
+            if rng.random() < 0.6 or not heap:
+                f = rng.randrange(30)
+                g = rng.randrange(f + 1)
+                heap.push(f, g, item)
+                bucket.push(f, g, item)
+            else:
+                popped["heap"].append(heap.pop()[:2])
+                popped["bucket"].append(bucket.pop()[:2])
+        while heap:
+            popped["heap"].append(heap.pop()[:2])
+            popped["bucket"].append(bucket.pop()[:2])
+        assert not bucket
+        assert popped["heap"] == popped["bucket"]
+
+
+def test_frontier_choice_and_step_costs():
+    assert isinstance(make_frontier(None), HeapFrontier)
+    assert isinstance(make_frontier("bucket"), BucketFrontier)
+    with pytest.raises(ValueError):
+        make_frontier("bucket", integer_costs=False)
+    with pytest.raises(ValueError):
+        make_frontier("fibonacci")
+    grid = GridMap.from_rows(["~~#", "~~~"], [(0, 1)])
+    table, cheapest, integer = cell_costs(grid, {"~": 3})
+    assert table[ord("~")] == 3 and table[ord(".")] == 1
+    assert (cheapest, integer) == (3, True)         # No '.' on the map: every step costs 3
+    assert cell_costs(grid, {"~": 2.5})[1:] == (2.5, False)
+    with pytest.raises(ValueError):
+        cell_costs(grid, {"~": 0})
+
+
+@pytest.mark.parametrize("frontier", ["heap", "bucket"])
+def test_activity1_a_star_goes_around_slow_roads(monkeypatch, frontier):
+    import Activity1
+    grid = GridMap.from_rows(["S~~~G",
+                              "....."], Activity1.directions)
+    monkeypatch.setattr(Activity1, "grid", grid)
+    monkeypatch.setattr(Activity1, "cols", grid.cols)
+    straight = Activity1.a_star((0, 0), (0, 4), frontier=frontier)
+    assert straight == [(0, c) for c in range(5)]
+    detour = Activity1.a_star((0, 0), (0, 4), frontier=frontier, costs={"~": 3})
+    assert detour == [(0, 0)] + [(1, c) for c in range(5)] + [(0, 4)]
+
+
+@pytest.mark.parametrize("frontier, costs", [("heap", None), ("bucket", None), ("heap", {"~": 3}),
+                                             ("bucket", {"~": 3}), ("heap", {"~": 2.5})])
+def test_a_star_pizza_matches_dijkstra(informed, random_grid, dijkstra, rng, frontier, costs):
+    for _ in range(80):
+        grid = random_grid(rng.randrange(2, 12), rng.randrange(2, 12), 0.25, symbols="SRC", extra="~")
+        informed.use_map(grid)
+        table = cell_costs(grid, costs)[0]
+        cost = lambda ch: table[ord(ch)]
+        to_restaurant = dijkstra(grid, informed.start_i, cost).get(informed.restaurant_i)
+        to_customer = dijkstra(grid, informed.restaurant_i, cost).get(informed.customer_i)
+        path = informed.a_star_pizza(frontier=frontier, costs=costs)
+        if to_restaurant is None or to_customer is None:
+            assert path is None
+            continue
+        assert path[0] == informed.start and path[-1] == informed.customer
+        assert informed.restaurant in path
+        assert sum(cost(grid.char(r, c)) for r, c in path[1:]) == pytest.approx(to_restaurant + to_customer)
@@ -0,0 +1,97 @@
+# The engine's scores must be the exact game values that a plain negamax
+# over the whole tree finds, whatever the pruning, move ordering, table
+# size and symmetry merging; Tic-Tac-Toe is a draw
+
+import pytest
+
+from GameSearch import WIN, ConnectFour, Engine, TicTacToe, describe
+
+
+def exact(game, state, memo):
+    # Negamax over every move to the end of the game, no pruning
+    result = game.result(state)
+    if result is not None:
+        return result
+    key = state[:2]
+    if key not in memo:
+        memo[key] = max(-exact(game, game.play(state, move), memo) for move in game.moves(state))
+    return memo[key]
+
+
+def random_position(game, rng, stones):
+    # A position after `stones` random moves (fewer if the board is full) that isn't over yet
+    while True:
+        state, played = game.start(), 0
+        while played < stones and game.result(state) is None:
+            state = game.play(state, rng.choice(game.moves(state)))
+            played += 1
+        if game.result(state) is None:
+            return state
+
+
+@pytest.mark.parametrize("game, stones", [
+    (TicTacToe(), range(0, 6)), (TicTacToe(symmetries=False), range(0, 6)),
+    (ConnectFour(3, 4), range(0, 8)), (ConnectFour(4, 4), range(5, 12)),
+], ids=["tic_tac_toe", "no_symmetries", "connect_four_3x4", "connect_four_4x4"])
+@pytest.mark.parametrize("table_bits", [2, 12])
+def test_scores_match_exhaustive_negamax(rng, game, stones, table_bits):
+    memo = {}
+    engine = Engine(game, table_bits=table_bits)       # Kept between searches, as in play
+    for _ in range(25):
+        state = random_position(game, rng, rng.choice(stones))
+        move, score = engine.search(state)
+        assert score == exact(game, state, memo)
+        assert -exact(game, game.play(state, move), memo) == score     # The move gets that score
+
+
+def test_tic_tac_toe_is_a_draw():
+    game = TicTacToe()
+    engine = Engine(game)
+    assert engine.search(game.start())[1] == 0
+    assert engine.search(game.after([0, 4, 8, 2]))[0] == 6            # Block, or lose
+    move, score = engine.search(game.after([4, 0, 1]))
+    assert move == 7 and score == 0
+    move, score = engine.search(game.after([0, 3, 1, 4]))
+    assert move == 2 and score == WIN - 5                               # Win with the fifth stone
+    assert describe(score) == "win with stone 5"
+
+
+def test_symmetries_merge_mirrored_positions():
+    with_images, without = Engine(TicTacToe()), Engine(TicTacToe(symmetries=False))
+    with_images.search(with_images.game.start())
+    without.search(without.game.start())
+    assert with_images.nodes < without.nodes
+    game = TicTacToe()
+    corners = [game.key(game.after([cell])) for cell in (0, 2, 6, 8)]
+    edges = [game.key(game.after([cell])) for cell in (1, 3, 5, 7)]
+    assert len(set(corners)) == len(set(edges)) == 1 and corners[0] != edges[0]
+
+
+def test_connect_four_lines():
+    game = ConnectFour()
+    assert game.result(game.after([0, 1, 0, 1, 0, 1, 0])) == 7 - WIN              # Vertical
+    assert game.result(game.after([0, 0, 1, 1, 2, 2, 3])) == 7 - WIN              # Horizontal
+    assert game.result(game.after([0, 1, 1, 2, 2, 3, 2, 3, 3, 6, 3])) == 11 - WIN  # Diagonal
+    assert game.result(game.after([0, 0, 0, 1, 1, 1, 2, 2])) is None
+    assert game.aligned(0b1111) and game.aligned(1 | 1 << 7 | 1 << 14 | 1 << 21)
+    assert not game.aligned(0b111 << 3 | 1 << 7)        # The top of column 0 doesn't run into column 1
+    full = ConnectFour(2, 2).after([0, 1, 1, 0])
+    assert ConnectFour(2, 2).result(full) == 0 and ConnectFour(2, 2).moves(full) == []
+
+
+def test_connect_four_takes_a_win_and_blocks_one():
+    game = ConnectFour()
+    engine = Engine(game)
+    move, score = engine.search(game.after([3, 4, 3, 4, 3]), max_depth=4)
+    assert move == 3                                    # Block the vertical three
+    move, score = engine.search(game.after([3, 4, 3, 4, 3, 5]), max_depth=2)
+    assert move == 3 and score == WIN - 7
+
+
+def test_time_limit_and_finished_games():
+    game = ConnectFour()
+    engine = Engine(game)
+    move, _ = engine.search(game.start(), time_limit=0.05)
+    assert move in game.moves(game.start()) and engine.depth >= 1
+    over = game.after([0, 1, 0, 1, 0, 1, 0])
+    assert engine.search(over) == (None, 7 - WIN)
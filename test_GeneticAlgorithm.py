@@ -0,0 +1,115 @@
+# The bit-array operators must do to the packed rows what they promise bit
+# by bit (crossover only trades bits within a pair, mutation flips at its
+# rates, the bits past the end stay 0), and evolution must keep its elite
+# and reach easy targets
+
+import numpy as np
+import pytest
+
+from GeneticAlgorithm import GeneticAlgorithm, count_ones, to_int, to_real
+
+
+def ones(genomes):
+    return genomes.sum(axis=1)
+
+
+def test_bit_helpers(rng):
+    values = [rng.getrandbits(20) for _ in range(50)]
+    genomes = np.array([[v >> (19 - b) & 1 for b in range(20)] for v in values], dtype=bool)
+    assert to_int(genomes).tolist() == values
+    assert to_real(genomes, -1.0, 1.0).tolist() == pytest.approx([-1 + 2 * v / (2**20 - 1) for v in values])
+    packed = np.packbits(genomes, axis=1)
+    assert count_ones(packed).tolist() == [bin(v).count("1") for v in values]
+
+
+@pytest.mark.parametrize("crossover", ["uniform", "k-point"])
+def test_crossover_only_trades_bits_within_a_pair(crossover):
+    ga = GeneticAlgorithm(ones, bits=21, size=400, crossover=crossover, points=3, seed=1)
+    first, second = ga.population[:200].copy(), ga.population[200:].copy()
+    a, b = ga.unpack(first), ga.unpack(second)
+    ga.cross(first, second)
+    x, y = ga.unpack(first), ga.unpack(second)
+    assert np.array_equal(x ^ y, a ^ b) and np.array_equal(x & y, a & b)
+    assert not np.array_equal(x, a)
+    if crossover == "k-point":
+        # Where the parents differ, a child switches parent at most once per cut
+        for row in range(200):
+            columns = np.flatnonzero(a[row] != b[row])
+            from_a = x[row, columns] == a[row, columns]
+            assert np.count_nonzero(from_a[1:] != from_a[:-1]) <= 3
+    assert not (first[:, -1] & 0b111).any() and not (second[:, -1] & 0b111).any()   # Padding stays 0
+
+
+def test_no_crossover_at_rate_zero():
+    ga = GeneticAlgorithm(ones, bits=30, size=100, crossover_rate=0.0, seed=2)
+    first, second = ga.population[:50].copy(), ga.population[50:].copy()
+    ga.cross(first, second)
+    assert np.array_equal(first, ga.population[:50]) and np.array_equal(second, ga.population[50:])
+
+
+def test_mutation_rates_are_per_bit():
+    rates = np.linspace(0.0, 1.0, 11)
+    ga = GeneticAlgorithm(ones, bits=11, size=20_000, mutation=rates, seed=3)
+    before = ga.genomes().copy()
+    ga.mutate(ga.population)
+    flipped = (ga.genomes() != before).mean(axis=0)
+    assert flipped[0] == 0 and flipped[-1] == 1
+    np.testing.assert_allclose(flipped, rates, atol=0.02)
+    assert not (ga.population[:, -1] & 0b11111).any()
+
+
+def test_selection_prefers_the_fit():
+    ga = GeneticAlgorithm(ones, bits=40, size=1000, seed=4)
+    ga.values = ga.evaluate(ga.population)
+    picked = ga.select(5000)
+    assert ga.values[picked].mean() > ga.values.mean() + 1
+    ga = GeneticAlgorithm(ones, bits=40, size=1000, selection="roulette", seed=4)
+    ga.values = np.arange(1000, dtype=float)
+    picked = ga.select(20_000)
+    assert 0 not in picked                          # The least fit gets no share of the wheel
+    assert ga.values[picked].mean() == pytest.approx(666, rel=0.02)
+    ga.values = np.ones(1000)
+    assert len(np.unique(ga.select(5000))) > 900    # All equal: anyone
+
+
+def test_elite_survive_and_values_stay_current():
+    ga = GeneticAlgorithm(ones, bits=64, size=500, elite=10, mutation=0.2, seed=5)
+    ga.run(generations=1)
+    for _ in range(15):
+        best = ga.values.max()
+        ga.step()
+        assert ga.values.max() >= best
+        np.testing.assert_array_equal(ga.values, ones(ga.genomes()))
+    assert ga.evaluations == 500 + 16 * 490 and ga.generations == 16
+
+
+def test_onemax_reaches_its_target():
+    ga = GeneticAlgorithm(count_ones, bits=100, size=2000, packed=True, seed=6)
+    genome, value = ga.run(generations=300, target=100)
+    assert value == 100 and genome.all() and ga.generations < 300
+
+
+def test_stopping_rules():
+    flat = GeneticAlgorithm(lambda genomes: np.zeros(len(genomes)), bits=8, size=50, seed=7)
+    flat.run(generations=100, patience=5)
+    assert flat.generations == 5
+    slow = GeneticAlgorithm(ones, bits=8, size=50, seed=7)
+    slow.run(generations=10**9, time_limit=0.05)
+    assert 0 < slow.generations < 10**9
+
+
+def test_process_pool_gives_the_same_run():
+    serial = GeneticAlgorithm(count_ones, bits=50, size=1000, packed=True, seed=8)
+    pooled = GeneticAlgorithm(count_ones, bits=50, size=1000, packed=True, processes=2, seed=8)
+    assert serial.run(generations=5)[1] == pooled.run(generations=5)[1]
+    np.testing.assert_array_equal(serial.population, pooled.population)
+    assert pooled.pool is None
+
+
+def test_bad_arguments():
+    with pytest.raises(ValueError):
+        GeneticAlgorithm(ones, bits=8, selection="rank")
+    with pytest.raises(ValueError):
+        GeneticAlgorithm(ones, bits=8, crossover="cycle")
+    with pytest.raises(ValueError):
+        GeneticAlgorithm(lambda genomes: genomes, bits=8, size=10).run(generations=1)
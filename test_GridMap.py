@@ -0,0 +1,70 @@
+# GridMap's neighbor masks, built for the whole map at once, must agree with
+# checking each cell's neighbors one by one, before and after edits and
+# through a save/load round trip
+
+import pytest
+
+from GridMap import GridMap
+
+MOVES = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+DIAGONAL = MOVES + [(1, 1), (1, -1), (-1, 1), (-1, -1)]
+
+
+def open_neighbors(rows, i, moves):
+    # The slow, obvious way: bounds and wall checks on the text rows
+    r, c = divmod(i, len(rows[0]))
+    if rows[r][c] == "#":
+        return []
+    return [(r + dr) * len(rows[0]) + c + dc for dr, dc in moves
+            if 0 <= r + dr < len(rows) and 0 <= c + dc < len(rows[0]) and rows[r + dr][c + dc] != "#"]
+
+
+def random_rows(rng, rows, cols):
+    return ["".join(rng.choice("#..") for _ in range(cols)) for _ in range(rows)]
+
+
+@pytest.mark.parametrize("moves", [MOVES, DIAGONAL])
+def test_masks_match_cell_by_cell_checks(rng, moves):
+    for _ in range(50):
+        rows = random_rows(rng, rng.randrange(1, 9), rng.randrange(1, 9))
+        grid = GridMap.from_rows(rows, moves)
+        for i in range(grid.rows * grid.cols):
+            assert grid.neighbors(i) == open_neighbors(rows, i, moves)
+        for _ in range(10):                         # Edits fix up the masks around the cell
+            r, c = rng.randrange(grid.rows), rng.randrange(grid.cols)
+            symbol = rng.choice("#.")
+            rows[r] = rows[r][:c] + symbol + rows[r][c + 1:]
+            version = grid.version
+            grid.set_cell(r, c, symbol)
+            assert grid.version == version + 1
+        for i in range(grid.rows * grid.cols):
+            assert grid.neighbors(i) == open_neighbors(rows, i, moves)
+
+
+def test_binary_maps_round_trip(tmp_path, rng):
+    rows = random_rows(rng, 6, 9)
+    rows[2] = "S" + rows[2][1:]
+    grid = GridMap.from_rows(rows, MOVES)
+    grid.save(tmp_path / "city.map")
+    loaded = GridMap.load(tmp_path / "city.map", MOVES)
+    assert isinstance(loaded.cells, memoryview)     # Mapped, not copied
+    assert (loaded.rows, loaded.cols) == (6, 9)
+    assert bytes(loaded.cells) == bytes(grid.cells) and bytes(loaded.mask) == bytes(grid.mask)
+    assert loaded.find("S") == grid.find("S") == 18
+    reordered = GridMap.load(tmp_path / "city.map", MOVES[::-1])   # Saved masks don't fit: rebuilt
+    assert all(sorted(reordered.neighbors(i)) == sorted(grid.neighbors(i)) for i in range(54))
+    loaded.set_cell(0, 0, "#")                      # Edits go to a private copy
+    assert GridMap.load(tmp_path / "city.map", MOVES).cells[0] == grid.cells[0]
+
+
+def test_text_maps_load_or_say_why_not(tmp_path):
+    (tmp_path / "city.txt").write_text("S.#\r\n..C\n\n")
+    grid = GridMap.load(tmp_path / "city.txt", MOVES)
+    assert (grid.rows, grid.cols) == (2, 3) and grid.char(1, 2) == "C"
+    assert grid.neighbors(0) == [1, 3]
+    (tmp_path / "ragged.txt").write_text("S.#\n.C\n")
+    with pytest.raises(ValueError, match="width"):
+        GridMap.load(tmp_path / "ragged.txt", MOVES)
+    (tmp_path / "empty.txt").write_text("")
+    with pytest.raises(ValueError, match="empty"):
+        GridMap.load(tmp_path / "empty.txt", MOVES)
@@ -0,0 +1,89 @@
+# Walkers only ever move uphill and stay in bounds, each step costs one
+# evaluation per walker, and the batch finds the global peak that a single
+# walker misses
+
+import numpy as np
+import pytest
+
+from HillClimbing import HillClimber
+
+
+def wavy(x):
+    return x * np.sin(10 * np.pi * x) + 1.0
+
+
+class Counted:
+    # Objective wrapper counting calls and points
+    def __init__(self, objective):
+        self.objective, self.calls, self.points = objective, 0, 0
+
+    def __call__(self, x):
+        self.calls += 1
+        self.points += len(x)
+        return self.objective(x)
+
+
+def test_finds_the_global_peak():
+    grid = np.linspace(0.0, 1.0, 1_000_001)
+    peak = grid[np.argmax(wavy(grid))]
+    climber = HillClimber(wavy, 0.0, 1.0, walkers=256, seed=1)
+    x, value = climber.run(max_steps=500, stall=30)
+    assert x == pytest.approx(peak, abs=1e-3)
+    assert value == pytest.approx(wavy(grid).max(), abs=1e-5)
+    assert value == wavy(np.array([x]))[0]
+
+
+def test_one_evaluation_per_walker_per_step():
+    objective = Counted(wavy)
+    climber = HillClimber(objective, 0.0, 1.0, walkers=100, seed=2)
+    assert (objective.calls, objective.points) == (1, 100)
+    climber.run(max_steps=50)
+    assert objective.calls == 51 and objective.points == 100 * 51 == climber.evaluations
+    assert climber.restarts == 0
+
+
+def test_walkers_move_uphill_inside_the_box():
+    climber = HillClimber(wavy, 0.2, 0.8, walkers=500, step=0.2, seed=3)
+    for _ in range(20):
+        before = climber.fx.copy()
+        climber.run(max_steps=1)
+        assert np.all(climber.fx >= before)
+        assert np.all((climber.x >= 0.2) & (climber.x <= 0.8))
+        np.testing.assert_array_equal(climber.fx, wavy(climber.x))     # Cached values are current
+
+
+def test_stuck_walkers_restart():
+    climber = HillClimber(lambda x: -np.abs(x - 0.5), 0.0, 1.0, walkers=50, seed=4)
+    climber.run(max_steps=400, stall=5)
+    assert climber.restarts > 0
+    assert climber.evaluations == 50 + 50 * climber.steps + climber.restarts
+    assert climber.best_x == pytest.approx(0.5, abs=1e-2)
+
+
+def test_stopping_rules():
+    flat = HillClimber(lambda x: np.zeros(len(x)), 0.0, 1.0, walkers=10, seed=5)
+    flat.run(max_steps=1000, patience=25)
+    assert flat.steps == 25
+    slow = HillClimber(lambda x: np.sin(x), 0.0, 1.0, walkers=10, seed=5)
+    slow.run(max_steps=10**9, time_limit=0.05)
+    assert 0 < slow.steps < 10**9
+    x, value = slow.run(max_steps=3)            # Goes on from where it stopped
+    assert slow.steps > 3 and value == slow.best_value
+
+
+def test_several_dimensions():
+    def bowl(p):
+        return -((p - [0.3, -0.2]) ** 2).sum(axis=1)
+    climber = HillClimber(bowl, [-1, -1], [1, 1], walkers=200, seed=6)
+    point, value = climber.run(max_steps=300)
+    assert climber.x.shape == (200, 2)
+    np.testing.assert_allclose(point, [0.3, -0.2], atol=1e-2)
+    assert value == pytest.approx(0, abs=1e-3)
+
+
+def test_same_seed_same_run_and_shape_check():
+    a = HillClimber(wavy, 0.0, 1.0, walkers=64, seed=7).run(max_steps=40, stall=10)
+    b = HillClimber(wavy, 0.0, 1.0, walkers=64, seed=7).run(max_steps=40, stall=10)
+    assert a == b
+    with pytest.raises(ValueError):
+        HillClimber(lambda x: x[:1], 0.0, 1.0, walkers=8)
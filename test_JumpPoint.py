@@ -0,0 +1,80 @@
+# Jump Point Search must stop its jumps exactly at forced neighbors, never
+# step between cells that aren't side by side, and find paths exactly as
+# short as BFS
+
+import pytest
+
+from GridMap import GridMap
+from JumpPoint import JumpPointSearch
+
+MOVES = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+
+
+def test_horizontal_jump_stops_at_a_forced_neighbor():
+    # Running right along the top row, (0, 2) is the first cell with an
+    # open cell below it while the cell behind it has a wall below
+    jps = JumpPointSearch(GridMap.from_rows([".....",
+                                             "##.##"], MOVES))
+    assert jps._jump_horizontal(0, 1, goal=None) == 2
+    assert jps._jump_horizontal(4, -1, goal=None) == 2
+    assert jps._jump_horizontal(3, 1, goal=None) is None    # Runs into the edge
+
+
+def test_vertical_jump_stops_where_a_turn_finds_a_jump_point():
+    # Down column 0 the wall at (2, 0) stops the jump; at (1, 0) a jump to
+    # the right is forced at (1, 1), so (1, 0) is a jump point
+    jps = JumpPointSearch(GridMap.from_rows(["...",
+                                             "...",
+                                             "#..",
+                                             "..."], MOVES))
+    assert jps._jump_vertical(0, 1, goal=None) == 3
+    assert jps._jump_vertical(0, 1, goal=6) == 3        # Passes near, but not through, the goal
+    assert jps._jump_vertical(2, 1, goal=11) == 11      # The goal always stops a jump
+
+
+def test_no_corner_cutting_or_row_wrapping():
+    # Diagonal neighbors don't connect on a 4-connected map
+    jps = JumpPointSearch(GridMap.from_rows([".#",
+                                             "#."], MOVES))
+    assert jps.search(0, 3) is None
+    # Cells 3 and 4 are next to each other in memory, not on the map
+    grid = GridMap.from_rows(["#...",
+                              "...#"], MOVES)
+    path = JumpPointSearch(grid).search(3, 4)
+    assert path == [3, 2, 6, 5, 4]
+
+
+def test_open_maps_expand_few_jump_points():
+    grid = GridMap.from_rows(["." * 30] * 30, MOVES)
+    jps = JumpPointSearch(grid)
+    path = jps.search(0, 30 * 30 - 1)
+    assert len(path) - 1 == 58
+    assert jps.nodes_expanded <= 3                      # Plain A* expands the whole diagonal band
+
+
+@pytest.mark.parametrize("walls", [0.0, 0.2, 0.35])
+def test_jps_matches_bfs(random_grid, bfs, walk, rng, walls):
+    for _ in range(60):
+        grid = random_grid(rng.randrange(1, 14), rng.randrange(1, 14), walls, symbols="")
+        open_cells = [i for i in range(grid.rows * grid.cols) if grid.is_open(i)]
+        if not open_cells:
+            continue
+        jps = JumpPointSearch(grid)
+        for _ in range(5):
+            start, goal = rng.choice(open_cells), rng.choice(open_cells)
+            expected = bfs(grid, start).get(goal)
+            path = jps.search(start, goal)
+            if expected is None:
+                assert path is None
+            else:
+                walk(grid, path, start, goal)
+                assert len(path) - 1 == expected
+
+
+def test_jps_pizza_picks_up_first(informed):
+    informed.use_map(GridMap.from_rows(["SC....R",
+                                        "#######"], informed.moves))
+    route = informed.a_star_pizza(method="jps")
+    assert route == [(0, c) for c in range(7)] + [(0, c) for c in range(5, 0, -1)]
+    with pytest.raises(ValueError):
+        informed.a_star_pizza(method="jps", costs={"~": 3})
@@ -0,0 +1,84 @@
+# Landmark bounds must never overestimate the BFS distance (or A* loses
+# optimality), must only give up (None) on cells that really can't reach
+# the target, and must keep both promises after the map is edited
+
+import pytest
+
+from GridMap import GridMap
+from Landmarks import Landmarks
+
+MOVES = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+# A U-shaped corridor: from the top row to the bottom one is the long way
+# round, until the wall at (1, 0) opens
+CORRIDOR = ["SR........",
+            "#########.",
+            "C........."]
+
+
+def assert_bounds(grid, landmarks, targets, bfs):
+    open_cells = [i for i in range(grid.rows * grid.cols) if grid.is_open(i)]
+    for target in targets:
+        h = landmarks.heuristic(target)
+        dist = bfs(grid, target)            # Moves are reversible: to target = from target
+        assert h(target) == 0
+        for i in open_cells:
+            estimate = h(i)
+            if estimate is None:
+                assert i not in dist
+                continue
+            if i in dist:
+                assert estimate <= dist[i]
+            for j in grid.neighbors(i):
+                if h(j) is not None:
+                    assert abs(estimate - h(j)) <= 1
+
+
+def test_landmarks_spread_out_and_are_exact_along_a_corridor():
+    grid = GridMap.from_rows(CORRIDOR, MOVES)
+    landmarks = Landmarks(grid, 2, seed=0)
+    assert landmarks.cells == [20, 19]      # The far end first, then the bend (the seed counts as covered)
+    h = landmarks.heuristic(20)
+    assert [h(i) for i in (0, 1, 9, 19, 29)] == [20, 19, 11, 10, 9]
+
+
+def test_cut_off_cells_get_no_bound(bfs):
+    grid = GridMap.from_rows(["..#..",
+                              "..#.."], MOVES)
+    landmarks = Landmarks(grid, 4, seed=0)
+    h = landmarks.heuristic(1)
+    assert h(3) is None and h(9) is None and h(5) == 2
+    assert_bounds(grid, landmarks, [0, 4], bfs)    # From the other side, only Manhattan holds
+
+
+def test_opened_shortcut_rebuilds_the_tables(informed, bfs):
+    grid = GridMap.from_rows(CORRIDOR, MOVES)
+    informed.use_map(grid)
+    landmarks = Landmarks(grid, 1, seed=0)
+    assert len(informed.a_star_pizza(landmarks=landmarks)) - 1 == 1 + 19
+    grid.set_cell(1, 0, ".")
+    assert landmarks.heuristic(informed.customer_i)(0) == 2     # Not the old 20
+    assert landmarks.version == grid.version
+    assert len(informed.a_star_pizza(landmarks=landmarks)) - 1 == 1 + 3
+    assert_bounds(grid, landmarks, [i for i in range(30) if grid.is_open(i)], bfs)
+
+
+def test_bounds_hold_through_random_edits(random_grid, bfs, rng):
+    for _ in range(30):
+        grid = random_grid(rng.randrange(2, 12), rng.randrange(2, 12), 0.3, symbols="")
+        landmarks = Landmarks(grid, rng.randrange(1, 6))
+        for _ in range(4):
+            for _ in range(rng.randrange(1, 4)):
+                grid.set_cell(rng.randrange(grid.rows), rng.randrange(grid.cols), rng.choice("#."))
+            open_cells = [i for i in range(grid.rows * grid.cols) if grid.is_open(i)]
+            assert_bounds(grid, landmarks, rng.sample(open_cells, min(3, len(open_cells))), bfs)
+
+
+@pytest.mark.parametrize("count", [1, 8])
+def test_landmark_bounds_are_admissible_and_consistent(random_grid, bfs, rng, count):
+    for _ in range(30):
+        grid = random_grid(rng.randrange(1, 14), rng.randrange(1, 14), 0.3, symbols="")
+        open_cells = [i for i in range(grid.rows * grid.cols) if grid.is_open(i)]
+        if not open_cells:
+            continue
+        landmarks = Landmarks(grid, count, seed=rng.choice(open_cells))
+        assert_bounds(grid, landmarks, rng.sample(open_cells, min(5, len(open_cells))), bfs)
@@ -0,0 +1,108 @@
+# Min-conflicts must keep its conflict counts and conflicted set exact as
+# it moves, make each greedy move to a value with the fewest conflicts
+# (ties drawn evenly), and report the best assignment it has seen
+
+import random
+
+import pytest
+
+from ConstraintSolver import CSP
+from MinConflicts import MinConflicts
+
+
+def hidden_coloring_graph(rng, n, k, edges):
+    hidden = [rng.randrange(k) for _ in range(n)]
+    graph = {v: [] for v in range(n)}
+    while edges:
+        u, v = rng.randrange(n), rng.randrange(n)
+        if hidden[u] != hidden[v]:
+            graph[u].append(v)
+            edges -= 1
+    return CSP(graph, k)
+
+
+def assert_consistent(search):
+    # Counts and the conflicted set, recomputed from scratch
+    k, value = search.k, search.value
+    for v, ns in enumerate(search.adj):
+        for c in range(k):
+            assert search.counts[v * k + c] == sum(value[u] == c for u in ns)
+    expected = {v for v, ns in enumerate(search.adj) if any(value[u] == value[v] for u in ns)}
+    assert set(search.conflicted) == expected
+    assert all(search.conflicted[search.where[v]] == v for v in expected)
+
+
+def conflicted_in(csp, values):
+    return sum(any(values[u] == values[v] for u in ns) for v, ns in enumerate(csp.adj))
+
+
+def test_greedy_moves_pick_a_value_with_fewest_conflicts(rng):
+    for _ in range(20):
+        csp = hidden_coloring_graph(rng, 60, rng.randrange(3, 7), 150)
+        search = MinConflicts(csp, start=[rng.randrange(len(csp.values)) for _ in range(len(csp))],
+                              seed=rng.random(), noise=0)
+        k = search.k
+        for _ in range(200):
+            before, counts, tabu = list(search.value), list(search.counts), list(search.tabu)
+            step = search.steps + 1
+            if search.run(1):
+                break
+            moved = [v for v in range(len(csp)) if search.value[v] != before[v]]
+            assert len(moved) <= 1
+            if moved:
+                v = moved[0]
+                allowed = [j for j in range(k) if j == before[v] or tabu[v * k + j] < step]
+                assert counts[v * k + search.value[v]] == min(counts[v * k + j] for j in allowed)
+        assert_consistent(search)
+
+
+def test_ties_are_broken_evenly():
+    # Two clashing neighbors, three values: whichever moves has two free values
+    csp = CSP({0: [1]}, 3)
+    picks = [0, 0, 0]
+    for seed in range(2000):
+        search = MinConflicts(csp, start=[0, 0], seed=seed, noise=0)
+        search.run(1)
+        picks[max(search.value)] += 1
+    assert picks[0] == 0
+    assert 0.45 < picks[1] / 2000 < 0.55
+
+
+def test_solves_colorable_graphs(rng):
+    from Activity1 import colors, neighbors
+    csp = CSP(neighbors, colors)
+    assert csp.is_solution(MinConflicts(csp, seed=1).solve(max_steps=1000))
+    for _ in range(5):
+        csp = hidden_coloring_graph(rng, 2000, 3, 3000)
+        search = MinConflicts(csp, seed=rng.random())
+        solution = search.solve(max_steps=200_000)
+        assert csp.is_solution(solution) and search.best == 0
+        assert_consistent(search)
+
+
+def test_best_assignment_is_the_best_seen():
+    # Four colors can't color a 5-clique: the walk never finishes
+    csp = CSP({v: list(range(v)) for v in range(5)}, 4)
+    search = MinConflicts(csp, seed=3, noise=0.5)
+    assert not search.run(500) and search.steps == 500
+    assert search.solve(max_steps=10) is None
+    assert search.best == conflicted_in(csp, search.best_value) == 2
+    assert len(search.assignment()) == 5
+    assert_consistent(search)
+
+
+def test_start_values_and_domains_are_respected():
+    csp = CSP({"a": ["b"], "b": ["c"], "c": []}, ["r", "g", "b"], domains={"b": ["g"]})
+    search = MinConflicts(csp, start=[1, 0, 2], seed=0)
+    assert search.value == [1, 1, 2]                    # b's start is outside its domain: its only value
+    assert search.conflicted and search.best == 2       # a keeps its start, clash or not
+    solution = search.solve(max_steps=100)
+    assert csp.is_solution(solution) and solution["b"] == "g"
+    with pytest.raises(ValueError):
+        MinConflicts(csp, domains=[0b111, 0, 0b111])
+
+
+def test_time_limit_stops_the_walk():
+    csp = CSP({v: list(range(v)) for v in range(6)}, 5)
+    search = MinConflicts(csp, seed=random.Random(1))
+    assert search.solve(time_limit=0.05) is None and search.steps > 0
@@ -0,0 +1,98 @@
+# Multi-order plans must visit every pickup before its dropoff, cost what
+# their legs cost, and (up to EXACT_LIMIT orders) be the cheapest order of
+# stops there is
+
+from itertools import permutations
+
+import pytest
+
+from MultiDelivery import EXACT_LIMIT, DistanceMatrix, _plan_heuristic, plan_route, route_path
+
+
+def random_points(grid, rng, count):
+    open_cells = [i for i in range(grid.rows * grid.cols) if grid.is_open(i)]
+    return [grid.position(i) for i in rng.sample(open_cells, count)]
+
+
+def brute_force(matrix, start, orders):
+    # Cheapest cost over every order of the stops with pickups first
+    stops = [(kind, i) for i in range(len(orders)) for kind in (0, 1)]
+    best = None
+    for order in permutations(stops):
+        if any(order.index((0, i)) > order.index((1, i)) for i in range(len(orders))):
+            continue
+        cost, here = 0, start
+        for kind, i in order:
+            d = matrix.get(here, orders[i][kind])
+            if d is None:
+                break
+            cost, here = cost + d, orders[i][kind]
+        else:
+            best = cost if best is None else min(best, cost)
+    return best
+
+
+def check_plan(grid, matrix, start, orders, cost, stops):
+    picked = set()
+    here, total = start, 0
+    for kind, i, pos in stops:
+        assert pos == orders[i][kind == "dropoff"]
+        if kind == "pickup":
+            picked.add(i)
+        else:
+            assert i in picked
+        total += matrix.get(here, pos)
+        here = pos
+    assert sorted((i, kind) for kind, i, _ in stops) == sorted(
+        (i, kind) for i in range(len(orders)) for kind in ("pickup", "dropoff"))
+    assert total == cost
+    assert len(route_path(grid, start, stops)) - 1 == cost
+
+
+def test_exact_plans_are_optimal(random_grid, rng):
+    for _ in range(40):
+        grid = random_grid(rng.randrange(4, 10), rng.randrange(4, 10), 0.2, symbols="")
+        orders_count = rng.randrange(1, 4)
+        points = random_points(grid, rng, 1 + 2 * orders_count)
+        start, orders = points[0], list(zip(points[1::2], points[2::2]))
+        matrix = DistanceMatrix(grid)
+        cost, stops = plan_route(grid, start, orders, matrix)
+        expected = brute_force(matrix, start, orders)
+        assert cost == expected
+        if cost is not None:
+            check_plan(grid, matrix, start, orders, cost, stops)
+            heuristic_cost, heuristic_stops = _plan_heuristic(matrix, start, orders)
+            check_plan(grid, matrix, start, orders, heuristic_cost, heuristic_stops)
+            assert heuristic_cost >= cost
+
+
+def test_many_orders_use_the_heuristic(random_grid, rng):
+    grid = random_grid(20, 20, 0.0, symbols="")
+    points = random_points(grid, rng, 1 + 2 * (EXACT_LIMIT + 3))
+    start, orders = points[0], list(zip(points[1::2], points[2::2]))
+    matrix = DistanceMatrix(grid)
+    cost, stops = plan_route(grid, start, orders, matrix)
+    check_plan(grid, matrix, start, orders, cost, stops)
+
+
+def test_distance_matrix_searches_each_point_once(random_grid, bfs, rng):
+    grid = random_grid(12, 12, 0.25, symbols="")
+    points = random_points(grid, rng, 8)
+    matrix = DistanceMatrix(grid)
+    matrix.add(points[:5])
+    matrix.add(points)                              # Three new points, three more searches
+    matrix.add(points[::-1])
+    assert matrix.searches == 8
+    for a in points:
+        dist = bfs(grid, grid.index(*a))
+        for b in points:
+            assert matrix.get(a, b) == dist.get(grid.index(*b))
+
+
+@pytest.mark.parametrize("blocked", [0, 1])
+def test_unreachable_stops_give_no_plan(blocked):
+    from GridMap import GridMap
+    rows = ["S.#R", "..#C"] if blocked else ["S..R", "..#C"]
+    grid = GridMap.from_rows(rows, [(0, 1), (1, 0), (0, -1), (-1, 0)])
+    cost, stops = plan_route(grid, (0, 0), [((0, 3), (1, 3))])
+    assert (cost is None) == bool(blocked) and (stops is None) == bool(blocked)
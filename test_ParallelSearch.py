@@ -0,0 +1,75 @@
+# Splitting the root across processes must not change the answer: the
+# parallel search gives the serial Engine's score at every depth, and a
+# move that really has that score
+
+import pytest
+
+from GameSearch import WIN, ConnectFour, Engine, TicTacToe
+from ParallelSearch import ParallelSearch, compare
+
+
+def fixed_depth(game, state, depth, memo):
+    # Plain negamax to depth, scoring the cut-off positions with evaluate()
+    result = game.result(state)
+    if result is not None:
+        return result
+    if depth == 0:
+        return game.evaluate(state)
+    key = (state[:2], depth)
+    if key not in memo:
+        memo[key] = max(-fixed_depth(game, game.play(state, move), depth - 1, memo)
+                        for move in game.moves(state))
+    return memo[key]
+
+
+def random_position(game, rng, stones):
+    while True:
+        state = game.start()
+        for _ in range(stones):
+            if game.result(state) is not None:
+                break
+            state = game.play(state, rng.choice(game.moves(state)))
+        if game.result(state) is None:
+            return state
+
+
+@pytest.fixture(scope="module")
+def connect_four():
+    with ParallelSearch(ConnectFour(), workers=2, table_bits=12) as search:
+        yield search
+
+
+def test_matches_the_serial_engine(connect_four, rng):
+    game = connect_four.game
+    for _ in range(20):
+        state = random_position(game, rng, rng.randrange(0, 16))
+        depth = rng.randrange(1, 7)
+        memo = {}
+        move, score = connect_four.search(state, max_depth=depth)
+        assert (move, score) != (None, None)
+        assert score == Engine(game).search(state, max_depth=depth)[1]
+        if abs(score) < WIN - game.cells:               # Not a forced result: check the move's own value
+            assert fixed_depth(game, state, depth, memo) == score
+            assert -fixed_depth(game, game.play(state, move), depth - 1, memo) == score
+        assert connect_four.depth <= depth and connect_four.nodes > 0
+
+
+def test_solves_tic_tac_toe_and_finds_forced_wins():
+    game = TicTacToe()
+    with ParallelSearch(game, workers=2) as search:
+        assert search.search(game.start())[1] == 0
+        move, score = search.search(game.after([0, 3, 1, 4]))
+        assert (move, score) == (2, Engine(game).search(game.after([0, 3, 1, 4]))[1])
+        over = game.after([0, 3, 1, 4, 2])
+        assert search.search(over) == (None, game.result(over))
+    assert search.pool is None                          # The context manager stopped the workers
+
+
+def test_compare_reports_both_searches():
+    game = ConnectFour()
+    state = game.after([3, 3, 2, 4])
+    report = compare(game, state, 5, workers=2)
+    assert report["serial"]["score"] == report["parallel"]["score"]
+    assert report["depth"] == 5 and report["workers"] == 2
+    assert report["speedup"] > 0 and report["overhead"] > -1
+    assert report["parallel"]["nodes"] == pytest.approx((1 + report["overhead"]) * report["serial"]["nodes"])
@@ -0,0 +1,112 @@
+# A Renderer must keep one byte per cell, send only a terminal-sized view
+# of the map up front and then only the cells that change, and record
+# frames that replay to the same screen
+
+import io
+import json
+import re
+
+from GridMap import GridMap
+from Renderer import CELL_WIDTH, Animation, Renderer, cell_text, replay
+
+MOVES = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+CURSOR = re.compile(r"\x1b\[(\d+);(\d+)H")
+
+
+def screen(text):
+    # Replay ANSI output onto a dict {(row, col): text} of 1-based terminal cells
+    shown = {}
+    text = text.replace("\x1b[?25l", "").replace("\x1b[?25h", "").replace("\x1b[2J", "")
+    parts = CURSOR.split(text)
+    for row, col, run in zip(parts[1::3], parts[2::3], parts[3::3]):
+        row, col = int(row), int(col)
+        cells = re.findall(r"[^ ] ?|  ", run)   # Each cell is CELL_WIDTH columns
+        for k, cell in enumerate(cells):
+            shown[row, col + k * CELL_WIDTH] = cell.rstrip(" ") or " "
+    return shown
+
+
+def test_buffer_is_a_byte_per_cell_and_the_first_frame_fits_the_view():
+    grid = GridMap.from_rows(["." * 1000] * 1000, MOVES)
+    out = io.StringIO()
+    renderer = Renderer(grid, out, view=(10, 20))
+    assert isinstance(renderer.screen, bytearray) and len(renderer.screen) == 1000 * 1000
+    assert renderer.pending == {} and renderer.marks == {}
+    renderer.frame()
+    shown = screen(out.getvalue())
+    assert len(shown) == 10 * 20
+    assert max(shown) == (10, 19 * CELL_WIDTH + 1)
+
+
+def test_later_frames_send_only_the_changes():
+    grid = GridMap.from_rows(["S..#", "....", "#..C"], MOVES)
+    out = io.StringIO()
+    renderer = Renderer(grid, out, view=(3, 4))
+    renderer.set(0, 0, "🚴")
+    renderer.frame()
+    assert screen(out.getvalue())[1, 1] == "🚴"
+    out.seek(0), out.truncate()
+    renderer.set(0, 0, "*")
+    renderer.set(0, 1, "🚴")
+    renderer.set(2, 3, "C")                 # Already showing: nothing to send
+    renderer.frame()
+    sent = out.getvalue()
+    assert sent == "\x1b[1;1H" + cell_text("*") + cell_text("🚴")   # One cursor move for the pair
+    assert renderer.marks == {1: "🚴"} and renderer.text(0, 0) == "*"
+    out.seek(0), out.truncate()
+    renderer.frame()
+    assert out.getvalue() == ""
+
+
+def test_viewport_follows_the_focus():
+    grid = GridMap.from_rows(["." * 50] * 40, MOVES)
+    out = io.StringIO()
+    renderer = Renderer(grid, out, view=(10, 10))
+    renderer.frame()
+    out.seek(0), out.truncate()
+    renderer.set(30, 45, "🚴")               # Off screen: stored, not drawn
+    renderer.frame()
+    assert out.getvalue() == ""
+    renderer.keep_in_view(30, 45)
+    assert (renderer.top, renderer.left) == (25, 40)    # Centered, clamped at the right edge
+    renderer.frame()
+    shown = screen(out.getvalue())
+    assert len(shown) == 100 and shown[30 - 25 + 1, (45 - 40) * CELL_WIDTH + 1] == "🚴"
+    out.seek(0), out.truncate()
+    renderer.keep_in_view(31, 44)           # Still inside: no scrolling, no redraw
+    renderer.frame()
+    assert out.getvalue() == ""
+
+
+def test_recording_replays_to_the_same_screen(tmp_path):
+    rows = ["S.R#", "...#", "##.C"]
+    record = tmp_path / "frames.jsonl"
+    renderer = Renderer(GridMap.from_rows(rows, MOVES), out=None, record=str(record))
+    animation = Animation(renderer)
+    route = [(0, 0), (0, 1), (0, 2), (1, 2), (2, 2), (2, 3)]
+    previous = None
+    for step in route:
+        animation.put([(*step, "🚴")] + ([(*previous, "*")] if previous else []), focus=step)
+        previous = step
+    animation.close()
+    lines = [json.loads(line) for line in record.read_text().splitlines()]
+    assert lines[0] == {"rows": 3, "cols": 4, "map": rows}
+    assert all(len(frame["cells"]) <= 2 for frame in lines[1:])
+    out = io.StringIO()
+    replay(str(record), out, view=(3, 4))
+    shown = screen(out.getvalue())
+    for r in range(3):
+        for c in range(4):
+            expected = "🚴" if (r, c) == route[-1] else "*" if (r, c) in route else rows[r][c]
+            assert shown[r + 1, c * CELL_WIDTH + 1] == expected
+
+
+def test_keep_up_merges_a_backlog_into_one_frame():
+    grid = GridMap.from_rows(["." * 20], MOVES)
+    renderer = Renderer(grid, io.StringIO(), view=(1, 20))
+    animation = Animation(renderer, keep_up=True)
+    for c in range(20):
+        animation.put([(0, c, "*")])
+    animation.close()
+    assert 1 <= renderer.frames <= 20
+    assert [renderer.text(0, c) for c in range(20)] == ["*"] * 20
@@ -0,0 +1,119 @@
+# A RouteCache is an LRU of answers per map. Whatever it keeps across map
+# changes must still be right: a cached route must be a shortest route on
+# the map as it is now, and a cached distance field must equal a fresh one.
+# Edits through set_cells should only drop the entries they can affect.
+
+from GridMap import GridMap
+from RouteCache import MISS, RouteCache
+
+MOVES = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+
+
+def assert_route(grid, informed, route, fresh):
+    if fresh is None:
+        assert route is None
+        return
+    assert route is not None and len(route) == len(fresh)
+    assert route[0] == informed.start and route[-1] == informed.customer
+    assert informed.restaurant in route
+    for a, b in zip(route, route[1:]):
+        assert abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1
+        assert grid.is_valid(*b)
+
+
+def test_least_recently_used_entries_go_first():
+    grid = GridMap.from_rows(["...."], MOVES)
+    cache = RouteCache(maxsize=3)
+    for key in "abc":
+        cache.put_path(grid, key, [(0, 0)], [(0, 0)])
+    assert cache.get(grid, "a") is not MISS         # "a" is now the most recent
+    cache.put_path(grid, "d", [(0, 0)], [(0, 0)])   # Evicts "b", the least recent
+    cache.put_path(grid, "c", [(0, 1)], [(0, 1)])   # Replacing "c" refreshes it
+    cache.put_path(grid, "e", [(0, 0)], [(0, 0)])   # Evicts "a"
+    assert [cache.get(grid, key) is MISS for key in "abcde"] == [True, True, False, False, False]
+    assert cache.get(grid, "c") == [(0, 1)]
+    assert cache.evictions == 2 and len(cache) == 3
+
+
+def test_set_cells_drops_only_affected_entries():
+    grid = GridMap.from_rows(["S...#",
+                              ".##..",
+                              "....C"], MOVES)
+    cache = RouteCache()
+    route = [(0, 0), (1, 0), (2, 0), (2, 1), (2, 2), (2, 3), (2, 4)]      # 6 moves, the shortest
+    cache.put_path(grid, "route", route, [(0, 0), (2, 4)])
+    cache.put_path(grid, "nowhere", None, [(0, 0), (0, 4)])             # No route onto the wall at (0, 4)
+    cache.set_cells(grid, [(0, 2, "#")])            # Off the route, blocking: harmless
+    assert cache.get(grid, "route") == route and cache.get(grid, "nowhere") is None
+    cache.set_cells(grid, [(1, 1, ".")])            # Opens, but no detour through it beats 6
+    assert cache.get(grid, "route") == route and cache.get(grid, "nowhere") is MISS
+    cache.set_cells(grid, [(2, 2, "#")])            # On the route
+    assert cache.get(grid, "route") is MISS
+    assert cache.invalidations == 2
+
+
+def test_fields_survive_changes_they_never_reach():
+    import numpy as np
+    from DistanceField import distance_field
+    grid = GridMap.from_rows(["..#..",
+                              "..#..",
+                              "..#.."], MOVES)
+    cache = RouteCache()
+    left = distance_field(grid, (0, 0), cache=cache)
+    right = distance_field(grid, (0, 4), cache=cache)
+    cache.set_cells(grid, [(2, 4, "#")])            # Only the right side's field reached it
+    assert distance_field(grid, (0, 0), cache=cache) is left
+    assert distance_field(grid, (0, 4), cache=cache) is not right
+    cache.set_cells(grid, [(1, 2, ".")])            # Next to both sides now
+    assert np.array_equal(distance_field(grid, (0, 0), cache=cache), distance_field(grid, (0, 0)))
+    assert cache.hits == 1 and cache.invalidations == 3
+
+
+def test_changes_behind_the_caches_back_drop_entries():
+    grid = GridMap.from_rows(["...."], MOVES)
+    cache = RouteCache()
+    cache.put_path(grid, "route", [(0, 0), (0, 1)], [(0, 0), (0, 1)])
+    grid.set_cell(0, 3, "#")                        # Harmless, but the cache can't know
+    assert cache.get(grid, "route") is MISS and cache.invalidations == 1
+
+
+def test_cached_routes_survive_only_harmless_changes(informed, random_grid, rng):
+    for _ in range(40):
+        grid = random_grid(rng.randrange(3, 12), rng.randrange(3, 12), 0.2, symbols="SRC")
+        informed.use_map(grid)
+        cache = RouteCache()
+        protected = {informed.start_i, informed.restaurant_i, informed.customer_i}
+        for _ in range(25):
+            route = informed.a_star_pizza(cache=cache)
+            assert_route(grid, informed, route, informed.a_star_pizza())
+            changes = []
+            for _ in range(rng.randrange(1, 3)):
+                r, c = rng.randrange(grid.rows), rng.randrange(grid.cols)
+                if grid.index(r, c) not in protected:
+                    changes.append((r, c, "#" if rng.random() < 0.5 else "."))
+            if rng.random() < 0.8:
+                cache.set_cells(grid, changes)
+            else:
+                for r, c, symbol in changes:    # Behind the cache's back
+                    grid.set_cell(r, c, symbol)
+        assert cache.hits > 0
+
+
+def test_maps_with_the_same_endpoints_keep_their_own_entries(informed, random_grid, rng):
+    grids = []
+    while len(grids) < 2:
+        grid = random_grid(8, 8, 0.2, symbols="")
+        for symbol, (r, c) in zip("SRC", [(0, 0), (4, 4), (7, 7)]):
+            grid.set_cell(r, c, symbol)
+        informed.use_map(grid)
+        if informed.a_star_pizza() is not None:
+            grids.append(grid)
+    cache = RouteCache()
+    for query in range(10):
+        grid = grids[query % 2]
+        informed.use_map(grid)
+        assert_route(grid, informed, informed.a_star_pizza(cache=cache), informed.a_star_pizza())
+    assert cache.hits == 8 and cache.misses == 2
+    key = ("a_star_pizza", informed.start_i, informed.restaurant_i, informed.customer_i)
+    cache.discard(grids[0])
+    assert cache.get(grids[0], key) is MISS and cache.get(grids[1], key) is not MISS
@@ -0,0 +1,100 @@
+# The route service must answer every JSON line with one JSON line carrying
+# the same id: over any reader/writer pair, and over a socket, sharing work
+# between identical and same-map queries and keeping worker output off the
+# response stream
+
+import asyncio
+import json
+
+import pytest
+
+from RouteService import RouteService, serve_socket
+
+CITY = ["S...#..", "..##..C", ".R..#..", "...##..", "......."]
+
+
+@pytest.fixture(scope="module")
+def service():
+    service = RouteService(workers=1)
+    yield service
+    service.close()
+
+
+def serve_lines(service, lines):
+    # Feed lines to service.serve and collect what it writes, by id
+    async def run():
+        reader = asyncio.StreamReader()
+        reader.feed_data("".join(line + "\n" for line in lines).encode())
+        reader.feed_eof()
+        responses = []
+
+        async def write(response):
+            responses.append(json.loads(json.dumps(response)))  # Must survive a JSON round trip
+        await service.serve(reader, write)
+        return responses
+    return asyncio.run(run())
+
+
+def test_requests_and_responses_round_trip(service, capfd):
+    requests = [
+        {"id": 1, "search": "a_star_pizza", "map": CITY},
+        {"id": 2, "search": "bfs", "map": CITY},
+        {"id": 3, "search": "a_star_pizza", "map": CITY, "method": "jps"},
+        {"id": 4, "search": "bfs_limited", "start": [[1, 2, 3], [4, 0, 6], [7, 5, 8]],
+         "goal": [[1, 2, 3], [4, 5, 6], [7, 8, 0]], "max_depth": 10},
+        {"id": 5, "search": "bfs", "map": ["S.#C", "R.#."]},
+        {"id": 6, "search": "bfs", "map": ["S..."]},
+        {"id": 7, "search": "dijkstra", "map": CITY},
+        {"id": 8, "search": "bfs", "map_file": "no/such/city.txt"},
+    ]
+    lines = [json.dumps(request) for request in requests] + ["{not json", "   "]
+    responses = serve_lines(service, lines)
+    assert len(responses) == len(requests) + 1            # The blank line gets no answer
+    by_id = {response["id"]: response for response in responses}
+    route = by_id[1]["path"]
+    assert route[0] == [0, 0] and route[-1] == [1, 6] and [2, 1] in route
+    assert by_id[1]["length"] == by_id[2]["length"] == by_id[3]["length"] == len(route) - 1
+    assert by_id[4] == {"id": 4, "ok": True, "found": True, "nodes": by_id[4]["nodes"], "depth": 2}
+    assert by_id[5] == {"id": 5, "ok": True, "path": None, "length": None}
+    assert not by_id[6]["ok"] and "S, an R and a C" in by_id[6]["error"]
+    assert not by_id[7]["ok"] and "search" in by_id[7]["error"]
+    assert not by_id[8]["ok"]
+    assert not by_id[None]["ok"] and "bad JSON" in by_id[None]["error"]
+    assert capfd.readouterr().out == ""                  # bfs_limited's report stays in the worker
+
+
+def test_identical_and_same_map_queries_share_work(service):
+    before = service.batches_sent, service.coalesced
+    request = {"search": "bfs", "map": ["S.R.", "...C"]}
+    lines = [json.dumps({"id": n, **request}) for n in range(5)]
+    lines.append(json.dumps({"id": 5, "search": "a_star_pizza", "map": ["S.R.", "...C"]}))
+    responses = serve_lines(service, lines)
+    assert sorted(response["id"] for response in responses) == list(range(6))
+    assert all(response["length"] == 4 for response in responses)  # 2 to R, 2 on to C
+    assert service.coalesced - before[1] == 4            # Four joined the first bfs
+    assert service.batches_sent - before[0] == 1         # One trip to a worker for the map
+
+
+def test_socket_clients_get_their_answers(service, tmp_path):
+    path = str(tmp_path / "routes.sock")
+
+    async def run():
+        server = asyncio.create_task(serve_socket(service, path=path))
+        for _ in range(100):                             # Wait for the socket to appear
+            try:
+                reader, writer = await asyncio.open_unix_connection(path)
+                break
+            except OSError:
+                await asyncio.sleep(0.02)
+        for n in range(3):
+            writer.write((json.dumps({"id": n, "search": "bfs", "map": CITY}) + "\n").encode())
+        await writer.drain()
+        writer.write_eof()
+        responses = [json.loads(await reader.readline()) for _ in range(3)]
+        assert await reader.readline() == b""            # The server hangs up after the last answer
+        writer.close()
+        server.cancel()
+        return responses
+    responses = asyncio.run(run())
+    assert sorted(response["id"] for response in responses) == [0, 1, 2]
+    assert all(response["ok"] and response["length"] == responses[0]["length"] for response in responses)
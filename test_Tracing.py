@@ -0,0 +1,62 @@
+# Tracer levels decide what reaches the sink, and a traced search records
+# the same counters whatever the level, without printing anything itself
+
+import io
+import json
+
+import pytest
+
+import UninformedSearch
+from Tracing import FULL, OFF, SAMPLED, SUMMARY, JsonLinesSink, Tracer
+
+
+def events(text):
+    return [json.loads(line) for line in text.splitlines()]
+
+
+@pytest.mark.parametrize("level, nodes", [(OFF, 0), (SUMMARY, 0), (SAMPLED, 3), (FULL, 10)])
+def test_levels_record_what_they_promise(level, nodes):
+    out = io.StringIO()
+    tracer = Tracer(level, every=3, sink=JsonLinesSink(out))
+    on_node = tracer.node_hook("search")
+    assert (on_node is None) == (level < SAMPLED)
+    for n in range(1, 11):
+        if on_node:
+            on_node(n, n // 2, (n, False))
+    tracer.summary("search", nodes=10, found=True)
+    tracer.close()
+    recorded = events(out.getvalue())
+    assert sum(e["event"] == "node" for e in recorded) == nodes
+    summaries = [e for e in recorded if e["event"] == "summary"]
+    assert len(summaries) == (level != OFF) == len(tracer.summaries)
+    if summaries:
+        assert summaries[0]["nodes"] == 10 and summaries[0]["seconds"] >= 0
+        assert recorded[-1] == summaries[0]         # The summary comes after the nodes
+
+
+def test_sink_writes_in_batches():
+    out = io.StringIO()
+    sink = JsonLinesSink(out, buffer_size=3)
+    sink.write({"n": 1})
+    sink.write({"n": 2})
+    assert out.getvalue() == ""
+    sink.write({"n": 3, "state": (1, True)})
+    assert events(out.getvalue())[-1] == {"n": 3, "state": [1, True]}
+    sink.write({"n": 4})
+    sink.close()
+    assert len(events(out.getvalue())) == 4
+
+
+def test_traced_searches_are_quiet_and_count_their_nodes(capsys):
+    out = io.StringIO()
+    tracer = Tracer(FULL, sink=JsonLinesSink(out))
+    route = UninformedSearch.bfs(tracer=tracer)
+    UninformedSearch.ids(tracer=tracer)
+    tracer.close()
+    assert capsys.readouterr().out == ""
+    assert route == UninformedSearch.bfs()          # Tracing doesn't change the answer
+    recorded = events(out.getvalue())
+    for search in ("bfs", "ids"):
+        summary = next(e for e in recorded if e["event"] == "summary" and e["search"] == search)
+        assert summary["found"]
+        assert summary["nodes"] == sum(e["event"] == "node" and e["search"] == search for e in recorded)
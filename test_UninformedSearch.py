@@ -0,0 +1,79 @@
+# Delivery searches on the city grid: every route starts at S, passes R and
+# ends at C, and the BFS-based ones are as short as possible
+
+import pytest
+
+import UninformedSearch as U
+from GridMap import GridMap
+
+
+@pytest.fixture
+def city():
+    """UninformedSearch, with its own map put back after the test."""
+    grid = U.grid
+    yield U
+    U.use_map(grid)
+
+
+def use_rows(city, rows):
+    city.use_map(GridMap.from_rows(rows, city.moves))
+
+
+def assert_delivery(city, route):
+    assert route[0] == city.start and route[-1] == city.customer
+    assert city.restaurant in route
+    for (ar, ac), (br, bc) in zip(route, route[1:]):
+        assert abs(ar - br) + abs(ac - bc) == 1 and city.is_valid(br, bc)
+
+
+def test_bidirectional_bfs_detours_through_the_restaurant(city):
+    # C sits right next to S, but the pizza is at the far end of a corridor
+    use_rows(city, ["SC....R",
+                    "#######"])
+    route = city.bidirectional_bfs()
+    assert_delivery(city, route)
+    assert len(route) - 1 == 11 == len(city.bfs()) - 1
+
+
+def test_bidirectional_bfs_matches_bfs(city, random_grid, rng):
+    for _ in range(100):
+        city.use_map(random_grid(rng.randrange(1, 10), rng.randrange(3, 10), 0.3, symbols="SRC"))
+        route, shortest = city.bidirectional_bfs(), city.bfs()
+        if shortest is None:
+            assert route is None
+        else:
+            assert_delivery(city, route)
+            assert len(route) == len(shortest)
+
+
+def copying_dfs(city):
+    # DFS as it was before parent pointers: every stack entry carries its path
+    stack = [(city.start, False, [city.start])]
+    visited = set()
+    while stack:
+        pos, has_pizza, path = stack.pop()
+        if pos == city.customer and has_pizza:
+            return path
+        if (pos, has_pizza) in visited:
+            continue
+        visited.add((pos, has_pizza))
+        for dr, dc in city.moves:
+            nr, nc = pos[0] + dr, pos[1] + dc
+            if city.is_valid(nr, nc):
+                stack.append(((nr, nc), has_pizza or (nr, nc) == city.restaurant, path + [(nr, nc)]))
+    return None
+
+
+def test_rebuilt_paths_are_deliveries(city, random_grid, rng):
+    for _ in range(100):
+        city.use_map(random_grid(rng.randrange(1, 7), rng.randrange(3, 7), 0.3, symbols="SRC"))
+        shortest = city.bfs()
+        assert city.dfs() == copying_dfs(city)      # Same search order, same path
+        route = city.ids(max_depth=4 * city.ROWS * city.COLS)
+        if shortest is None:
+            assert city.dfs() is None and route is None
+            continue
+        assert_delivery(city, shortest)
+        assert_delivery(city, city.dfs())
+        assert_delivery(city, route)
+        assert len(route) == len(shortest)
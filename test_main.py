@@ -0,0 +1,100 @@
+# Importing a module must only define things: no output, no sleeping, no
+# NumPy unless the module is built on it. The demos and tools run from the
+# command line in __main__.py instead.
+
+import importlib.util
+import os
+import subprocess
+import sys
+
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+NUMPY_MODULES = {"DistanceField", "HillClimbing", "GeneticAlgorithm"}
+
+
+def load_main():
+    spec = importlib.util.spec_from_file_location("search_cli", os.path.join(HERE, "__main__.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+cli = load_main()
+MODULES = sorted(set(cli.DEMOS.values()) | set(cli.TOOLS.values()) |
+                 {name[:-3] for name in os.listdir(HERE)
+                  if name[0].isupper() and name.endswith(".py") and name != "8Puzzle.py"})
+
+
+def fresh_import(name):
+    # Import name in a new interpreter; report what it printed and what it loaded
+    code = (f"import sys, time; t = time.perf_counter(); import {name}; "
+            f"print(time.perf_counter() - t, 'numpy' in sys.modules, file=sys.stderr)")
+    done = subprocess.run([sys.executable, "-c", code], cwd=HERE, capture_output=True,
+                          text=True, timeout=60)
+    assert done.returncode == 0, done.stderr
+    seconds, numpy = done.stderr.split()[-2:]
+    return done.stdout, float(seconds), numpy == "True"
+
+
+@pytest.mark.parametrize("name", MODULES)
+def test_importing_runs_nothing(name):
+    out, seconds, numpy = fresh_import(name)
+    assert out == ""
+    assert seconds < 1.0                    # No demo, no animation delay
+    assert numpy == (name in NUMPY_MODULES)
+
+
+def test_every_demo_has_an_entry_point():
+    for name in cli.DEMOS.values():
+        assert callable(cli.load(name).demo)
+
+
+@pytest.fixture
+def city_maps():
+    # run_route loads its map into the search modules; put theirs back after
+    import InformedSearch
+    import UninformedSearch
+    saved = [(module, module.grid) for module in (InformedSearch, UninformedSearch)]
+    yield
+    for module, grid in saved:
+        module.use_map(grid)
+
+
+def test_route_command(tmp_path, capsys, city_maps):
+    path = tmp_path / "city.txt"
+    path.write_text("S.#.\n..R#\n#..C\n")
+    for search in cli.ROUTE_SEARCHES:
+        assert cli.main(["route", str(path), "--search", search]) == 0
+        out = capsys.readouterr().out
+        moves, cells = out.split(":")
+        cells = cells.split()
+        assert cells[0] == "0,0" and "1,2" in cells and cells[-1] == "2,3"
+        if search != "dfs":                 # DFS finds a route, not the shortest
+            assert moves == "5 moves"
+    path.write_text("S.#.\n..#R\n#.#C\n")
+    assert cli.main(["route", str(path)]) == 1
+    assert "No route" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("argv, message", [
+    (["demo", "chess"], "unknown demo 'chess'"),
+    (["route", "no/such/city.txt"], "can't load the map"),
+    (["route", "CITY", "--search", "teleport"], "invalid choice"),
+    (["route", "CITY"], "needs an S, an R and a C"),
+])
+def test_usage_errors(tmp_path, capsys, city_maps, argv, message):
+    path = tmp_path / "city.txt"
+    path.write_text("S...\n....\n")
+    argv = [str(path) if arg == "CITY" else arg for arg in argv]
+    with pytest.raises(SystemExit) as error:
+        cli.main(argv)
+    assert error.value.code == 2
+    assert message in capsys.readouterr().err
+
+
+def test_tools_get_their_own_arguments(capsys):
+    with pytest.raises(SystemExit) as error:
+        cli.main(["puzzle", "--help"])
+    assert error.value.code == 0
+    assert "--batch" in capsys.readouterr().out